@@ -16,6 +16,7 @@ from langchain_ollama import OllamaLLM
 
 from app.agents.types import IdeationAgentInput
 from app.config.settings import settings
+from app.services.llm.cache import ResponseCache, get_response_cache, invoke_with_cache
 from app.utils.prompt_loader import load_prompt
 from app.agents.types import IdeationAgentInput, IdeationAgentOutput
 
@@ -23,7 +24,11 @@ logger = logging.getLogger(__name__)
 
 
 class IdeationAgent:
-    def __init__(self, prompt_path: str = "prompts/ideation_agent.yaml"):
+    def __init__(
+        self,
+        prompt_path: str = "prompts/ideation_agent.yaml",
+        response_cache: Optional[ResponseCache] = None,
+    ):
         try:
             self.prompt_config = load_prompt(prompt_path)
             self.template = PromptTemplate(
@@ -33,8 +38,9 @@ class IdeationAgent:
                 ],
                 template=self.prompt_config["user_template"]
             )
-            llm = OllamaLLM(model=settings.ollama_model)
-            self.chain: RunnableSequence = self.template | llm
+            self.llm = OllamaLLM(model=settings.ollama_model)
+            self.chain: RunnableSequence = self.template | self.llm
+            self.response_cache = response_cache if response_cache is not None else get_response_cache()
             logger.info("✅ IdeationAgent initialized successfully.")
         except Exception as e:
             logger.exception("❌ Failed to initialize IdeationAgent")
@@ -44,7 +50,9 @@ class IdeationAgent:
         """Generate a creative idea based on the input parameters."""
         try:
             logger.debug(f"📤 Sending input to IdeationAgent: {input_data.model_dump()}")
-            response = self.chain.invoke(input_data.model_dump())
+            response = invoke_with_cache(
+                self.chain, self.template, self.llm, input_data.model_dump(), self.response_cache
+            )
             idea = response.strip().strip('"').strip("'")
             logger.debug(f"📥 Received idea: {idea}")
             return {"idea": idea}
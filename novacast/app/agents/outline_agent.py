@@ -13,7 +13,7 @@ Responsibilities:
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from pydantic import ValidationError
 from langchain_core.prompts import PromptTemplate
@@ -23,6 +23,7 @@ from langchain_ollama import OllamaLLM
 
 from app.utils.prompt_loader import load_prompt
 from app.config.settings import settings
+from app.services.llm.cache import ResponseCache, get_response_cache, invoke_with_cache
 from app.agents.types import (
     OutlineAgentInput,
     OutlineAgentResult,
@@ -45,10 +46,23 @@ def _safe_json_loads(s: str) -> Dict[str, Any]:
     return json.loads(s)
 
 
+def _is_valid_outline(raw: str) -> bool:
+    """Only well-formed outlines are worth caching; fallbacks should retry the LLM."""
+    try:
+        OutlineAgentResult(**_safe_json_loads(raw))
+        return True
+    except (json.JSONDecodeError, ValidationError, TypeError):
+        return False
+
+
 # ---- Agent -------------------------------------------------------------------
 
 class OutlineAgent:
-    def __init__(self, prompt_path: str = "prompts/outline_agent.yaml") -> None:
+    def __init__(
+        self,
+        prompt_path: str = "prompts/outline_agent.yaml",
+        response_cache: Optional[ResponseCache] = None,
+    ) -> None:
         self.prompt_cfg = load_prompt(prompt_path)
 
         self.template = PromptTemplate(
@@ -73,11 +87,20 @@ class OutlineAgent:
 
         self.chain: RunnableSequence = self.template | self.llm | StrOutputParser()
         self._outline_cache: List[str] = []
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
 
     def run(self, data: OutlineAgentInput) -> OutlineAgentResult:
         try:
             logger.debug(f"📤 Sending outline input to LLM: {data.model_dump()}")
-            raw = self.chain.invoke(data.model_dump())
+            raw = invoke_with_cache(
+                self.chain,
+                self.template,
+                self.llm,
+                data.model_dump(),
+                self.response_cache,
+                system=self.prompt_cfg.get("system", ""),
+                accept=_is_valid_outline,
+            )
             logger.debug(f"📥 Raw LLM response: {raw}")
 
             payload = _safe_json_loads(raw)
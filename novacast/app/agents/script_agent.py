@@ -12,11 +12,14 @@ Typical Flow:
 - Saves and loads scripts from files
 """
 
-from typing import Optional
+from typing import Iterator, Optional
+
+from app.services.llm.base import BaseLLMService
 
 class ScriptAgent:
-    def __init__(self, default_style: str = "neutral"):
+    def __init__(self, default_style: str = "neutral", llm: Optional[BaseLLMService] = None):
         self.style = default_style
+        self.llm = llm
 
     def generate_script(self, prompt: str) -> str:
         """
@@ -32,6 +35,27 @@ class ScriptAgent:
         # Placeholder logic
         return f"Generated Script based on: {prompt}"
 
+    def stream_script(self, prompt: str) -> Iterator[str]:
+        """
+        Streams the script as text chunks so downstream stages (TTS) can start early.
+        Uses the LLM's token stream when an LLM is configured; otherwise streams the
+        placeholder script word by word.
+
+        Args:
+            prompt: A textual idea or outline to turn into a script.
+
+        Yields:
+            Consecutive chunks of the script; their concatenation is the full script.
+        """
+        if self.llm is not None:
+            yield from self.llm.generate_stream(prompt)
+            return
+
+        script = self.generate_script(prompt)
+        words = script.split(" ")
+        for index, word in enumerate(words):
+            yield word if index == len(words) - 1 else word + " "
+
     def refine_script(self, script: str, feedback: Optional[str] = None) -> str:
         """
         Refines the script based on feedback (e.g. tone, target audience).
@@ -1,13 +1,23 @@
-from fastapi import Depends, HTTPException, Security
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
-from datetime import datetime, timedelta
+from fastapi import Depends, HTTPException
+from fastapi.security import OAuth2PasswordBearer
 from typing import Optional
-from . import models  # Assuming models are defined in the same package
-from ..config.settings import settings  # Assuming settings are defined in the config package
+from pydantic import BaseModel
+from ...config.settings import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+
+class User(BaseModel):
+    username: str
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    disabled: bool = False
+
+
+class TokenData(BaseModel):
+    username: Optional[str] = None
+
+
 # Dummy database for demonstration purposes
 fake_users_db = {
     "johndoe": {
@@ -25,7 +35,7 @@ def verify_password(plain_password, hashed_password):
 def get_user(db, username: str):
     if username in db:
         user_dict = db[username]
-        return models.User(**user_dict)  # Assuming User model is defined in models
+        return User(**user_dict)
 
 def verify_token(token: str):
     credentials_exception = HTTPException(
@@ -33,12 +43,16 @@ def verify_token(token: str):
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if not settings.jwt_secret:
+        raise credentials_exception  # no signing key configured: reject every token
+    from jose import JWTError, jwt  # python-jose, only needed once a token is presented
+
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-        token_data = models.TokenData(username=username)  # Assuming TokenData is defined in models
+        token_data = TokenData(username=username)
     except JWTError:
         raise credentials_exception
 
@@ -50,9 +64,9 @@ def verify_token(token: str):
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     return verify_token(token)
 
-async def get_current_active_user(current_user: models.User = Depends(get_current_user)):
+async def get_current_active_user(current_user: User = Depends(get_current_user)):
     if current_user.disabled:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-# Additional functions for RBAC, MFA, and API key management can be added here.
\ No newline at end of file
+# Additional functions for RBAC, MFA, and API key management can be added here.
@@ -0,0 +1,26 @@
+from typing import List, Optional
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+from app.db.pagination import MAX_PAGE_SIZE
+
+
+class PageParams(BaseModel):
+    limit: int
+    cursor: Optional[str] = None
+    fields: Optional[List[str]] = None
+
+
+def page_params(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    fields: Optional[str] = Query(None, description="comma separated fields to return, e.g. name,url"),
+) -> PageParams:
+    """Keyset pagination query parameters shared by list endpoints (see app/db/pagination.py)."""
+    selected = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    return PageParams(limit=limit, cursor=cursor, fields=selected)
+
+
+def invalid_cursor(e: ValueError) -> HTTPException:
+    return HTTPException(status_code=400, detail=str(e))
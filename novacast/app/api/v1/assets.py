@@ -1,35 +1,43 @@
 from fastapi import APIRouter, HTTPException, Depends
-from app.db.crud.assets import create_asset, get_asset, update_asset, delete_asset, list_assets
-from app.models.asset import AssetCreate, AssetUpdate, Asset
+from app.db.crud.assets import create_asset, get_asset, update_asset, delete_asset, get_assets
+from app.db.models.asset import Asset
+from app.db.pagination import InvalidCursor, Page
 from app.api.deps.auth import get_current_user
+from app.api.deps.pagination import PageParams, invalid_cursor, page_params
+from app.utils.errors import NotFoundError
 
 router = APIRouter()
 
-@router.post("/", response_model=Asset)
-async def create_new_asset(asset: AssetCreate, current_user: str = Depends(get_current_user)):
+@router.post("/", response_model=Asset, status_code=201)
+async def create_new_asset(asset: Asset, current_user: str = Depends(get_current_user)):
     return await create_asset(asset)
 
 @router.get("/{asset_id}", response_model=Asset)
 async def read_asset(asset_id: str, current_user: str = Depends(get_current_user)):
-    asset = await get_asset(asset_id)
-    if asset is None:
+    try:
+        return await get_asset(asset_id)
+    except NotFoundError:
         raise HTTPException(status_code=404, detail="Asset not found")
-    return asset
 
 @router.put("/{asset_id}", response_model=Asset)
-async def update_existing_asset(asset_id: str, asset: AssetUpdate, current_user: str = Depends(get_current_user)):
-    updated_asset = await update_asset(asset_id, asset)
-    if updated_asset is None:
+async def update_existing_asset(asset_id: str, asset: Asset, current_user: str = Depends(get_current_user)):
+    try:
+        return await update_asset(asset_id, asset)
+    except NotFoundError:
         raise HTTPException(status_code=404, detail="Asset not found")
-    return updated_asset
 
 @router.delete("/{asset_id}", response_model=dict)
 async def delete_existing_asset(asset_id: str, current_user: str = Depends(get_current_user)):
-    success = await delete_asset(asset_id)
-    if not success:
+    try:
+        await delete_asset(asset_id)
+    except NotFoundError:
         raise HTTPException(status_code=404, detail="Asset not found")
     return {"message": "Asset deleted successfully"}
 
-@router.get("/", response_model=list[Asset])
-async def list_all_assets(current_user: str = Depends(get_current_user)):
-    return await list_assets()
\ No newline at end of file
+@router.get("/", response_model=Page)
+async def list_all_assets(page: PageParams = Depends(page_params), current_user: str = Depends(get_current_user)):
+    """Newest first; follow `next_cursor` for the next page (null on the last one)."""
+    try:
+        return await get_assets(page.limit, page.cursor, page.fields)
+    except InvalidCursor as e:
+        raise invalid_cursor(e)
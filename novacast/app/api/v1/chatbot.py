@@ -1,6 +1,8 @@
-from fastapi import APIRouter, WebSocket, Depends
-from typing import List
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
+from typing import Dict, List
 from app.api.deps.auth import get_current_user
+from app.services.llm.base import LLMError
+from app.services.llm.factory import get_llm
 
 router = APIRouter()
 
@@ -11,13 +13,50 @@ async def chat(message: str, user: str = Depends(get_current_user)):
 
 @router.websocket("/ws/chat")
 async def websocket_chat(websocket: WebSocket, user: str = Depends(get_current_user)):
+    """
+    Streams the assistant reply token by token.
+    For every user message the client receives:
+        {"type": "token", "content": "..."}   (many)
+        {"type": "done"}                       (once the reply is complete)
+    or {"type": "error", "detail": "..."} if the model call fails or the configured
+    provider can't stream (the socket is then closed).
+    """
     await websocket.accept()
-    while True:
-        data = await websocket.receive_text()
-        # Process the incoming message and send a response
-        await websocket.send_text(f"Message received: {data}")
+    try:
+        llm = get_llm()
+    except (NotImplementedError, ValueError) as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close()
+        return
+    history: List[Dict[str, str]] = []
+    try:
+        while True:
+            data = await websocket.receive_text()
+            history.append({"role": "user", "content": data})
+
+            reply: List[str] = []
+            try:
+                async for chunk in llm.achat_stream(history):
+                    reply.append(chunk)
+                    await websocket.send_json({"type": "token", "content": chunk})
+            except LLMError as e:
+                history.pop()
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            except NotImplementedError as e:
+                # Providers without async streaming chat: no later message can succeed either
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                await websocket.close()
+                return
+
+            history.append({"role": "assistant", "content": "".join(reply)})
+            await websocket.send_json({"type": "done"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await llm.aclose()
 
 @router.get("/chat/history", response_model=List[str])
 async def get_chat_history(user: str = Depends(get_current_user)):
     # Retrieve chat history for the user
-    return ["Chat history item 1", "Chat history item 2"]
\ No newline at end of file
+    return ["Chat history item 1", "Chat history item 2"]
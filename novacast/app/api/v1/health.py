@@ -1,15 +1,21 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.db.connection import ping_db
 
 router = APIRouter()
 
-@router.get("/health")
+@router.get("")
 async def health_check():
     return {"status": "healthy"}
 
 @router.get("/readiness")
 async def readiness_check():
+    # Not ready while the configured database does not answer (no database configured → ready)
+    if await ping_db() is False:
+        return JSONResponse(status_code=503, content={"status": "not ready", "database": "unreachable"})
     return {"status": "ready"}
 
 @router.get("/liveness")
 async def liveness_check():
-    return {"status": "alive"}
\ No newline at end of file
+    return {"status": "alive"}
@@ -1,25 +1,103 @@
-from fastapi import APIRouter, HTTPException
-from app.media.tts_engine import TSEngine
-from app.media.video_builder import VideoBuilder
-from app.media.publisher import Publisher
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.api.deps.auth import get_current_user
+from app.config.settings import settings
+from app.db.models.job_log import JobLog
+from app.services.worker.jobs import TERMINAL_STATUSES
+from app.services.worker.queue import enqueue, get_job_status
+from app.services.worker.tasks import process_media as process_media_actor, publish_targets
 
 router = APIRouter()
 
-@router.post("/process_media/")
-async def process_media(script: str):
-    try:
-        # Step 1: Convert script to speech
-        tts_engine = TSEngine()
-        audio_file = await tts_engine.convert_script_to_audio(script)
 
-        # Step 2: Create video from audio
-        video_builder = VideoBuilder()
-        video_file = await video_builder.create_video_from_audio(audio_file)
+class MediaRequest(BaseModel):
+    script: str
+    voice: Optional[str] = None
+    engine: str = "coqui"
+    profile: Optional[str] = None         # render profile, see app/media/render_profiles.py
+    publish_target: Optional[str] = None  # name of a configured target (settings.publish_targets)
+
+
+class MediaJob(BaseModel):
+    task_id: str
+    status: str
+    status_url: str
+    events_url: str
+
+
+@router.post("", status_code=202, response_model=MediaJob)
+@router.post("/process_media/", status_code=202, response_model=MediaJob)
+async def process_media(media: MediaRequest, request: Request, current_user: str = Depends(get_current_user)):
+    """
+    Queues the script → narration → video (→ publish) job and returns immediately (202).
+    Rendering runs on the worker pools (app/services/worker/); the same request submitted
+    twice returns the same task id. Follow the job at `status_url` or stream it from
+    `events_url`.
+    """
+    if media.publish_target and media.publish_target not in publish_targets():
+        raise HTTPException(status_code=422, detail=f"Unknown publish target: {media.publish_target}")
+
+    # Broker and job store calls are blocking I/O: keep them off the event loop
+    task_id = await run_in_threadpool(enqueue, process_media_actor, **media.model_dump())
+    job = await run_in_threadpool(get_job_status, task_id)
+    return MediaJob(
+        task_id=task_id,
+        status=job.status if job else "queued",
+        status_url=str(request.url_for("get_media_job", job_id=task_id)),
+        events_url=str(request.url_for("stream_media_job", job_id=task_id)),
+    )
+
+
+async def _get_job(job_id: str) -> JobLog:
+    job = await run_in_threadpool(get_job_status, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=JobLog)
+async def get_media_job(job_id: str, current_user: str = Depends(get_current_user)):
+    """Status, attempts, current stage (progress), result and error of a media job."""
+    return await _get_job(job_id)
+
+
+def _event(job: JobLog) -> str:
+    data = job.model_dump(mode="json", include={"job_id", "status", "attempts", "progress", "result", "error_message"})
+    return f"event: {job.status}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _job_events(request: Request, job: JobLog) -> AsyncIterator[str]:
+    last = None
+    while True:
+        state = (job.status, job.attempts, job.progress)
+        if state != last:
+            last = state
+            yield _event(job)
+        if job.status in TERMINAL_STATUSES or await request.is_disconnected():
+            return
+        await asyncio.sleep(settings.job_events_poll_interval)
+        job = await run_in_threadpool(get_job_status, job.job_id) or job
 
-        # Step 3: Publish video
-        publisher = Publisher()
-        publish_response = await publisher.publish_video(video_file)
 
-        return {"message": "Media processed successfully", "publish_response": publish_response}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+@router.get("/jobs/{job_id}/events")
+async def stream_media_job(job_id: str, request: Request, current_user: str = Depends(get_current_user)):
+    """
+    Server-sent events for a media job: one event per status/stage change, named after the
+    job status (queued, running, retrying, succeeded, failed); the stream ends once the job
+    has succeeded or failed.
+        event: running
+        data: {"job_id": "...", "status": "running", "progress": {"stage": "video", "step": 3, "steps": 3}, ...}
+    """
+    job = await _get_job(job_id)
+    return StreamingResponse(
+        _job_events(request, job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,45 +1,42 @@
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
-from typing import List, Optional
+from typing import Optional
+from app.db.crud import prompts as crud
+from app.db.models.prompt import Prompt
+from app.db.pagination import InvalidCursor, Page
+from app.api.deps.auth import get_current_user
+from app.api.deps.pagination import PageParams, invalid_cursor, page_params
 
 router = APIRouter()
 
-class Prompt(BaseModel):
-    id: int
-    content: str
-    version: str
-    experiment_flag: Optional[bool] = False
+@router.post("/", response_model=Prompt, status_code=201)
+async def create_prompt(prompt: Prompt, current_user: str = Depends(get_current_user)):
+    return await crud.create_prompt(prompt.model_dump(exclude_none=True))
 
-# In-memory storage for prompts (for demonstration purposes)
-prompts_db = []
-
-@router.post("/", response_model=Prompt)
-def create_prompt(prompt: Prompt):
-    prompts_db.append(prompt)
-    return prompt
-
-@router.get("/", response_model=List[Prompt])
-def read_prompts():
-    return prompts_db
+@router.get("/", response_model=Page)
+async def read_prompts(name: Optional[str] = None, page: PageParams = Depends(page_params)):
+    """By name, newest version first; follow `next_cursor` for the next page (null on the last one)."""
+    try:
+        return await crud.list_prompts(name, page.limit, page.cursor, page.fields)
+    except InvalidCursor as e:
+        raise invalid_cursor(e)
 
 @router.get("/{prompt_id}", response_model=Prompt)
-def read_prompt(prompt_id: int):
-    for prompt in prompts_db:
-        if prompt.id == prompt_id:
-            return prompt
-    raise HTTPException(status_code=404, detail="Prompt not found")
+async def read_prompt(prompt_id: str):
+    prompt = await crud.read_prompt(prompt_id)
+    if prompt is None:
+        raise HTTPException(status_code=404, detail="Prompt not found")
+    return prompt
 
 @router.put("/{prompt_id}", response_model=Prompt)
-def update_prompt(prompt_id: int, updated_prompt: Prompt):
-    for index, prompt in enumerate(prompts_db):
-        if prompt.id == prompt_id:
-            prompts_db[index] = updated_prompt
-            return updated_prompt
-    raise HTTPException(status_code=404, detail="Prompt not found")
+async def update_prompt(prompt_id: str, updated_prompt: Prompt, current_user: str = Depends(get_current_user)):
+    prompt = await crud.update_prompt(prompt_id, updated_prompt.model_dump(exclude={"id", "created_at"}))
+    if prompt is None:
+        raise HTTPException(status_code=404, detail="Prompt not found")
+    return prompt
 
 @router.delete("/{prompt_id}", response_model=Prompt)
-def delete_prompt(prompt_id: int):
-    for index, prompt in enumerate(prompts_db):
-        if prompt.id == prompt_id:
-            return prompts_db.pop(index)
-    raise HTTPException(status_code=404, detail="Prompt not found")
\ No newline at end of file
+async def delete_prompt(prompt_id: str, current_user: str = Depends(get_current_user)):
+    prompt = await crud.read_prompt(prompt_id)
+    if prompt is None or not await crud.delete_prompt(prompt_id):
+        raise HTTPException(status_code=404, detail="Prompt not found")
+    return prompt
@@ -1,41 +1,43 @@
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
-from typing import List
-from app.db.crud.schedules import create_schedule, get_schedule, update_schedule, delete_schedule, get_all_schedules
+from app.db.crud.schedules import create_schedule, get_schedule, update_schedule, delete_schedule, get_schedules
+from app.db.models.schedule import Schedule
+from app.db.pagination import InvalidCursor, Page
 from app.api.deps.auth import get_current_user
+from app.api.deps.pagination import PageParams, invalid_cursor, page_params
+from app.utils.errors import NotFoundError
 
 router = APIRouter()
 
-class Schedule(BaseModel):
-    id: int
-    name: str
-    cron_expression: str
-
-@router.post("/", response_model=Schedule)
+@router.post("/", response_model=Schedule, status_code=201)
 async def create_new_schedule(schedule: Schedule, current_user: str = Depends(get_current_user)):
-    return await create_schedule(schedule)
+    return await create_schedule(schedule.model_dump(exclude_none=True))
 
 @router.get("/{schedule_id}", response_model=Schedule)
-async def read_schedule(schedule_id: int, current_user: str = Depends(get_current_user)):
-    schedule = await get_schedule(schedule_id)
-    if not schedule:
+async def read_schedule(schedule_id: str, current_user: str = Depends(get_current_user)):
+    try:
+        return await get_schedule(schedule_id)
+    except NotFoundError:
         raise HTTPException(status_code=404, detail="Schedule not found")
-    return schedule
 
 @router.put("/{schedule_id}", response_model=Schedule)
-async def update_existing_schedule(schedule_id: int, schedule: Schedule, current_user: str = Depends(get_current_user)):
-    updated_schedule = await update_schedule(schedule_id, schedule)
-    if not updated_schedule:
+async def update_existing_schedule(schedule_id: str, schedule: Schedule, current_user: str = Depends(get_current_user)):
+    try:
+        return await update_schedule(schedule_id, schedule.model_dump(exclude_none=True))
+    except NotFoundError:
         raise HTTPException(status_code=404, detail="Schedule not found")
-    return updated_schedule
 
 @router.delete("/{schedule_id}", response_model=dict)
-async def delete_existing_schedule(schedule_id: int, current_user: str = Depends(get_current_user)):
-    success = await delete_schedule(schedule_id)
-    if not success:
+async def delete_existing_schedule(schedule_id: str, current_user: str = Depends(get_current_user)):
+    try:
+        await delete_schedule(schedule_id)
+    except NotFoundError:
         raise HTTPException(status_code=404, detail="Schedule not found")
     return {"detail": "Schedule deleted successfully"}
 
-@router.get("/", response_model=List[Schedule])
-async def list_schedules(current_user: str = Depends(get_current_user)):
-    return await get_all_schedules()
\ No newline at end of file
+@router.get("/", response_model=Page)
+async def list_schedules(page: PageParams = Depends(page_params), current_user: str = Depends(get_current_user)):
+    """Next run first; follow `next_cursor` for the next page (null on the last one)."""
+    try:
+        return await get_schedules(page.limit, page.cursor, page.fields)
+    except InvalidCursor as e:
+        raise invalid_cursor(e)
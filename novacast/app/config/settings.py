@@ -19,10 +19,18 @@ class Settings(BaseSettings):
     db_name: Optional[str] = None
     db_user: Optional[str] = None
     db_password: Optional[str] = None
+    # Connection pool (one shared client per process, see app/db/connection.py)
+    db_max_pool_size: int = Field(default=100)
+    db_min_pool_size: int = Field(default=5)
+    db_max_idle_time_ms: int = Field(default=5 * 60 * 1000)
+    db_server_selection_timeout_ms: int = Field(default=5000)
+    db_connect_timeout_ms: int = Field(default=5000)
+    db_socket_timeout_ms: int = Field(default=30000)  # 0 = no timeout
     
     # API settings
     api_key: Optional[str] = None
-    jwt_secret: Optional[str] = None
+    jwt_secret: Optional[str] = None  # unset: every bearer token is rejected (app/api/deps/auth.py)
+    jwt_algorithm: str = Field(default="HS256")
     oauth2_client_id: Optional[str] = None
     oauth2_client_secret: Optional[str] = None
     
@@ -34,8 +42,92 @@ class Settings(BaseSettings):
     ollama_host: str = Field(default="http://localhost:11434")
     ollama_model: str = Field(default="llama3.2:latest")
     ollama_timeout: int = Field(default=120)
+    ollama_pool_size: int = Field(default=10)
+    ollama_keepalive_expiry: float = Field(default=60.0)
     llm_provider: str = Field(default="ollama")
 
+    # LLM response cache ("none" | "memory" | "sqlite" | "redis")
+    llm_cache_backend: str = Field(default="memory")
+    llm_cache_path: str = Field(default="storage/cache/llm_responses.sqlite3")
+    llm_cache_ttl_seconds: int = Field(default=7 * 24 * 3600)
+    llm_cache_max_entries: int = Field(default=1024)
+
+    # Pipeline checkpoints (job_logs collection, or pipeline_checkpoint_dir without DB_URL)
+    pipeline_checkpoints_enabled: bool = Field(default=False)
+    pipeline_checkpoint_dir: str = Field(default="storage/checkpoints")
+
+    # TTS settings
+    tts_model_name: str = Field(default="tts_models/en/ljspeech/tacotron2-DDC")
+    tts_device: str = Field(default="cpu")
+    tts_model_cache_size: int = Field(default=2)
+    tts_warmup_models: str = Field(default="")  # comma separated, loaded at worker start
+    tts_segment_workers: int = Field(default=0)  # 0 = one process per CPU core
+    tts_process_start_method: str = Field(default="spawn")
+    tts_sentence_pause_ms: int = Field(default=150)
+    tts_paragraph_pause_ms: int = Field(default=400)
+    tts_voice: str = Field(default="")  # speaker for multi-speaker models
+    tts_cache_enabled: bool = Field(default=True)
+    tts_cache_dir: str = Field(default="storage/cache/tts")
+    tts_cache_max_bytes: int = Field(default=1024 ** 3)
+
+    # Video rendering
+    output_dir: str = Field(default="output")  # per-job artifacts go to <output_dir>/jobs/<job_id>/
+    video_renderer: str = Field(default="auto")  # auto | ffmpeg | moviepy
+    ffmpeg_binary: str = Field(default="ffmpeg")
+    render_profile: str = Field(default="720p")  # see app/media/render_profiles.py
+    render_dedup_enabled: bool = Field(default=True)  # reuse videos rendered from identical inputs
+    render_index_dir: str = Field(default="storage/renders")  # local render index when DB_URL is unset
+
+    # Audio mastering (silence trim → music ducking → EBU R128 loudnorm), see app/media/audio_mastering.py
+    audio_mastering_enabled: bool = Field(default=True)
+    audio_trim_silence: bool = Field(default=True)
+    audio_silence_threshold_db: float = Field(default=-50.0)
+    audio_target_lufs: float = Field(default=-16.0)
+    audio_true_peak_db: float = Field(default=-1.5)
+    background_music_path: Optional[str] = None
+    background_music_volume_db: float = Field(default=-14.0)
+    audio_duck_ratio: float = Field(default=8.0)
+
+    # Subtitles (off | soft = separate caption track | burn = drawn into the video)
+    subtitles_mode: str = Field(default="soft")
+    subtitle_format: str = Field(default="srt")  # srt | vtt
+    subtitle_max_chars: int = Field(default=42)  # per line
+    subtitle_max_lines: int = Field(default=2)   # per cue
+    subtitle_min_duration: float = Field(default=0.8)
+    subtitle_language: str = Field(default="eng")
+    subtitle_style: str = Field(default="")  # libass force_style for burn-in, e.g. "FontSize=22,Outline=1"
+
+    # Background images ("pexels" | "local")
+    image_provider: str = Field(default="pexels")
+    pexels_api_key: Optional[str] = None
+    image_http_timeout: float = Field(default=10.0)
+    image_cache_dir: str = Field(default="storage/cache/images")
+    image_cache_ttl_seconds: int = Field(default=30 * 24 * 3600)
+    image_cache_miss_ttl_seconds: int = Field(default=3600)  # queries the provider had no photo for
+    image_cache_max_bytes: int = Field(default=512 * 1024 ** 2)
+    image_prefetch_workers: int = Field(default=4)
+
+    # Redis (cache / worker broker)
+    redis_url: str = Field(default="redis://localhost:6379/0")
+
+    # Workers (dramatiq), see app/services/worker/
+    worker_broker: str = Field(default="redis")  # redis | stub (in-memory, tests/dev)
+    worker_result_ttl_ms: int = Field(default=24 * 3600 * 1000)
+    worker_max_retries: int = Field(default=3)
+    worker_render_time_limit_ms: int = Field(default=30 * 60 * 1000)
+    worker_http_timeout: float = Field(default=30.0)
+    worker_job_poll_interval: float = Field(default=0.5)  # seconds between job status checks while awaiting a result
+    job_events_poll_interval: float = Field(default=1.0)  # seconds between job status checks of /media/jobs/{id}/events
+    # Worker pools (app/services/worker/profiles.py); 0 = one process per CPU core
+    worker_tts_processes: int = Field(default=0)
+    worker_render_processes: int = Field(default=0)
+    worker_io_processes: int = Field(default=1)
+    worker_io_threads: int = Field(default=32)
+    notification_webhook_url: Optional[str] = None
+    # Where POST /api/v1/media may publish: comma separated name=destination (URL or directory);
+    # clients pick a target by name, never by path or URL
+    publish_targets: str = Field(default="")  # e.g. "archive=/srv/videos,cdn=https://upload.example.com/videos/"
+
     # Other settings
     log_level: str = "INFO"
 
@@ -0,0 +1,137 @@
+# app/core/checkpoints.py
+"""
+Pipeline Checkpoints
+
+Persists the output of every orchestrator stage (the records passed to `Orchestrator.plan`)
+under a key derived from a hash of the stage's inputs. Because each stage's inputs include
+the outputs of the stages before it, the keys form a content-addressed chain: rerunning a
+pipeline with the same input resumes from the first stage that has no checkpoint, and
+any upstream change invalidates everything downstream of it.
+
+Stores:
+- LocalCheckpointStore: one JSON file per checkpoint in a local directory
+- MongoCheckpointStore: documents in a (sync, pymongo) collection such as `job_logs`
+
+get_checkpoint_store() builds the process-wide store from settings.pipeline_checkpoint*;
+Orchestrator uses it unless a store is passed in.
+
+Usage:
+    orchestrator = Orchestrator(checkpoint_store=LocalCheckpointStore())
+    orchestrator.run_pipeline(user_input)   # fails at video generation
+    orchestrator.run_pipeline(user_input)   # idea/outline/script/tts are reloaded
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def checkpoint_key(stage: str, inputs: Any) -> str:
+    """Stable SHA-256 over the stage name and its (JSON-serializable) inputs."""
+    payload = json.dumps({"stage": stage, "inputs": inputs}, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def save(self, key: str, record: Dict[str, Any]) -> None:
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+
+class LocalCheckpointStore(CheckpointStore):
+    def __init__(self, root: str = "storage/checkpoints"):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable checkpoint {key}: {e}")
+            return None
+
+    def save(self, key: str, record: Dict[str, Any]) -> None:
+        # Write to a temp file and rename so readers never see a partial checkpoint
+        tmp_path = os.path.join(self.root, f".{key}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**record, "saved_at": datetime.now(timezone.utc).isoformat()}, f, default=str)
+        os.replace(tmp_path, self._path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class MongoCheckpointStore(CheckpointStore):
+    """
+    Stores checkpoints as documents in a pymongo collection (e.g. `db.job_logs`).
+    Documents are tagged with `kind: "checkpoint"` so they can share a collection with job logs.
+    """
+
+    def __init__(self, collection: Any):
+        self.collection = collection
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        doc = self.collection.find_one({"_id": f"checkpoint:{key}"})
+        return doc.get("record") if doc else None
+
+    def save(self, key: str, record: Dict[str, Any]) -> None:
+        self.collection.replace_one(
+            {"_id": f"checkpoint:{key}"},
+            {
+                "_id": f"checkpoint:{key}",
+                "kind": "checkpoint",
+                "stage": record.get("name"),
+                "record": record,
+                "saved_at": datetime.now(timezone.utc),
+            },
+            upsert=True,
+        )
+
+    def delete(self, key: str) -> None:
+        self.collection.delete_one({"_id": f"checkpoint:{key}"})
+
+
+_store: Optional[CheckpointStore] = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """
+    Process-wide store: the `job_logs` collection of settings.db_url, or a local directory
+    (settings.pipeline_checkpoint_dir) when no database is configured.
+    None when settings.pipeline_checkpoints_enabled is off.
+    """
+    global _store
+    if not settings.pipeline_checkpoints_enabled:
+        return None
+    with _store_lock:
+        if _store is None:
+            if settings.db_url:
+                from app.db.connection import get_sync_database
+                _store = MongoCheckpointStore(get_sync_database()["job_logs"])
+            else:
+                _store = LocalCheckpointStore(settings.pipeline_checkpoint_dir)
+        return _store
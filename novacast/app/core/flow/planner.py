@@ -1,16 +1,25 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
 class PlanStep:
     def __init__(self, name, action, dependencies=None):
         self.name = name
         self.action = action
         self.dependencies = dependencies if dependencies else []
+        self.result = None
 
     def validate(self):
         if not self.name or not self.action:
             raise ValueError("Both name and action must be provided for a plan step.")
 
+    def dependency_names(self):
+        """Dependencies may be given as PlanStep objects or as step names."""
+        return [dep.name if isinstance(dep, PlanStep) else dep for dep in self.dependencies]
+
 class Planner:
-    def __init__(self):
+    def __init__(self, max_workers=None):
         self.plans = []
+        self.max_workers = max_workers
 
     def create_plan(self, plan_name, steps):
         plan = {
@@ -18,14 +27,81 @@ class Planner:
             "steps": steps
         }
         self.plans.append(plan)
+        return plan
 
     def validate_plan(self, plan):
+        names = set()
         for step in plan['steps']:
             step.validate()
+            if step.name in names:
+                raise ValueError(f"Duplicate step name in plan: {step.name}")
+            names.add(step.name)
 
-    def execute_plan(self, plan):
         for step in plan['steps']:
-            step.action()  # Assuming action is a callable
+            for dep in step.dependency_names():
+                if dep not in names:
+                    raise ValueError(f"Step '{step.name}' depends on unknown step '{dep}'.")
+
+        # Kahn's algorithm: every step must become ready at some point
+        remaining = {step.name: set(step.dependency_names()) for step in plan['steps']}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Plan '{plan['name']}' contains a dependency cycle: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def execute_plan(self, plan):
+        """
+        Runs the plan as a DAG. A step starts as soon as all of its dependencies
+        have finished, so independent steps run concurrently on a thread pool.
+
+        Each step's return value is stored on `step.result` (so downstream actions
+        can read it) and collected into the returned {step name: result} dict.
+        If a step raises, no new steps are started; steps already running are
+        allowed to finish and the first error is re-raised.
+        """
+        self.validate_plan(plan)
+        steps = {step.name: step for step in plan['steps']}
+        pending = {name: set(step.dependency_names()) for name, step in steps.items()}
+        results = {}
+
+        if not steps:
+            return results
+
+        with ThreadPoolExecutor(max_workers=self.max_workers or len(steps)) as executor:
+            running = {}
+            error = None
+
+            while pending or running:
+                if error is None:
+                    ready = [name for name, deps in pending.items() if not deps]
+                    for name in ready:
+                        del pending[name]
+                        running[executor.submit(steps[name].action)] = name
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        steps[name].result = future.result()
+                    except Exception as e:
+                        if error is None:
+                            error = e
+                        continue
+                    results[name] = steps[name].result
+                    for deps in pending.values():
+                        deps.discard(name)
+
+            if error is not None:
+                raise error
+
+        return results
 
     def get_plans(self):
         return self.plans
@@ -39,4 +115,4 @@ if __name__ == "__main__":
     planner.create_plan("My Plan", [step1, step2])
     for plan in planner.get_plans():
         planner.validate_plan(plan)
-        planner.execute_plan(plan)
\ No newline at end of file
+        planner.execute_plan(plan)
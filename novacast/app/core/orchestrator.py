@@ -4,16 +4,33 @@
 Orchestrator
 
 This class manages the execution flow between different content generation agents.
-It supports a pipeline mode (idea → outline → script), and can be extended to support
+It supports a pipeline mode (idea → outline → script → tts → video), a batch mode that
+overlaps LLM stages with rendering across many inputs, and can be extended to support
 chat-driven intent-based dispatching later.
+
+With a CheckpointStore (app/core/checkpoints.py; by default the one configured by
+settings.pipeline_checkpoints_enabled) every stage output is persisted under a hash of
+its inputs, so a rerun after a failure resumes from the first missing stage.
+
+Each run gets a job id; its audio and video are written to output/jobs/<job_id>/
+(app/media/artifacts.py), so concurrent runs never share output paths.
 """
 
-from typing import Any, Dict, List
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
 
 from app.agents.ideation_agent import IdeationAgent
 from app.agents.outline_agent import OutlineAgent
 from app.agents.script_agent import ScriptAgent
-from app.agents.types import OutlineAgentInput
+from app.agents.types import OutlineAgentInput, OutlineSection
+from app.core.checkpoints import CheckpointStore, checkpoint_key, get_checkpoint_store
+from app.core.flow.planner import PlanStep, Planner
+from app.config.settings import settings
+from app.media.artifacts import get_artifact_allocator, new_job_id
+
+logger = logging.getLogger(__name__)
 
 
 def _preview(val: Any, limit: int = 80) -> str:
@@ -32,12 +49,20 @@ def _preview(val: Any, limit: int = 80) -> str:
         return f"<unpreviewable: {e!r}>"
 
 
+def _mastering_options() -> Dict[str, Any]:
+    # Part of the mastering checkpoint key: other targets or music → another output
+    from app.media.audio_mastering import MasteringOptions
+    return {"enabled": settings.audio_mastering_enabled, **MasteringOptions.from_settings().model_dump()}
+
+
 class Orchestrator:
-    def __init__(self):
+    def __init__(self, checkpoint_store: Optional[CheckpointStore] = None):
         self.tasks: List[Dict[str, Any]] = []
         self.ideation_agent = IdeationAgent()
         self.outline_agent = OutlineAgent()
         self.script_agent = ScriptAgent()
+        self.planner = Planner()
+        self.checkpoint_store = checkpoint_store if checkpoint_store is not None else get_checkpoint_store()
 
     def plan(self, task: Dict[str, Any]) -> None:
         self.tasks.append(task)
@@ -45,68 +70,318 @@ class Orchestrator:
     def clear_tasks(self) -> None:
         self.tasks.clear()
 
-    def run_pipeline(self, user_input: Any) -> Dict[str, Any]:
+    def run_pipeline(self, user_input: Any, stream_tts: bool = False) -> Dict[str, Any]:
         """
         Executes the idea → outline → script → tts → video pipeline based on user input.
         The user_input can be a Pydantic model or a dict.
+
+        Stages are executed as a DAG by the Planner: the background image search runs
+        concurrently with TTS synthesis, and the video stage waits for both.
+
+        With stream_tts=True the script is streamed and each finished sentence is sent to
+        TTS immediately, so audio synthesis overlaps script generation.
+        """
+        user_input_dict = self._input_dict(user_input)
+        job_id = new_job_id()
+
+        # Shared between the script and tts stages when streaming
+        live: Optional[Dict[str, Any]] = {} if stream_tts else None
+        content_steps = self._content_steps(user_input, user_input_dict, live, job_id)
+        script_step = content_steps[-1]
+        media_steps = self._media_steps(lambda: script_step.result, [script_step], live, job_id)
+        steps = content_steps + media_steps
+
+        results = self.planner.execute_plan({"name": "media_pipeline", "steps": steps})
+        return self._pipeline_result(user_input_dict, results)
+
+    def run_batch(
+        self,
+        inputs: List[Any],
+        max_llm_concurrency: int = 2,
+        max_render_workers: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """
+        Runs the pipeline over many inputs with bounded concurrency.
+
+        LLM stages (idea → outline → script) run on a pool of `max_llm_concurrency`
+        threads; as soon as an item's script is ready its media stages (tts, background,
+        video) are queued on a separate pool of `max_render_workers`. LLM work for the
+        next items therefore overlaps rendering of the previous ones.
+
+        Returns one entry per input, in input order:
+            {"index", "status": "completed"|"failed", "result" | ("stage", "error")}
+        A failing item never aborts the rest of the batch.
         """
+        if max_llm_concurrency < 1 or max_render_workers < 1:
+            raise ValueError("max_llm_concurrency and max_render_workers must be >= 1")
+
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(inputs)
+
+        def failure(index: int, stage: str, e: Exception) -> Dict[str, Any]:
+            logger.warning(f"⚠️ Batch item {index} failed during {stage}: {e}")
+            return {
+                "index": index,
+                "status": "failed",
+                "stage": stage,
+                "error": f"{e.__class__.__name__}: {e}",
+            }
+
+        with ThreadPoolExecutor(max_llm_concurrency, thread_name_prefix="pipeline-llm") as llm_pool, \
+                ThreadPoolExecutor(max_render_workers, thread_name_prefix="pipeline-render") as render_pool:
+            llm_futures = {
+                llm_pool.submit(self._run_content_stages, user_input): index
+                for index, user_input in enumerate(inputs)
+            }
+            render_futures = {}
+
+            for future in as_completed(llm_futures):
+                index = llm_futures[future]
+                try:
+                    content = future.result()
+                except Exception as e:
+                    outcomes[index] = failure(index, "content", e)
+                    continue
+                render_futures[render_pool.submit(self._run_media_stages, content["script"])] = (index, content)
+
+            for future in as_completed(render_futures):
+                index, content = render_futures[future]
+                try:
+                    media = future.result()
+                except Exception as e:
+                    outcomes[index] = failure(index, "media", e)
+                    continue
+                outcomes[index] = {
+                    "index": index,
+                    "status": "completed",
+                    "result": self._pipeline_result(content["input"], {**content["results"], **media}),
+                }
+
+        return outcomes
+
+    def _run_content_stages(self, user_input: Any) -> Dict[str, Any]:
+        user_input_dict = self._input_dict(user_input)
+        steps = self._content_steps(user_input, user_input_dict)
+        results = self.planner.execute_plan({"name": "content_stages", "steps": steps})
+        return {"input": user_input_dict, "script": results["generate_script"], "results": results}
+
+    def _run_media_stages(self, script: str) -> Dict[str, Any]:
+        steps = self._media_steps(lambda: script, [], job_id=new_job_id())
+        return self.planner.execute_plan({"name": "media_stages", "steps": steps})
+
+    @staticmethod
+    def _input_dict(user_input: Any) -> Dict[str, Any]:
         # Convert Pydantic input to dict if needed
         if hasattr(user_input, "model_dump"):
-            user_input_dict = user_input.model_dump()
-        elif isinstance(user_input, dict):
-            user_input_dict = user_input
-        else:
-            raise ValueError("Invalid input type for user_input")
-
-        # Stage 1: Ideation
-        idea_result = self.ideation_agent.run(user_input)
-        idea = idea_result["idea"]
-        self.plan({"name": "generate_idea", "output": idea})
-
-        # Stage 2: Outline
-        outline_input = OutlineAgentInput(**{**user_input_dict, "idea": idea})
-        outline_result = self.outline_agent.run(outline_input)
-        outline = outline_result.sections
-        self.plan({"name": "generate_outline", "output": outline})
-
-        # Stage 3: Script
-        script = self.script_agent.generate_script("\n".join(
-    f"{s.title}\n{s.content}" for s in outline
-))
-        self.plan({"name": "generate_script", "output": script})
-
-        # Stage 4: Audio
-        from app.media.tts_engine import TTSEngine
-        tts_engine = TTSEngine()
+            return user_input.model_dump()
+        if isinstance(user_input, dict):
+            return user_input
+        raise ValueError("Invalid input type for user_input")
+
+    @staticmethod
+    def _pipeline_result(user_input_dict: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "input": user_input_dict,
+            "idea": results["generate_idea"],
+            "outline": results["generate_outline"],
+            "script": results["generate_script"],
+            "audio_path": results.get("audio_mastering") or results["tts_synthesis"],
+            "video_path": results["video_generation"],
+        }
+
+    def _content_steps(
+        self,
+        user_input: Any,
+        user_input_dict: Dict[str, Any],
+        live: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+    ) -> List[PlanStep]:
+        """
+        LLM-bound stages: idea → outline → script.
+        When `live` is given, the script is streamed into a sentence-level TTS stream
+        that is left in live["tts_stream"] for the tts stage to collect.
+        """
+        def generate_idea():
+            # Stage 1: Ideation
+            return self.ideation_agent.run(user_input)["idea"]
+
+        def generate_outline():
+            # Stage 2: Outline
+            outline_input = OutlineAgentInput(**{**user_input_dict, "idea": idea_step.result})
+            return self.outline_agent.run(outline_input).sections
+
+        def generate_script():
+            # Stage 3: Script
+            prompt = "\n".join(f"{s.heading}\n" + "\n".join(s.bullets) for s in outline_step.result)
+            if live is None:
+                return self.script_agent.generate_script(prompt)
+
+            from app.media.tts_engine import TTSEngine
+            audio_path = get_artifact_allocator().allocate("audio_coqui", ".wav", job_id)
+            stream = TTSEngine().start_stream("coqui", output_path=audio_path)
+            live["tts_stream"] = stream
+            chunks = []
+            try:
+                for chunk in self.script_agent.stream_script(prompt):
+                    chunks.append(chunk)
+                    stream.feed(chunk)
+            finally:
+                stream.close()
+            return "".join(chunks)
+
+        idea_step = self._step(
+            "generate_idea", generate_idea,
+            inputs=lambda: user_input_dict,
+        )
+        outline_step = self._step(
+            "generate_outline", generate_outline, [idea_step],
+            inputs=lambda: {"input": user_input_dict, "idea": idea_step.result},
+            encode=lambda sections: [s.model_dump() for s in sections],
+            decode=lambda sections: [OutlineSection(**s) for s in sections],
+        )
+        script_step = self._step(
+            "generate_script", generate_script, [outline_step],
+            inputs=lambda: [s.model_dump() for s in outline_step.result],
+        )
+
+        return [idea_step, outline_step, script_step]
+
+    def _media_steps(
+        self,
+        script: Callable[[], str],
+        dependencies: List[PlanStep],
+        live: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+    ) -> List[PlanStep]:
+        """
+        Render-bound stages: tts → audio mastering, concurrently with the background
+        search → video. `script` returns the script text once `dependencies` have completed.
+        """
+        def tts_synthesis():
+            # Stage 4a: Audio (collect the streamed synthesis if the script stage started one)
+            # Sentence timings are written next to the audio as the subtitle track
+            from app.media.subtitles import write_sidecar
+            stream = (live or {}).get("tts_stream")
+            if stream is not None:
+                audio_path = stream.result()
+                write_sidecar(stream.segments, audio_path)
+                return audio_path
+            from app.media.tts_engine import TTSEngine
+            audio_path = get_artifact_allocator().allocate("audio_coqui", ".wav", job_id)
+            synthesis = TTSEngine().synthesize_segmented("coqui", script(), output_path=audio_path)
+            write_sidecar(synthesis.segments, synthesis.audio_path)
+            return synthesis.audio_path
+
+        def audio_mastering():
+            # Stage 4c: silence trim, music ducking and loudness normalization in one pass.
+            # Mastering is an enhancement: on failure the raw narration is used as is.
+            from app.media.audio_mastering import master_narration
+            return master_narration(
+                tts_step.result, output_path=get_artifact_allocator().allocate("audio_master", ".wav", job_id),
+            )
+
+        def background_search():
+            # Stage 4b: Background image (independent of TTS)
+            from app.media.video_builder import fetch_background_image
+            return fetch_background_image(script())
+
+        def video_generation():
+            # Stage 5: Video
+            from app.media.subtitles import find_sidecar
+            from app.media.video_builder import build_media_clip_with_context
+            return build_media_clip_with_context(
+                mastering_step.result,
+                script(),
+                image_path=background_step.result or "",
+                output_path=get_artifact_allocator().allocate("final_video", ".mp4", job_id),
+                subtitles_path=find_sidecar(mastering_step.result),
+            )
+
+        tts_step = self._step(
+            "tts_synthesis", tts_synthesis, dependencies,
+            inputs=lambda: {"engine": "coqui", "script": script()},
+            artifact=True,
+        )
+        mastering_step = self._step(
+            "audio_mastering", audio_mastering, [tts_step],
+            inputs=lambda: {"audio_path": tts_step.result, "options": _mastering_options()},
+            artifact=True,
+        )
+        # Background lookups are served from the image store (app/media/image_source.py),
+        # so they are cheap to repeat and not checkpointed
+        background_step = self._step("background_search", background_search, dependencies)
+        video_step = self._step(
+            "video_generation", video_generation, [mastering_step, background_step],
+            inputs=lambda: {"audio_path": mastering_step.result, "script": script()},
+            artifact=True,
+        )
+
+        return [tts_step, mastering_step, background_step, video_step]
+
+    def _step(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        dependencies: Optional[List[PlanStep]] = None,
+        inputs: Optional[Callable[[], Any]] = None,
+        encode: Optional[Callable[[Any], Any]] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+        artifact: bool = False,
+    ) -> PlanStep:
+        """
+        Wraps a stage so its output (or error) is recorded in the task history.
+
+        With a checkpoint store configured, stages that declare `inputs` are checkpointed
+        under a hash of those inputs and resumed from the store on the next run.
+        `encode`/`decode` convert the output to/from JSON; `artifact` marks outputs that are
+        file paths, whose checkpoints are only valid while the file still exists.
+        """
+        def action():
+            key = None
+            if self.checkpoint_store is not None and inputs is not None:
+                key = checkpoint_key(name, inputs())
+                record = self._load_checkpoint(key, artifact)
+                if record is not None:
+                    output = decode(record["output"]) if decode else record["output"]
+                    self.plan({"name": name, "output": output, "resumed": True})
+                    return output
+
+            try:
+                output = fn()
+            except Exception as e:
+                self.plan({"name": name, "error": f"{e.__class__.__name__}: {e}"})
+                raise
+            self.plan({"name": name, "output": output})
+
+            if key is not None and output is not None:
+                self._save_checkpoint(key, {"name": name, "output": encode(output) if encode else output})
+            return output
+
+        return PlanStep(name, action, dependencies=dependencies)
+
+    def _load_checkpoint(self, key: str, artifact: bool) -> Optional[Dict[str, Any]]:
         try:
-            audio_path = tts_engine.synthesize("coqui", script)
-            self.plan({"name": "tts_synthesis", "output": audio_path})
+            record = self.checkpoint_store.load(key)
         except Exception as e:
-            self.plan({"name": "tts_synthesis", "error": f"{e.__class__.__name__}: {e}"})
-            raise
+            logger.warning(f"⚠️ Checkpoint lookup failed, running stage: {e}")
+            return None
+        if record is None or "output" not in record:
+            return None
+        if artifact and not (isinstance(record["output"], str) and os.path.exists(record["output"])):
+            return None
+        return record
 
-        # Stage 5: Video
-        from app.media.video_builder import build_media_clip_with_context
+    def _save_checkpoint(self, key: str, record: Dict[str, Any]) -> None:
         try:
-            video_path = build_media_clip_with_context(audio_path, script)
-            self.plan({"name": "video_generation", "output": video_path})
+            self.checkpoint_store.save(key, record)
         except Exception as e:
-            self.plan({"name": "video_generation", "error": f"{e.__class__.__name__}: {e}"})
-            raise
-
-        return {
-            "input": user_input_dict,
-            "idea": idea,
-            "outline": outline,
-            "script": script,
-            "audio_path": audio_path,
-            "video_path": video_path
-        }
+            logger.warning(f"⚠️ Failed to save checkpoint for {record['name']}: {e}")
 
     def print_tasks(self) -> None:
         for task in self.tasks:
             name = task.get("name", "?")
             if "error" in task:
                 print(f"[{name}] ✖ {task['error']}")
+            elif task.get("resumed"):
+                print(f"[{name}] ↺ {_preview(task.get('output'))}")
             else:
                 print(f"[{name}] → {_preview(task.get('output'))}")
@@ -1,32 +1,154 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import errors
-import os
-import asyncio
+# app/db/connection.py
+"""
+MongoDB connection manager.
+
+Each client owns a connection pool, so the process keeps ONE client and every caller
+borrows connections from its pool instead of connecting per request:
+- async (motor): created at application startup (FastAPI lifespan, app/main.py), closed
+  at shutdown; CRUD modules (app/db/crud/*) get the database through get_database()
+- sync (pymongo): for worker-side stores that run outside the event loop (job state,
+  render index), through get_sync_database(); close_db() drops those stores with the
+  client, so they rebind after a restart in the same process
+
+Both clients use the same settings.db_* pool size and timeouts. Without settings.db_url
+no client is created: init_db() only logs, ping_db() reports None and get_database()
+raises, while the worker-side stores fall back to their local implementations.
+
+Usage:
+    await init_db()                 # startup
+    db = await get_database()       # in CRUD functions
+    await db.assets.find_one({"_id": asset_id})
+    await ping_db()                 # readiness: True / False / None (not configured)
+    await close_db()                # shutdown
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import MongoClient, errors
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def client_options() -> Dict[str, Any]:
+    """Pool size and timeouts shared by the async and the sync client."""
+    return {
+        "maxPoolSize": settings.db_max_pool_size,
+        "minPoolSize": settings.db_min_pool_size,
+        "maxIdleTimeMS": settings.db_max_idle_time_ms,
+        "serverSelectionTimeoutMS": settings.db_server_selection_timeout_ms,
+        "connectTimeoutMS": settings.db_connect_timeout_ms,
+        "socketTimeoutMS": settings.db_socket_timeout_ms or None,
+        "appname": settings.app_name,
+    }
+
+
+def database_name() -> str:
+    return settings.db_name or "novacast"
+
 
 class DatabaseConnection:
-    def __init__(self, uri: str, db_name: str):
-        self.client = AsyncIOMotorClient(uri)
+    def __init__(self, uri: str, db_name: str, **options: Any):
+        self.client = AsyncIOMotorClient(uri, **options)
         self.db = self.client[db_name]
 
-    async def close(self):
+    def close(self) -> None:
         self.client.close()
 
-    async def get_collection(self, collection_name: str):
+    async def ping(self) -> bool:
+        """True when the server answers a ping within the server selection timeout."""
         try:
-            return self.db[collection_name]
+            await self.client.admin.command("ping")
+            return True
         except errors.PyMongoError as e:
-            print(f"Error accessing collection {collection_name}: {e}")
-            return None
-
-async def init_db():
-    db_uri = os.getenv("DATABASE_URI", "mongodb://localhost:27017")
-    db_name = os.getenv("DATABASE_NAME", "novacast")
-    db_connection = DatabaseConnection(db_uri, db_name)
-    return db_connection
-
-# Example usage
-if __name__ == "__main__":
-    loop = asyncio.get_event_loop()
-    db = loop.run_until_complete(init_db())
-    # Perform database operations here
-    loop.run_until_complete(db.close())
\ No newline at end of file
+            logger.warning(f"⚠️ MongoDB ping failed: {e}")
+            return False
+
+    def get_collection(self, collection_name: str):
+        return self.db[collection_name]
+
+
+_connection: Optional[DatabaseConnection] = None
+_sync_client: Optional[MongoClient] = None
+_lock = threading.Lock()
+
+
+def _require_db_url() -> str:
+    if not settings.db_url:
+        raise RuntimeError("DB_URL is not set: no database configured")
+    return settings.db_url
+
+
+def get_connection() -> DatabaseConnection:
+    """Process-wide motor connection (created on first use if startup did not)."""
+    global _connection
+    with _lock:
+        if _connection is None:
+            _connection = DatabaseConnection(_require_db_url(), database_name(), **client_options())
+        return _connection
+
+
+async def get_database() -> AsyncIOMotorDatabase:
+    return get_connection().db
+
+
+def get_sync_database():
+    """Process-wide pymongo database, for code that runs outside the event loop."""
+    global _sync_client
+    with _lock:
+        if _sync_client is None:
+            _sync_client = MongoClient(_require_db_url(), **client_options())
+        return _sync_client[database_name()]
+
+
+async def init_db() -> Optional[DatabaseConnection]:
+    """Opens the shared connection at startup; logs (does not fail) when the server is down."""
+    if not settings.db_url:
+        logger.warning("⚠️ DB_URL not set: starting without a database")
+        return None
+    connection = get_connection()
+    if await connection.ping():
+        logger.info(f"🗄️ Connected to MongoDB database '{database_name()}'")
+    return connection
+
+
+async def ping_db() -> Optional[bool]:
+    """Readiness check: True/False, or None when no database is configured."""
+    if not settings.db_url:
+        return None
+    return await get_connection().ping()
+
+
+def _uses_client(collection: Any, client: MongoClient) -> bool:
+    return getattr(getattr(collection, "database", None), "client", None) is client
+
+
+def _release_sync_stores(client: MongoClient) -> None:
+    """
+    The worker-side stores are process-wide singletons holding collections of the sync
+    client; drop the ones bound to `client` so the next use rebinds to a new client.
+    """
+    from app.media import render_index
+    from app.services.worker import jobs
+
+    if _uses_client(getattr(jobs._store, "collection", None), client):
+        jobs.set_job_state_store(None)
+    deduplicator = render_index._deduplicator
+    if deduplicator is not None and _uses_client(getattr(deduplicator.index, "collection", None), client):
+        render_index.set_render_deduplicator(None)
+
+
+async def close_db() -> None:
+    global _connection, _sync_client
+    with _lock:
+        connection, sync_client = _connection, _sync_client
+        _connection = _sync_client = None
+    if connection is not None:
+        connection.close()
+    if sync_client is not None:
+        _release_sync_stores(sync_client)
+        sync_client.close()
@@ -1,31 +1,58 @@
-from sqlalchemy.orm import Session
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from pymongo import ReturnDocument
+
+from app.db.connection import get_database
 from app.db.models.asset import Asset
+from app.db.pagination import Page, paginate
 from app.utils.errors import NotFoundError
 
-def create_asset(db: Session, asset: Asset) -> Asset:
-    db.add(asset)
-    db.commit()
-    db.refresh(asset)
-    return asset
 
-def get_asset(db: Session, asset_id: int) -> Asset:
-    asset = db.query(Asset).filter(Asset.id == asset_id).first()
-    if asset is None:
-        raise NotFoundError(f"Asset with id {asset_id} not found")
-    return asset
+ASSET_SORT = [("created_at", -1), ("_id", -1)]  # newest first (index created_at, see app/db/indexes.py)
+# The render index (app/media/render_index.py) keeps its entries in the same collection
+USER_ASSETS = {"kind": {"$ne": "render"}}
 
-def get_assets(db: Session, skip: int = 0, limit: int = 100) -> list[Asset]:
-    return db.query(Asset).offset(skip).limit(limit).all()
 
-def update_asset(db: Session, asset_id: int, updated_asset: Asset) -> Asset:
-    asset = get_asset(db, asset_id)
-    for key, value in updated_asset.dict().items():
-        setattr(asset, key, value)
-    db.commit()
-    db.refresh(asset)
+def _to_asset(doc: dict, partial: bool = False):
+    doc["id"] = str(doc.pop("_id"))
+    return doc if partial else Asset(**doc)
+
+async def create_asset(asset: Asset) -> Asset:
+    db = await get_database()
+    asset = asset.model_copy(update={"id": asset.id or uuid.uuid4().hex})
+    await db.assets.insert_one({"_id": asset.id, **asset.model_dump(exclude={"id"})})
     return asset
 
-def delete_asset(db: Session, asset_id: int) -> None:
-    asset = get_asset(db, asset_id)
-    db.delete(asset)
-    db.commit()
\ No newline at end of file
+async def get_asset(asset_id: str) -> Asset:
+    db = await get_database()
+    doc = await db.assets.find_one({"_id": asset_id})
+    if doc is None:
+        raise NotFoundError(f"Asset with id {asset_id}")
+    return _to_asset(doc)
+
+async def get_assets(limit: int = 100, cursor: Optional[str] = None, fields: Optional[List[str]] = None) -> Page:
+    """One page of assets, newest first; pass the page's next_cursor to get the next one.
+    With `fields` the items are dicts with only those fields (and `id`)."""
+    db = await get_database()
+    docs, next_cursor = await paginate(db.assets, USER_ASSETS, ASSET_SORT, limit, cursor, fields)
+    return Page(items=[_to_asset(doc, partial=bool(fields)) for doc in docs], next_cursor=next_cursor)
+
+async def update_asset(asset_id: str, updated_asset: Asset) -> Asset:
+    db = await get_database()
+    fields = updated_asset.model_dump(exclude={"id", "created_at"})
+    doc = await db.assets.find_one_and_update(
+        {"_id": asset_id},
+        {"$set": {**fields, "updated_at": datetime.now(timezone.utc)}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if doc is None:
+        raise NotFoundError(f"Asset with id {asset_id}")
+    return _to_asset(doc)
+
+async def delete_asset(asset_id: str) -> None:
+    db = await get_database()
+    result = await db.assets.delete_one({"_id": asset_id})
+    if result.deleted_count == 0:
+        raise NotFoundError(f"Asset with id {asset_id}")
@@ -1,17 +1,25 @@
 from typing import List, Optional
 from app.db.models.chat_session import ChatSession
 from app.db.connection import get_database
+from app.db.pagination import Page, paginate
+
+# A user's sessions, newest first (index user_id_created_at, see app/db/indexes.py)
+SESSION_SORT = [("created_at", -1), ("_id", -1)]
+
+def _to_session(doc: dict, partial: bool = False):
+    doc["id"] = str(doc.pop("_id"))
+    return doc if partial else ChatSession(**doc)
 
 async def create_chat_session(session_data: dict) -> ChatSession:
     db = await get_database()
     chat_session = ChatSession(**session_data)
-    await db.chat_sessions.insert_one(chat_session.dict())
+    await db.chat_sessions.insert_one({"_id": chat_session.id, **chat_session.model_dump(exclude={"id"})})
     return chat_session
 
 async def get_chat_session(session_id: str) -> Optional[ChatSession]:
     db = await get_database()
     session_data = await db.chat_sessions.find_one({"_id": session_id})
-    return ChatSession(**session_data) if session_data else None
+    return _to_session(session_data) if session_data else None
 
 async def update_chat_session(session_id: str, update_data: dict) -> Optional[ChatSession]:
     db = await get_database()
@@ -25,7 +33,9 @@ async def delete_chat_session(session_id: str) -> bool:
     result = await db.chat_sessions.delete_one({"_id": session_id})
     return result.deleted_count > 0
 
-async def list_chat_sessions(limit: int = 10, skip: int = 0) -> List[ChatSession]:
+async def list_chat_sessions(
+    user_id: str, limit: int = 10, cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+) -> Page:
     db = await get_database()
-    sessions_data = await db.chat_sessions.find().skip(skip).limit(limit).to_list(length=limit)
-    return [ChatSession(**session) for session in sessions_data]
\ No newline at end of file
+    docs, next_cursor = await paginate(db.chat_sessions, {"user_id": user_id}, SESSION_SORT, limit, cursor, fields)
+    return Page(items=[_to_session(doc, partial=bool(fields)) for doc in docs], next_cursor=next_cursor)
@@ -1,32 +1,68 @@
-from typing import List
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from pymongo import ReturnDocument
+
+from app.db.connection import get_database
 from app.db.models.job_log import JobLog
+from app.db.pagination import Page, paginate
 
-def create_job_log(db: Session, job_log: JobLog) -> JobLog:
-    db.add(job_log)
-    db.commit()
-    db.refresh(job_log)
-    return job_log
+# Job documents are written by the workers (app/services/worker/jobs.py): `_id` is
+# "job:<job_id>" and `kind` is "job", since checkpoints share the collection
+
+
+def _doc_id(job_id: str) -> str:
+    return f"job:{job_id}"
+
+# Newest first (indexes status_start_time / kind_start_time, see app/db/indexes.py)
+JOB_LOG_SORT = [("start_time", -1), ("_id", -1)]
 
-def get_job_log(db: Session, job_log_id: int) -> JobLog:
-    return db.query(JobLog).filter(JobLog.id == job_log_id).first()
 
-def get_job_logs(db: Session, skip: int = 0, limit: int = 100) -> List[JobLog]:
-    return db.query(JobLog).offset(skip).limit(limit).all()
+def job_log_query(status: Optional[str] = None) -> dict:
+    """Filter of get_job_logs: jobs in one status, or all jobs (not checkpoints)."""
+    return {"status": status} if status else {"kind": "job"}
 
-def update_job_log(db: Session, job_log_id: int, job_log_data: JobLog) -> JobLog:
-    job_log = db.query(JobLog).filter(JobLog.id == job_log_id).first()
-    if job_log:
-        for key, value in job_log_data.dict().items():
-            setattr(job_log, key, value)
-        db.commit()
-        db.refresh(job_log)
+
+def _to_job_log(doc: dict, partial: bool = False):
+    doc.pop("_id", None)
+    doc.pop("kind", None)
+    return doc if partial else JobLog(**doc)
+
+async def create_job_log(job_log: JobLog) -> JobLog:
+    db = await get_database()
+    await db.job_logs.insert_one({"_id": _doc_id(job_log.job_id), "kind": "job", **job_log.model_dump(exclude={"id"})})
     return job_log
 
-def delete_job_log(db: Session, job_log_id: int) -> bool:
-    job_log = db.query(JobLog).filter(JobLog.id == job_log_id).first()
-    if job_log:
-        db.delete(job_log)
-        db.commit()
-        return True
-    return False
\ No newline at end of file
+async def get_job_log(job_id: str) -> Optional[JobLog]:
+    db = await get_database()
+    doc = await db.job_logs.find_one({"_id": _doc_id(job_id)})
+    return _to_job_log(doc) if doc else None
+
+async def get_job_logs(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Page:
+    """One page of jobs (optionally in one status), newest first."""
+    db = await get_database()
+    query = job_log_query(status)
+    if fields:
+        fields = [*fields, "job_id"]
+    docs, next_cursor = await paginate(db.job_logs, query, JOB_LOG_SORT, limit, cursor, fields)
+    return Page(items=[_to_job_log(doc, partial=bool(fields)) for doc in docs], next_cursor=next_cursor)
+
+async def update_job_log(job_id: str, job_log_data: dict) -> Optional[JobLog]:
+    db = await get_database()
+    fields = {key: value for key, value in job_log_data.items() if key not in ("id", "job_id")}
+    doc = await db.job_logs.find_one_and_update(
+        {"_id": _doc_id(job_id)},
+        {"$set": {**fields, "updated_at": datetime.now(timezone.utc)}},
+        return_document=ReturnDocument.AFTER,
+    )
+    return _to_job_log(doc) if doc else None
+
+async def delete_job_log(job_id: str) -> bool:
+    db = await get_database()
+    result = await db.job_logs.delete_one({"_id": _doc_id(job_id)})
+    return result.deleted_count > 0
@@ -1,30 +1,50 @@
-from typing import List, Dict
+import uuid
+from typing import List, Dict, Optional
 from app.db.models.prompt import Prompt  # Assuming the Prompt model is defined in models/prompt.py
 from app.db.connection import get_database  # Assuming a function to get the database connection
+from app.db.pagination import Page, paginate
+
+# By name, newest version first (index name_version, see app/db/indexes.py)
+PROMPT_SORT = [("name", 1), ("version", -1), ("_id", 1)]
+
+def prompt_query(name: Optional[str] = None) -> dict:
+    """Filter of list_prompts: every version of one prompt, or all prompts."""
+    return {"name": name} if name else {}
+
+def _to_prompt(doc: dict, partial: bool = False):
+    doc["id"] = str(doc.pop("_id"))
+    return doc if partial else Prompt(**doc)
 
 async def create_prompt(prompt_data: Dict) -> Prompt:
     db = await get_database()
-    prompt = Prompt(**prompt_data)
-    await db.prompts.insert_one(prompt.dict())
+    prompt = Prompt(**{**prompt_data, "id": prompt_data.get("id") or uuid.uuid4().hex})
+    await db.prompts.insert_one({"_id": prompt.id, **prompt.model_dump(exclude={"id"})})
     return prompt
 
 async def read_prompt(prompt_id: str) -> Prompt:
     db = await get_database()
     prompt_data = await db.prompts.find_one({"_id": prompt_id})
-    return Prompt(**prompt_data) if prompt_data else None
+    return _to_prompt(prompt_data) if prompt_data else None
 
 async def update_prompt(prompt_id: str, prompt_data: Dict) -> Prompt:
     db = await get_database()
-    await db.prompts.update_one({"_id": prompt_id}, {"$set": prompt_data})
+    fields = {key: value for key, value in prompt_data.items() if key not in ("id", "_id")}
+    await db.prompts.update_one({"_id": prompt_id}, {"$set": fields})
     updated_prompt_data = await db.prompts.find_one({"_id": prompt_id})
-    return Prompt(**updated_prompt_data) if updated_prompt_data else None
+    return _to_prompt(updated_prompt_data) if updated_prompt_data else None
 
 async def delete_prompt(prompt_id: str) -> bool:
     db = await get_database()
     result = await db.prompts.delete_one({"_id": prompt_id})
     return result.deleted_count > 0
 
-async def list_prompts() -> List[Prompt]:
+async def list_prompts(
+    name: Optional[str] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Page:
     db = await get_database()
-    prompts_data = await db.prompts.find().to_list(length=None)
-    return [Prompt(**data) for data in prompts_data]
\ No newline at end of file
+    query = prompt_query(name)
+    docs, next_cursor = await paginate(db.prompts, query, PROMPT_SORT, limit, cursor, fields)
+    return Page(items=[_to_prompt(doc, partial=bool(fields)) for doc in docs], next_cursor=next_cursor)
@@ -1,32 +1,57 @@
-from sqlalchemy.orm import Session
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from pymongo import ReturnDocument
+
+from app.db.connection import get_database
 from app.db.models.schedule import Schedule
+from app.db.pagination import Page, paginate
 from app.utils.errors import NotFoundError
 
-def create_schedule(db: Session, schedule_data: dict) -> Schedule:
-    schedule = Schedule(**schedule_data)
-    db.add(schedule)
-    db.commit()
-    db.refresh(schedule)
-    return schedule
 
-def get_schedule(db: Session, schedule_id: int) -> Schedule:
-    schedule = db.query(Schedule).filter(Schedule.id == schedule_id).first()
-    if not schedule:
-        raise NotFoundError(f"Schedule with id {schedule_id} not found")
-    return schedule
+SCHEDULE_SORT = [("next_run", 1), ("_id", 1)]  # next run first (index next_run, see app/db/indexes.py)
 
-def get_schedules(db: Session, skip: int = 0, limit: int = 100) -> list:
-    return db.query(Schedule).offset(skip).limit(limit).all()
 
-def update_schedule(db: Session, schedule_id: int, schedule_data: dict) -> Schedule:
-    schedule = get_schedule(db, schedule_id)
-    for key, value in schedule_data.items():
-        setattr(schedule, key, value)
-    db.commit()
-    db.refresh(schedule)
+def _to_schedule(doc: dict, partial: bool = False):
+    doc["id"] = str(doc.pop("_id"))
+    return doc if partial else Schedule(**doc)
+
+async def create_schedule(schedule_data: dict) -> Schedule:
+    db = await get_database()
+    schedule = Schedule(**{**schedule_data, "id": schedule_data.get("id") or uuid.uuid4().hex})
+    if schedule.next_run is None:
+        schedule.next_run = schedule.start_time
+    await db.schedules.insert_one({"_id": schedule.id, **schedule.model_dump(exclude={"id"})})
     return schedule
 
-def delete_schedule(db: Session, schedule_id: int) -> None:
-    schedule = get_schedule(db, schedule_id)
-    db.delete(schedule)
-    db.commit()
\ No newline at end of file
+async def get_schedule(schedule_id: str) -> Schedule:
+    db = await get_database()
+    doc = await db.schedules.find_one({"_id": schedule_id})
+    if doc is None:
+        raise NotFoundError(f"Schedule with id {schedule_id}")
+    return _to_schedule(doc)
+
+async def get_schedules(limit: int = 100, cursor: Optional[str] = None, fields: Optional[List[str]] = None) -> Page:
+    """One page of schedules, next run first; pass the page's next_cursor to get the next one."""
+    db = await get_database()
+    docs, next_cursor = await paginate(db.schedules, {}, SCHEDULE_SORT, limit, cursor, fields)
+    return Page(items=[_to_schedule(doc, partial=bool(fields)) for doc in docs], next_cursor=next_cursor)
+
+async def update_schedule(schedule_id: str, schedule_data: dict) -> Schedule:
+    db = await get_database()
+    fields = {key: value for key, value in schedule_data.items() if key not in ("id", "_id", "created_at")}
+    doc = await db.schedules.find_one_and_update(
+        {"_id": schedule_id},
+        {"$set": {**fields, "updated_at": datetime.now(timezone.utc)}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if doc is None:
+        raise NotFoundError(f"Schedule with id {schedule_id}")
+    return _to_schedule(doc)
+
+async def delete_schedule(schedule_id: str) -> None:
+    db = await get_database()
+    result = await db.schedules.delete_one({"_id": schedule_id})
+    if result.deleted_count == 0:
+        raise NotFoundError(f"Schedule with id {schedule_id}")
@@ -0,0 +1,121 @@
+# app/db/indexes.py
+"""
+Declarative MongoDB indexes.
+
+Every index a query in app/db/crud/* (or a worker-side store) relies on is declared
+here, next to the query it serves. ensure_indexes() creates them at application startup
+(FastAPI lifespan, app/main.py); create_index is idempotent, so existing indexes are left
+as they are, while an index whose keys or options changed is dropped and rebuilt.
+
+List queries filter on the index prefix and sort on the rest of its keys, so MongoDB
+walks the index in order and stops after `limit` documents instead of scanning and
+sorting the whole collection. Listings are paginated by keyset (app/db/pagination.py)
+with `_id` as the last sort key, so `_id` ends those indexes too. collection_scans()
+inspects explain() output so tests can assert that a query does not fall back to a
+COLLSCAN.
+
+Usage:
+    await ensure_indexes(await get_database())
+    explain = await db.chat_sessions.find({"user_id": "u1"}).sort("created_at", -1).explain()
+    assert not collection_scans(explain)
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+from pymongo import ASCENDING, DESCENDING, errors
+
+logger = logging.getLogger(__name__)
+
+
+class IndexSpec(BaseModel):
+    collection: str
+    keys: List[Tuple[str, int]]
+    name: str
+    unique: bool = False
+    partial_filter: Optional[Dict[str, Any]] = None
+
+    def options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"name": self.name, "unique": self.unique}
+        if self.partial_filter:
+            options["partialFilterExpression"] = self.partial_filter
+        return options
+
+
+INDEXES: List[IndexSpec] = [
+    # list_chat_sessions: a user's sessions, newest first
+    IndexSpec(collection="chat_sessions", name="user_id_created_at",
+              keys=[("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+    # get_job_logs(status=...): jobs in a status, newest first
+    IndexSpec(collection="job_logs", name="status_start_time",
+              keys=[("status", ASCENDING), ("start_time", DESCENDING), ("_id", DESCENDING)]),
+    # get_job_logs(): all jobs, newest first (checkpoints share the collection, hence `kind`)
+    IndexSpec(collection="job_logs", name="kind_start_time",
+              keys=[("kind", ASCENDING), ("start_time", DESCENDING), ("_id", DESCENDING)]),
+    # get_schedules / due schedules: next run first
+    IndexSpec(collection="schedules", name="next_run",
+              keys=[("next_run", ASCENDING), ("_id", ASCENDING)]),
+    # list_prompts / latest version of a prompt
+    IndexSpec(collection="prompts", name="name_version",
+              keys=[("name", ASCENDING), ("version", DESCENDING), ("_id", ASCENDING)]),
+    # get_assets: newest first (render index entries, kind "render", are filtered out on fetch)
+    IndexSpec(collection="assets", name="created_at",
+              keys=[("created_at", DESCENDING), ("_id", DESCENDING)]),
+]
+
+
+# Server error codes of create_index when an index of that name exists with other keys/options
+INDEX_CONFLICT_CODES = (85, 86)  # IndexOptionsConflict, IndexKeySpecsConflict
+
+
+async def _ensure_index(collection: Any, spec: IndexSpec) -> None:
+    try:
+        await collection.create_index(spec.keys, **spec.options())
+    except errors.OperationFailure as e:
+        if e.code not in INDEX_CONFLICT_CODES:
+            raise
+        # The declaration changed since the index was built: rebuild it under the same name
+        logger.info(f"🗂️ Rebuilding index {spec.collection}.{spec.name}: {e}")
+        await collection.drop_index(spec.name)
+        await collection.create_index(spec.keys, **spec.options())
+
+
+async def ensure_indexes(db: Any, indexes: Optional[List[IndexSpec]] = None) -> List[str]:
+    """
+    Creates the declared indexes on a motor database; returns the names ensured.
+    Indexes whose declaration changed are dropped and rebuilt. Logs (does not raise) when
+    an index fails or the server cannot be reached, so startup is not blocked.
+    """
+    ensured = []
+    for spec in indexes or INDEXES:
+        try:
+            await _ensure_index(db[spec.collection], spec)
+            ensured.append(f"{spec.collection}.{spec.name}")
+        except errors.ConnectionFailure as e:
+            logger.warning(f"⚠️ Failed to ensure MongoDB indexes ({len(ensured)} done): {e}")
+            return ensured
+        except errors.PyMongoError as e:
+            logger.warning(f"⚠️ Failed to ensure index {spec.collection}.{spec.name}: {e}")
+    logger.info(f"🗂️ Ensured {len(ensured)} MongoDB indexes")
+    return ensured
+
+
+def _stages(plan: Dict[str, Any]):
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            yield from _stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+def collection_scans(explain: Dict[str, Any]) -> List[str]:
+    """
+    Namespaces whose winning plan (from explain() output) scans the whole collection.
+    Empty when every stage of the plan reads through an index.
+    """
+    planner = explain.get("queryPlanner", {})
+    if "COLLSCAN" in _stages(planner.get("winningPlan", {})):
+        return [planner.get("namespace", "?")]
+    return []
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 
@@ -8,6 +8,7 @@ class ChatSession(BaseModel):
     start_time: datetime
     end_time: Optional[datetime] = None
     messages: list[str]
+    created_at: datetime = Field(default_factory=datetime.now)
 
     class Config:
         orm_mode = True
\ No newline at end of file
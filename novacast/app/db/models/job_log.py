@@ -1,14 +1,24 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Literal, Optional
+
+# queued → running → succeeded | retrying → running ... | failed (→ queued when re-enqueued)
+JobStatus = Literal["queued", "running", "retrying", "succeeded", "failed"]
 
 class JobLog(BaseModel):
     id: Optional[int] = None
-    job_name: str
-    status: str
-    start_time: datetime
+    job_id: Optional[str] = None  # deterministic idempotency key, also the broker message id
+    job_name: str                 # actor name
+    queue: Optional[str] = None
+    status: JobStatus
+    start_time: datetime          # when the job was (first) enqueued
     end_time: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    attempts: int = 0
+    result: Optional[Any] = None
     error_message: Optional[str] = None
+    history: List[Dict[str, Any]] = Field(default_factory=list)  # [{"status", "at", "error"?}]
+    progress: Optional[Dict[str, Any]] = None  # {"stage", "step", "steps"} of multi-stage jobs
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
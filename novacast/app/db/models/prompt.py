@@ -1,11 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
 class Prompt(BaseModel):
     id: Optional[str] = None
+    name: Optional[str] = None  # prompt family; versions of one prompt share the name
     content: str
     version: int
     experiment_flag: Optional[bool] = False
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
\ No newline at end of file
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
\ No newline at end of file
@@ -1,12 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 
 class Schedule(BaseModel):
-    id: Optional[int] = None
+    id: Optional[str] = None
     name: str
     start_time: datetime
     end_time: datetime
     recurrence_rule: Optional[str] = None  # e.g., "FREQ=WEEKLY;BYDAY=MO,WE,FR"
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
\ No newline at end of file
+    next_run: Optional[datetime] = None  # defaults to start_time
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
\ No newline at end of file
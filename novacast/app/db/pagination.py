@@ -0,0 +1,115 @@
+# app/db/pagination.py
+"""
+Keyset (cursor) pagination for MongoDB list queries.
+
+skip()/offset() pages walk and discard every document before the page, so deep pages
+get linearly slower as a collection grows. Keyset pagination instead continues after the
+sort key of the last document returned:
+
+    sort [(created_at, -1), (_id, -1)], last = (t, "a1")
+    next page: created_at < t  OR  (created_at == t AND _id < "a1")
+
+With an index on the sort keys (app/db/indexes.py) every page is an index range scan of
+`limit` entries, however deep it is. `_id` ends every sort as a unique tiebreaker, so no
+document is skipped or repeated when sort values collide.
+
+The position is handed to clients as an opaque continuation token (`next_cursor`):
+the sort values of the last document, as extended JSON (datetimes survive the round
+trip), base64url-encoded. `fields` optionally limits the returned fields (projection);
+sort keys are always fetched since the next cursor is built from them.
+
+Usage:
+    docs, next_cursor = await paginate(db.assets, {}, [("created_at", -1), ("_id", -1)], limit=50)
+    docs, next_cursor = await paginate(db.assets, {}, sort, limit=50, cursor=next_cursor, fields=["name"])
+"""
+
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import json_util
+from pydantic import BaseModel
+
+MAX_PAGE_SIZE = 500
+
+SortSpec = List[Tuple[str, int]]
+
+
+class InvalidCursor(ValueError):
+    """Raised for continuation tokens that were not issued for this listing."""
+
+
+class Page(BaseModel):
+    items: List[Any]
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+def encode_cursor(values: List[Any]) -> str:
+    payload = json_util.dumps(values).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, sort: SortSpec) -> List[Any]:
+    try:
+        payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json_util.loads(payload.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}") from e
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise InvalidCursor("Invalid cursor: does not match this listing")
+    return values
+
+
+def _after(key: str, direction: int, value: Any) -> Optional[Dict[str, Any]]:
+    # Nulls (and missing fields) sort before every value: first ascending, last descending.
+    # Range operators only match values of the same type, so nulls get their own clause.
+    if value is None:
+        return {key: {"$ne": None}} if direction == 1 else None
+    if direction == 1:
+        return {key: {"$gt": value}}
+    if key == "_id":  # never null
+        return {key: {"$lt": value}}
+    return {"$or": [{key: {"$lt": value}}, {key: None}]}
+
+
+def keyset_filter(sort: SortSpec, values: List[Any]) -> Dict[str, Any]:
+    """Filter matching the documents that sort after `values` (the last page's last key)."""
+    clauses = []
+    for index, (key, direction) in enumerate(sort):
+        after = _after(key, direction, values[index])
+        if after is not None:
+            equal = {prefix: values[i] for i, (prefix, _) in enumerate(sort[:index])}
+            clauses.append({**equal, **after})
+    return {"$or": clauses} if clauses else {"_id": {"$in": []}}
+
+
+def projection(fields: Optional[List[str]], sort: SortSpec) -> Optional[Dict[str, int]]:
+    if not fields:
+        return None
+    return {field: 1 for field in [*fields, *(key for key, _ in sort)]}
+
+
+async def paginate(
+    collection: Any,
+    query: Dict[str, Any],
+    sort: SortSpec,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    One page of `collection.find(query)` in `sort` order (must end with `_id`), starting
+    after `cursor`. Returns (documents, next cursor or None on the last page).
+    """
+    if not sort or sort[-1][0] != "_id":
+        raise ValueError("Keyset sort must end with _id")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        after = keyset_filter(sort, decode_cursor(cursor, sort))
+        query = {"$and": [query, after]} if query else after
+
+    docs = await collection.find(query, projection(fields, sort)).sort(sort).limit(limit + 1).to_list(length=limit + 1)
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_cursor([docs[-1].get(key) for key, _ in sort])
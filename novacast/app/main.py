@@ -1,11 +1,23 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.connection import init_db
-from app.telemetry.metrics import init_metrics
-from app.telemetry.tracing import init_tracing
-from app.worker.queue import init_worker
+from app.db.connection import close_db, get_database, init_db
+from app.db.indexes import ensure_indexes
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One shared MongoDB client (connection pool) for the whole process; declared indexes
+    # (app/db/indexes.py) are created before serving
+    if await init_db() is not None:
+        await ensure_indexes(await get_database())
+    try:
+        yield
+    finally:
+        await close_db()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -16,22 +28,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.on_event("startup")
-async def startup_event():
-    await init_db()
-    init_metrics()
-    init_tracing()
-    init_worker()
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    # Add any shutdown logic here if necessary
-    pass
-
 # Include routers for API endpoints
 # from app.api.v1 import router as api_router
 # app.include_router(api_router, prefix="/api/v1")
+from app.api.v1 import assets, health, media, prompts, schedules
+app.include_router(health.router, prefix="/api/v1/health", tags=["health"])
+app.include_router(media.router, prefix="/api/v1/media", tags=["media"])
+app.include_router(prompts.router, prefix="/api/v1/prompts", tags=["prompts"])
+app.include_router(assets.router, prefix="/api/v1/assets", tags=["assets"])
+app.include_router(schedules.router, prefix="/api/v1/schedules", tags=["schedules"])
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
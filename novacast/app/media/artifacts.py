@@ -0,0 +1,96 @@
+# app/media/artifacts.py
+"""
+Artifact path allocation for media jobs.
+
+Every job writes into its own directory (output/jobs/<job_id>/) and every artifact gets a
+unique name, so concurrent jobs and worker processes never overwrite each other and no
+directory listing is needed to pick a name.
+
+Files are written to a ".partial" sibling and renamed into place on success (os.replace is
+atomic on one filesystem), so readers never see a half-written audio or video file.
+
+Usage:
+    artifacts = get_artifact_allocator()
+    job_id = new_job_id()
+    video_path = artifacts.allocate("final_video", ".mp4", job_id)
+    with artifacts.writing(video_path) as tmp_path:
+        render_to(tmp_path)
+    # → video_path now exists; tmp_path is removed if rendering raised
+"""
+
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.config.settings import settings
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+
+def partial_path(final_path: str) -> str:
+    """Temp sibling that keeps the extension (ffmpeg/moviepy pick the format from it)."""
+    stem, ext = os.path.splitext(final_path)
+    return f"{stem}.partial{ext}"
+
+
+def commit(tmp_path: str, final_path: str) -> str:
+    os.replace(tmp_path, final_path)
+    return final_path
+
+
+def discard(tmp_path: str) -> None:
+    try:
+        os.remove(tmp_path)
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def atomic_output(final_path: str) -> Iterator[str]:
+    """Yields a temp path to write to; renames it to `final_path` if the block succeeds."""
+    os.makedirs(os.path.dirname(final_path) or ".", exist_ok=True)
+    tmp_path = partial_path(final_path)
+    try:
+        yield tmp_path
+    except BaseException:
+        discard(tmp_path)
+        raise
+    commit(tmp_path, final_path)
+
+
+class ArtifactAllocator:
+    def __init__(self, root: str = "output"):
+        self.root = root
+
+    def job_dir(self, job_id: str) -> str:
+        path = os.path.join(self.root, "jobs", job_id)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def allocate(self, kind: str, suffix: str, job_id: Optional[str] = None) -> str:
+        """
+        Returns a fresh path for an artifact of `kind` (e.g. "audio", "final_video").
+        Without a job id the artifact gets a job directory of its own.
+        """
+        directory = self.job_dir(job_id or new_job_id())
+        return os.path.join(directory, f"{kind}_{uuid.uuid4().hex[:12]}{suffix}")
+
+    def writing(self, final_path: str):
+        return atomic_output(final_path)
+
+
+_allocator: Optional[ArtifactAllocator] = None
+_allocator_lock = threading.Lock()
+
+
+def get_artifact_allocator() -> ArtifactAllocator:
+    """Process-wide allocator rooted at settings.output_dir."""
+    global _allocator
+    with _allocator_lock:
+        if _allocator is None:
+            _allocator = ArtifactAllocator(settings.output_dir)
+        return _allocator
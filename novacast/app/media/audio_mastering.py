@@ -0,0 +1,299 @@
+# app/media/audio_mastering.py
+"""
+Audio Mastering
+
+Post-processing of the TTS narration before it is rendered into a video:
+1. trim leading/trailing silence (less audio → fewer video frames to render)
+2. mix an optional background music bed, ducked under the voice (sidechain compression)
+3. EBU R128 loudness normalization (loudnorm), so every short plays at the same level
+
+With ffmpeg all three run in ONE filtergraph pass:
+
+    [0:a]atrim,asetpts,asplit[voice][key];
+    [1:a]volume[bed]; [bed][key]sidechaincompress[ducked];
+    [voice][ducked]amix,loudnorm,aresample[out]
+
+Without ffmpeg the same chain runs as vectorized numpy over the WAV samples; loudness is
+then approximated with BS.1770 block gating on plain RMS (no K-weighting filter).
+
+The silence bounds are measured up front from the samples, so the trimmed offset is known
+and subtitle/segment timings can be shifted by it (MasteredAudio.offset).
+
+- MasteringOptions: targets and mix settings (defaults from settings.audio_*)
+- silence_bounds: (start, end) of the audible part of a signal, in seconds
+- build_mastering_command: ffmpeg argv for the single-pass chain (pure, easy to test)
+- master_audio: runs the chain (ffmpeg, or numpy fallback) into an atomically written WAV
+- master_narration: the pipeline stage around master_audio (settings switch, fallback to
+  the raw narration, caption sidecar retimed to the mastered audio)
+
+Usage:
+    mastered = master_audio("output/jobs/<job>/audio_coqui_x.wav")
+    mastered.audio_path, mastered.offset
+"""
+
+import logging
+import os
+import time
+import wave
+from typing import List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.config.settings import settings
+from app.media.artifacts import atomic_output, get_artifact_allocator
+from app.media.ffmpeg_renderer import resolve_ffmpeg, run_ffmpeg
+from app.media.subtitles import retime_sidecar
+from app.services.telemetry.metrics import AUDIO_MASTERING_TIME
+
+logger = logging.getLogger(__name__)
+
+# Analysis window for silence detection
+_WINDOW_MS = 10
+
+
+class MasteringOptions(BaseModel):
+    trim_silence: bool = True
+    silence_threshold_db: float = -50.0
+    silence_padding_ms: int = 100          # kept around the audible part
+    target_lufs: float = -16.0
+    true_peak_db: float = -1.5
+    loudness_range: float = 11.0
+    music_path: Optional[str] = None       # background music bed (looped to the voice length)
+    music_volume_db: float = -14.0
+    duck_threshold_db: float = -30.0       # voice level above which the music is ducked
+    duck_ratio: float = 8.0
+    duck_attack_ms: int = 20
+    duck_release_ms: int = 400
+
+    @classmethod
+    def from_settings(cls) -> "MasteringOptions":
+        return cls(
+            trim_silence=settings.audio_trim_silence,
+            silence_threshold_db=settings.audio_silence_threshold_db,
+            target_lufs=settings.audio_target_lufs,
+            true_peak_db=settings.audio_true_peak_db,
+            music_path=settings.background_music_path or None,
+            music_volume_db=settings.background_music_volume_db,
+            duck_ratio=settings.audio_duck_ratio,
+        )
+
+
+class MasteredAudio(BaseModel):
+    audio_path: str
+    offset: float      # seconds trimmed from the start: timings shift by -offset
+    duration: float
+    backend: str       # "ffmpeg" | "numpy"
+
+
+def _db_to_amplitude(db: float) -> float:
+    return 10 ** (db / 20)
+
+
+def read_wav(path: str) -> Tuple[np.ndarray, int]:
+    """Returns float32 samples in [-1, 1] shaped (frames, channels) and the sample rate."""
+    with wave.open(path, "rb") as f:
+        channels, width, rate = f.getnchannels(), f.getsampwidth(), f.getframerate()
+        raw = f.readframes(f.getnframes())
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported sample width: {width * 8} bits ({path})")
+    return samples.reshape(-1, channels), rate
+
+
+def write_wav(path: str, samples: np.ndarray, rate: int) -> None:
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(samples.shape[1])
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(pcm.tobytes())
+
+
+def silence_bounds(samples: np.ndarray, rate: int, threshold_db: float, padding_ms: int = 0) -> Tuple[float, float]:
+    """
+    (start, end) in seconds of the part of the signal louder than `threshold_db` (peak,
+    per 10 ms window), widened by `padding_ms` on both sides. All-silent input keeps its length.
+    """
+    duration = len(samples) / rate
+    window = max(1, rate * _WINDOW_MS // 1000)
+    count = len(samples) // window
+    if count == 0:
+        return 0.0, duration
+    peaks = np.abs(samples[: count * window]).max(axis=1).reshape(count, window).max(axis=1)
+    loud = np.flatnonzero(peaks > _db_to_amplitude(threshold_db))
+    if loud.size == 0:
+        return 0.0, duration
+    padding = padding_ms / 1000
+    start = max(0.0, loud[0] * window / rate - padding)
+    end = min(duration, (loud[-1] + 1) * window / rate + padding)
+    return start, end
+
+
+def build_mastering_command(
+    voice_path: str,
+    output_path: str,
+    options: MasteringOptions,
+    bounds: Optional[Tuple[float, float]] = None,
+    sample_rate: int = 48000,
+    ffmpeg: str = "ffmpeg",
+) -> List[str]:
+    """Single-pass trim → duck/mix → loudnorm chain; `bounds` are the (start, end) to keep."""
+    cmd = [ffmpeg, "-y", "-hide_banner", "-loglevel", "error", "-i", voice_path]
+    voice = "[0:a]"
+    chain: List[str] = []
+    if bounds is not None:
+        chain.append(f"atrim=start={bounds[0]:.3f}:end={bounds[1]:.3f},asetpts=PTS-STARTPTS")
+
+    loudnorm = (
+        f"loudnorm=I={options.target_lufs}:TP={options.true_peak_db}:LRA={options.loudness_range},"
+        f"aresample={sample_rate}"
+    )
+    if options.music_path:
+        cmd += ["-stream_loop", "-1", "-i", options.music_path]
+        chain.append("asplit=2[voice][key]")
+        filters = [
+            voice + ",".join(chain),
+            f"[1:a]volume={options.music_volume_db}dB[bed]",
+            f"[bed][key]sidechaincompress=threshold={_db_to_amplitude(options.duck_threshold_db):.5f}:"
+            f"ratio={options.duck_ratio}:attack={options.duck_attack_ms}:release={options.duck_release_ms}[ducked]",
+            f"[voice][ducked]amix=inputs=2:duration=first:normalize=0,{loudnorm}[out]",
+        ]
+    else:
+        filters = [voice + ",".join(chain + [loudnorm]) + "[out]"]
+
+    cmd += ["-filter_complex", ";".join(filters), "-map", "[out]"]
+    cmd += ["-c:a", "pcm_s16le", "-ar", str(sample_rate), output_path]
+    return cmd
+
+
+def _moving_average(signal: np.ndarray, width: int) -> np.ndarray:
+    width = min(width, len(signal))
+    if width <= 1:
+        return signal
+    cumulative = np.cumsum(np.concatenate(([0.0], signal)))
+    averaged = (cumulative[width:] - cumulative[:-width]) / width
+    return np.concatenate((np.full(width - 1, averaged[0]), averaged))
+
+
+def _integrated_loudness(samples: np.ndarray, rate: int) -> float:
+    """BS.1770-style gated loudness on plain RMS (no K-weighting filter)."""
+    block, hop = int(0.4 * rate), int(0.1 * rate)
+    if len(samples) < block:
+        power = np.mean(samples ** 2)
+        return -0.691 + 10 * np.log10(power + 1e-12)
+    starts = np.arange(0, len(samples) - block + 1, hop)
+    cumulative = np.concatenate(([0.0], np.cumsum(np.sum(samples.astype(np.float64) ** 2, axis=1))))
+    powers = (cumulative[starts + block] - cumulative[starts]) / block
+    loudness = -0.691 + 10 * np.log10(powers + 1e-12)
+    gated = powers[loudness > -70]
+    if gated.size == 0:
+        return -70.0
+    relative = -0.691 + 10 * np.log10(gated.mean()) - 10
+    gated = powers[(loudness > -70) & (loudness > relative)]
+    return -0.691 + 10 * np.log10(gated.mean())
+
+
+def _match_channels(samples: np.ndarray, channels: int) -> np.ndarray:
+    if samples.shape[1] == channels:
+        return samples
+    return np.repeat(samples.mean(axis=1, keepdims=True), channels, axis=1)
+
+
+def _duck_music(voice: np.ndarray, rate: int, options: MasteringOptions) -> Optional[np.ndarray]:
+    try:
+        music, music_rate = read_wav(options.music_path)
+    except (wave.Error, OSError, ValueError) as e:
+        logger.warning(f"⚠️ Background music skipped (numpy mastering reads WAV only): {e}")
+        return None
+    if music_rate != rate:
+        positions = np.arange(0, len(music) * rate // music_rate) * music_rate / rate
+        music = np.stack([np.interp(positions, np.arange(len(music)), ch) for ch in music.T], axis=1)
+    music = _match_channels(np.resize(music, (len(voice), music.shape[1])), voice.shape[1])
+    music *= _db_to_amplitude(options.music_volume_db)
+
+    # Sidechain: the voice envelope drives a compressor on the music bed
+    envelope = _moving_average(np.abs(voice).max(axis=1), max(1, rate * options.duck_attack_ms // 1000))
+    level_db = 20 * np.log10(envelope + 1e-9)
+    over = np.maximum(level_db - options.duck_threshold_db, 0.0)
+    gain_db = -over * (1 - 1 / options.duck_ratio)
+    gain = _moving_average(_db_to_amplitude(gain_db), max(1, rate * options.duck_release_ms // 1000))
+    return music * gain[:, None]
+
+
+def _master_numpy(samples: np.ndarray, rate: int, options: MasteringOptions) -> np.ndarray:
+    if options.music_path:
+        ducked = _duck_music(samples, rate, options)
+        if ducked is not None:
+            samples = samples + ducked
+    gain_db = options.target_lufs - _integrated_loudness(samples, rate)
+    samples = samples * _db_to_amplitude(gain_db)
+    ceiling = _db_to_amplitude(options.true_peak_db)
+    peak = float(np.abs(samples).max()) if samples.size else 0.0
+    if peak > ceiling:
+        samples = samples * (ceiling / peak)
+    return samples
+
+
+def master_audio(
+    audio_path: str,
+    output_path: Optional[str] = None,
+    options: Optional[MasteringOptions] = None,
+) -> MasteredAudio:
+    """
+    Trims, mixes and loudness-normalizes a WAV narration into `output_path` (default: a
+    fresh artifact path). Uses one ffmpeg pass when ffmpeg is available, numpy otherwise.
+    Raises RenderError if ffmpeg fails and ValueError for unreadable input.
+    """
+    options = options or MasteringOptions.from_settings()
+    output_path = output_path or get_artifact_allocator().allocate("audio_master", ".wav")
+    started = time.perf_counter()
+
+    try:
+        samples, rate = read_wav(audio_path)
+    except (wave.Error, EOFError) as e:
+        raise ValueError(f"Cannot read narration audio {audio_path}: {e}") from e
+    bounds = None
+    if options.trim_silence:
+        bounds = silence_bounds(samples, rate, options.silence_threshold_db, options.silence_padding_ms)
+    start, end = bounds or (0.0, len(samples) / rate)
+
+    ffmpeg = resolve_ffmpeg()
+    with atomic_output(output_path) as tmp_path:
+        if ffmpeg is not None:
+            backend = "ffmpeg"
+            cmd = build_mastering_command(audio_path, tmp_path, options, bounds, rate, ffmpeg)
+            run_ffmpeg(cmd, tmp_path, metric=AUDIO_MASTERING_TIME)
+        else:
+            backend = "numpy"
+            trimmed = samples[int(start * rate): int(end * rate)]
+            write_wav(tmp_path, _master_numpy(trimmed, rate, options), rate)
+            AUDIO_MASTERING_TIME.labels(backend=backend).observe(time.perf_counter() - started)
+
+    logger.info(
+        f"🎚️ Mastered {os.path.basename(audio_path)} ({backend}): "
+        f"trimmed {start:.2f}s / {len(samples) / rate - end:.2f}s of silence"
+    )
+    return MasteredAudio(audio_path=output_path, offset=start, duration=end - start, backend=backend)
+
+
+def master_narration(raw_path: str, output_path: Optional[str] = None) -> str:
+    """
+    Masters TTS narration for the video and returns the audio to render with. Mastering is
+    an enhancement: when it is disabled (settings.audio_mastering_enabled) or fails, the
+    raw narration is returned as is. The caption sidecar is shifted to the trimmed audio.
+    """
+    if not settings.audio_mastering_enabled:
+        return raw_path
+    try:
+        mastered = master_audio(raw_path, output_path=output_path)
+    except Exception as e:
+        logger.warning(f"⚠️ Audio mastering failed, using the raw narration: {e}")
+        return raw_path
+    retime_sidecar(raw_path, mastered.audio_path, -mastered.offset, mastered.duration)
+    return mastered.audio_path
@@ -1,63 +1,150 @@
 # novacast/app/media/halp_video.py --- IGNORE ---
 import os
 import numpy as np
-from typing import Tuple
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
 from PIL import Image, ImageDraw, ImageFont
 from moviepy.editor import ImageClip, ColorClip, CompositeVideoClip, AudioFileClip
 
 
-def create_text_overlay_clip(
+class TextSprite(NamedTuple):
+    """A tight-cropped RGBA overlay and where to place it on the frame (top-left corner)."""
+    image: Image.Image
+    position: Tuple[int, int]
+    frame_size: Tuple[int, int]
+
+
+@lru_cache(maxsize=32)
+def load_font(font_path: str = None, font_size: int = 48) -> ImageFont.ImageFont:
+    """Fonts are parsed once per (path, size) and shared."""
+    try:
+        return ImageFont.truetype(font_path or "arial.ttf", font_size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+def wrap_text(text: str, font: ImageFont.ImageFont, max_width: float) -> List[str]:
+    """
+    Greedy word wrap that measures every distinct word once (plus one space), instead of
+    re-measuring the growing line after each word.
+    """
+    space = font.getlength(" ")
+    widths: Dict[str, float] = {}
+    lines: List[str] = []
+    line: List[str] = []
+    line_width = 0.0
+    for word in text.split():
+        width = widths.get(word)
+        if width is None:
+            width = widths[word] = font.getlength(word)
+        candidate = line_width + (space if line else 0) + width
+        if line and candidate >= max_width:
+            lines.append(" ".join(line))
+            line, line_width = [word], width
+        else:
+            line.append(word)
+            line_width = candidate
+    if line or not lines:
+        lines.append(" ".join(line))
+    return lines
+
+
+def _draw_text_sprite(
     text: str,
     size: Tuple[int, int] = (1280, 720),
-    duration: float = 5.0,
     font_path: str = None,
     font_size: int = 48,
     text_color: Tuple[int, int, int] = (255, 255, 255),
     bg_color: Tuple[int, int, int, int] = (0, 0, 0, 160),
     margin: int = 40,
-) -> ImageClip:
-    """
-    Create a text overlay clip using Pillow (no ImageMagick needed).
-    Supports multiline wrapping and semi-transparent background.
-    """
-    img = Image.new("RGBA", size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-
-    try:
-        font = ImageFont.truetype(font_path or "arial.ttf", font_size)
-    except Exception:
-        font = ImageFont.load_default()
-
-    # Word wrapping
-    words = text.split()
-    lines = []
-    line = ""
-    for word in words:
-        test_line = f"{line} {word}".strip()
-        if draw.textlength(test_line, font=font) < size[0] - 2 * margin:
-            line = test_line
-        else:
-            lines.append(line)
-            line = word
-    lines.append(line)
+) -> TextSprite:
+    """Render wrapped text on a semi-transparent band, cropped to the band."""
+    font = load_font(font_path, font_size)
+    lines = wrap_text(text, font, size[0] - 2 * margin)
 
     line_height = font.getbbox("Ay")[3] + 10
     text_height = line_height * len(lines)
-    y = size[1] - text_height - margin
-
-    # Background rectangle
-    rect_top = y - 10
-    rect_bottom = y + text_height + 10
-    draw.rectangle([(0, rect_top), (size[0], rect_bottom)], fill=bg_color)
+    rect_top = size[1] - text_height - margin - 10
+    band_height = text_height + 20
 
+    img = Image.new("RGBA", (size[0], band_height), bg_color)
+    draw = ImageDraw.Draw(img)
+    y = 10
     for line in lines:
-        line_width = draw.textlength(line, font=font)
-        x = (size[0] - line_width) // 2
+        x = (size[0] - font.getlength(line)) // 2
         draw.text((x, y), line, font=font, fill=text_color)
         y += line_height
 
-    frame = np.array(img)
-    return ImageClip(frame, ismask=False).set_duration(duration)
+    return TextSprite(image=img, position=(0, rect_top), frame_size=size)
+
+
+# Only short strings (captions, titles) repeat across clips; a script overlay is unique
+# to its video, so caching it would only pin a large image for the process lifetime.
+SPRITE_CACHE_MAX_CHARS = 120
+
+
+@lru_cache(maxsize=64)
+def _cached_text_sprite(*args) -> TextSprite:
+    return _draw_text_sprite(*args)
+
+
+def render_text_sprite(
+    text: str,
+    size: Tuple[int, int] = (1280, 720),
+    font_path: str = None,
+    font_size: int = 48,
+    text_color: Tuple[int, int, int] = (255, 255, 255),
+    bg_color: Tuple[int, int, int, int] = (0, 0, 0, 160),
+    margin: int = 40,
+) -> TextSprite:
+    """
+    Render wrapped text on a semi-transparent band, cropped to the band.
+    Short texts (up to SPRITE_CACHE_MAX_CHARS) are cached by all arguments and the
+    returned image is shared, so treat it as read-only; longer texts are drawn per call.
+    """
+    args = (text, size, font_path, font_size, text_color, bg_color, margin)
+    if len(text) <= SPRITE_CACHE_MAX_CHARS:
+        return _cached_text_sprite(*args)
+    return _draw_text_sprite(*args)
+
+
+def render_text_overlay(
+    text: str,
+    size: Tuple[int, int] = (1280, 720),
+    font_path: str = None,
+    font_size: int = 48,
+    text_color: Tuple[int, int, int] = (255, 255, 255),
+    bg_color: Tuple[int, int, int, int] = (0, 0, 0, 160),
+    margin: int = 40,
+) -> Image.Image:
+    """
+    Full-frame transparent RGBA version of render_text_sprite, for consumers that need
+    an image the size of the video frame.
+    """
+    sprite = render_text_sprite(text, size, font_path, font_size, text_color, bg_color, margin)
+    img = Image.new("RGBA", size, (0, 0, 0, 0))
+    img.paste(sprite.image, sprite.position)
+    return img
+
+
+def create_text_overlay_clip(
+    text: str,
+    size: Tuple[int, int] = (1280, 720),
+    duration: float = 5.0,
+    font_path: str = None,
+    font_size: int = 48,
+    text_color: Tuple[int, int, int] = (255, 255, 255),
+    bg_color: Tuple[int, int, int, int] = (0, 0, 0, 160),
+    margin: int = 40,
+) -> ImageClip:
+    """
+    Create a text overlay clip using Pillow (no ImageMagick needed).
+    Supports multiline wrapping and semi-transparent background.
+    The clip only covers the text band and is already positioned on the frame.
+    """
+    sprite = render_text_sprite(text, size, font_path, font_size, text_color, bg_color, margin)
+    frame = np.array(sprite.image)
+    return ImageClip(frame, ismask=False).set_duration(duration).set_position(sprite.position)
 
 
 def create_background_clip(
@@ -86,6 +173,9 @@ def compose_video_with_audio(
     fps: int = 24,
     codec: str = "libx264",
     audio_codec: str = "aac",
+    preset: str = "medium",
+    crf: int = None,
+    audio_bitrate: str = None,
 ) -> str | None:
     """
     Composes visual clips with audio into a final video file.
@@ -109,6 +199,9 @@ def compose_video_with_audio(
             codec=codec,
             audio=True,
             audio_codec=audio_codec,
+            audio_bitrate=audio_bitrate,
+            preset=preset,
+            ffmpeg_params=["-crf", str(crf)] if crf is not None else None,
             threads=2,
             logger=None,
         )
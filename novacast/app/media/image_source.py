@@ -0,0 +1,389 @@
+# app/media/image_source.py
+"""
+Image Sourcing Service
+
+Finds background images for scenes and keeps them in a local content store, so repeated
+queries (and the same photo returned for different queries) never hit the network twice.
+
+- ImageProvider: search a query → PhotoRef, download a PhotoRef → bytes
+  - PexelsImageProvider: Pexels API over a pooled keep-alive session with timeouts
+  - LocalImageProvider: offline stand-in (images from a folder, or generated with Pillow)
+- ImageStore: on-disk store keyed by (provider, photo id) with a SQLite metadata index
+  mapping normalized queries → photos, TTL expiry and size-capped LRU eviction; queries
+  without a result are remembered for a shorter `miss_ttl`, and only when the provider
+  actually answered (never when it is unconfigured or the request failed)
+- ImageSource: provider + store; get(query) and prefetch(queries) for upcoming scenes
+
+Usage:
+    source = get_image_source()                    # configured from settings.image_*
+    source.prefetch(["ocean sunset", "city at night"])
+    path = source.get("ocean sunset")              # → local file path, or None
+"""
+
+import hashlib
+import io
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import requests
+from PIL import Image
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PEXELS_API_URL = "https://api.pexels.com/v1/search"
+
+
+class PhotoRef(BaseModel):
+    provider: str
+    photo_id: str
+    url: str
+
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").lower().split())
+
+
+class ImageProvider:
+    name = "base"
+
+    @property
+    def configured(self) -> bool:
+        """False when searches can't succeed (e.g. no API key), so misses aren't cached."""
+        return True
+
+    def search(self, query: str) -> Optional[PhotoRef]:
+        raise NotImplementedError
+
+    def download(self, photo: PhotoRef) -> bytes:
+        raise NotImplementedError
+
+
+class PexelsImageProvider(ImageProvider):
+    name = "pexels"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[float] = None,
+        pool_size: int = 8,
+    ):
+        self.api_key = api_key or settings.pexels_api_key or os.getenv("PEXELS_API_KEY")
+        self.timeout = timeout or settings.image_http_timeout
+        if session is None:
+            # One keep-alive pool for both the API and the image CDN
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def search(self, query: str) -> Optional[PhotoRef]:
+        if not self.api_key:
+            logger.warning("⚠️ PEXELS_API_KEY is not set, skipping image search")
+            return None
+        response = self.session.get(
+            PEXELS_API_URL,
+            headers={"Authorization": self.api_key},
+            params={"query": query, "per_page": 1},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        photos = response.json().get("photos") or []
+        if not photos:
+            return None
+        photo = photos[0]
+        return PhotoRef(provider=self.name, photo_id=str(photo["id"]), url=photo["src"]["large"])
+
+    def download(self, photo: PhotoRef) -> bytes:
+        response = self.session.get(photo.url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+
+class LocalImageProvider(ImageProvider):
+    """
+    Offline provider for development and tests. Picks a file from `directory` by a stable
+    hash of the query, or (without a directory) generates a solid-color JPEG per query.
+    """
+
+    name = "local"
+
+    def __init__(self, directory: Optional[str] = None, size=(1280, 720)):
+        self.directory = directory
+        self.size = size
+
+    def _files(self) -> List[str]:
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            os.path.join(self.directory, f) for f in os.listdir(self.directory)
+            if f.lower().endswith((".jpg", ".jpeg", ".png"))
+        )
+
+    def search(self, query: str) -> Optional[PhotoRef]:
+        digest = hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+        files = self._files()
+        if files:
+            path = files[int(digest, 16) % len(files)]
+            return PhotoRef(provider=self.name, photo_id=os.path.basename(path), url=path)
+        return PhotoRef(provider=self.name, photo_id=f"generated-{digest[:12]}", url=f"color:#{digest[:6]}")
+
+    def download(self, photo: PhotoRef) -> bytes:
+        if not photo.url.startswith("color:"):
+            with open(photo.url, "rb") as f:
+                return f.read()
+        color = tuple(int(photo.url[7 + i:9 + i], 16) for i in (0, 2, 4))
+        buffer = io.BytesIO()
+        Image.new("RGB", self.size, color).save(buffer, format="JPEG")
+        return buffer.getvalue()
+
+
+class ImageStore:
+    """Content store for downloaded images plus a query → photo index."""
+
+    def __init__(self, root: str = "storage/cache/images", max_bytes: int = 512 * 1024 ** 2,
+                 ttl: Optional[float] = None, miss_ttl: Optional[float] = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl if miss_ttl is not None else ttl
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS photos ("
+                " photo_key TEXT PRIMARY KEY,"
+                " path TEXT NOT NULL,"
+                " source_url TEXT,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS queries ("
+                " query_key TEXT PRIMARY KEY,"
+                " photo_key TEXT,"  # NULL = provider had no result (negative cache)
+                " created_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS photos_accessed_at ON photos(accessed_at)")
+
+    @staticmethod
+    def photo_key(provider: str, photo_id: str) -> str:
+        return f"{provider}:{photo_id}"
+
+    @staticmethod
+    def query_key(provider: str, query: str) -> str:
+        return f"{provider}:{normalize_query(query)}"
+
+    def _expired(self, created_at: float, now: float, ttl: Optional[float] = None) -> bool:
+        ttl = self.ttl if ttl is None else ttl
+        return ttl is not None and now - created_at > ttl
+
+    def lookup(self, provider: str, query: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Returns {"photo_key", "path"} for a fresh query entry (path None if the photo file
+        is gone or the query had no result), or None when the query is unknown/expired.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT q.photo_key, q.created_at, p.path FROM queries q"
+                " LEFT JOIN photos p ON p.photo_key = q.photo_key WHERE q.query_key = ?",
+                (self.query_key(provider, query),),
+            ).fetchone()
+            if row is None:
+                return None
+            photo_key, created_at, path = row
+            if self._expired(created_at, now, self.miss_ttl if photo_key is None else None):
+                return None
+            if path and os.path.exists(path):
+                self._conn.execute("UPDATE photos SET accessed_at = ? WHERE photo_key = ?", (now, photo_key))
+            else:
+                path = None
+            return {"photo_key": photo_key, "path": path}
+
+    def get_photo(self, photo_key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT path, created_at FROM photos WHERE photo_key = ?", (photo_key,)
+            ).fetchone()
+            if row is None or self._expired(row[1], now) or not os.path.exists(row[0]):
+                return None
+            self._conn.execute("UPDATE photos SET accessed_at = ? WHERE photo_key = ?", (now, photo_key))
+            return row[0]
+
+    def remember_query(self, provider: str, query: str, photo_key: Optional[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries (query_key, photo_key, created_at) VALUES (?, ?, ?)",
+                (self.query_key(provider, query), photo_key, time.time()),
+            )
+
+    def put_photo(self, photo: PhotoRef, data: bytes) -> str:
+        key = self.photo_key(photo.provider, photo.photo_id)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        path = os.path.join(self.root, digest[:2], f"{digest}.jpg")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Atomic write: concurrent prefetches of the same photo never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO photos (photo_key, path, source_url, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, path, photo.url, len(data), now, now),
+            )
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: str) -> None:
+        # Caller holds the lock
+        now = time.time()
+        if self.ttl is not None:
+            for photo_key, path in self._conn.execute(
+                "SELECT photo_key, path FROM photos WHERE created_at < ?", (now - self.ttl,)
+            ).fetchall():
+                self._remove(photo_key, path)
+            self._conn.execute("DELETE FROM queries WHERE created_at < ?", (now - self.ttl,))
+        if self.miss_ttl is not None:
+            self._conn.execute(
+                "DELETE FROM queries WHERE photo_key IS NULL AND created_at < ?", (now - self.miss_ttl,)
+            )
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM photos").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for photo_key, path, size in self._conn.execute(
+            "SELECT photo_key, path, size FROM photos ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            if photo_key == keep:
+                continue
+            self._remove(photo_key, path)
+            total -= size
+
+    def _remove(self, photo_key: str, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        self._conn.execute("DELETE FROM photos WHERE photo_key = ?", (photo_key,))
+        logger.info(f"♻️ Evicted cached image {photo_key}")
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM photos").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ImageSource:
+    def __init__(self, provider: ImageProvider, store: ImageStore, prefetch_workers: int = 4):
+        self.provider = provider
+        self.store = store
+        self.prefetch_workers = prefetch_workers
+        self._inflight: Dict[str, threading.Lock] = {}
+        self._inflight_lock = threading.Lock()
+
+    def get(self, query: str) -> Optional[str]:
+        """Local path of an image for `query`, fetching it once if needed. None if nothing found."""
+        query = normalize_query(query)
+        if not query:
+            return None
+
+        cached = self.store.lookup(self.provider.name, query)
+        if cached is not None and (cached["path"] or cached["photo_key"] is None):
+            return cached["path"]
+
+        # Concurrent requests for the same query wait for one fetch
+        with self._inflight_lock:
+            lock = self._inflight.setdefault(query, threading.Lock())
+        with lock:
+            cached = self.store.lookup(self.provider.name, query)
+            if cached is not None and (cached["path"] or cached["photo_key"] is None):
+                return cached["path"]
+            try:
+                return self._fetch(query)
+            except requests.RequestException as e:
+                logger.warning(f"⚠️ Image search failed for '{query}': {e}")
+                return None
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(query, None)
+
+    def _fetch(self, query: str) -> Optional[str]:
+        if not self.provider.configured:
+            # A configuration problem, not an answer: don't remember it as "no image"
+            logger.warning(f"⚠️ Image provider {self.provider.name} is not configured, skipping '{query}'")
+            return None
+        logger.info(f"🔍 Searching {self.provider.name} for: {query}")
+        photo = self.provider.search(query)
+        if photo is None:
+            self.store.remember_query(self.provider.name, query, None)
+            return None
+
+        photo_key = self.store.photo_key(photo.provider, photo.photo_id)
+        path = self.store.get_photo(photo_key)
+        if path is None:
+            path = self.store.put_photo(photo, self.provider.download(photo))
+        self.store.remember_query(self.provider.name, query, photo_key)
+        return path
+
+    def prefetch(self, queries: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Fetches images for upcoming scenes in parallel; returns {query: path or None}."""
+        unique = list(dict.fromkeys(q for q in queries if normalize_query(q)))
+        if not unique:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.prefetch_workers, len(unique))) as pool:
+            return dict(zip(unique, pool.map(self.get, unique)))
+
+
+_source: Optional[ImageSource] = None
+_source_lock = threading.Lock()
+
+
+def get_image_source() -> ImageSource:
+    """Process-wide image source built from settings.image_*."""
+    global _source
+    with _source_lock:
+        if _source is None:
+            provider_name = (settings.image_provider or "pexels").lower()
+            if provider_name == "pexels":
+                provider: ImageProvider = PexelsImageProvider()
+            elif provider_name == "local":
+                provider = LocalImageProvider()
+            else:
+                raise ValueError(f"Unknown image provider: {provider_name}")
+            store = ImageStore(
+                settings.image_cache_dir,
+                max_bytes=settings.image_cache_max_bytes,
+                ttl=settings.image_cache_ttl_seconds or None,
+                miss_ttl=settings.image_cache_miss_ttl_seconds or None,
+            )
+            _source = ImageSource(provider, store, prefetch_workers=settings.image_prefetch_workers)
+        return _source
@@ -0,0 +1,267 @@
+# app/media/render_index.py
+"""
+Render deduplication.
+
+Every render is described by a canonical spec: digests of the input files (narration,
+background images, captions), the overlay text, the render profile and the settings that
+change the output. Its hash identifies the rendered video, so a render whose spec hash
+already has an artifact is answered with that file instead of being encoded again
+(e.g. the same script re-submitted under a new job, or a retried job whose TTS output
+is byte-identical).
+
+File digests hash the content, not the path: every job writes its audio to its own
+directory, yet identical narration gives the same spec. Digests are memoized per
+(path, size, mtime), so a file is read once per process.
+
+Concurrent renders of the same spec in one process are coalesced: the first caller
+renders, the others wait for it and get its artifact. Across worker processes identical
+jobs already share a job id (app/services/worker/jobs.py) and are never run twice.
+
+Indexes:
+- LocalRenderIndex: one JSON file per spec hash in a local directory
+- MongoRenderIndex: Asset documents (app/db/models/asset.py) in a (sync, pymongo)
+  collection such as `assets`, with the spec hash in `metadata.spec_hash`
+
+Entries whose file no longer exists are ignored (and replaced by the next render).
+
+Usage:
+    spec = still_render_spec(audio_path, text, image_path, profile)
+    path = get_render_deduplicator().render(spec, lambda: render_to(output_path))
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config.settings import settings
+from app.media.render_profiles import RenderProfile
+from app.media.timeline import Timeline
+
+logger = logging.getLogger(__name__)
+
+# Bump when a change to the renderers changes their output for the same inputs
+RENDER_SPEC_VERSION = 1
+
+_digests: Dict[Tuple[str, int, int], str] = {}
+_digests_lock = threading.Lock()
+
+
+def file_digest(path: Optional[str]) -> Optional[str]:
+    """SHA-256 of the file's content (None for no file), memoized per (path, size, mtime)."""
+    if not path:
+        return None
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _digests_lock:
+        if key in _digests:
+            return _digests[key]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    with _digests_lock:
+        _digests[key] = digest.hexdigest()
+    return _digests[key]
+
+
+def render_spec_hash(spec: Dict[str, Any]) -> str:
+    """Stable SHA-256 over a (JSON-serializable) render spec."""
+    payload = json.dumps(spec, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _caption_settings(subtitles_path: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not subtitles_path:
+        return None
+    return {
+        "digest": file_digest(subtitles_path),
+        "mode": settings.subtitles_mode,
+        "style": settings.subtitle_style,
+        "language": settings.subtitle_language,
+    }
+
+
+def still_render_spec(
+    audio_path: str,
+    context_text: str,
+    image_path: Optional[str],
+    profile: RenderProfile,
+    subtitles_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Spec of a narration-over-still video (build_media_clip_with_context)."""
+    return {
+        "kind": "still",
+        "version": RENDER_SPEC_VERSION,
+        "audio": file_digest(audio_path),
+        "text": context_text,
+        "background": file_digest(image_path),
+        "profile": profile.model_dump(),
+        "subtitles": _caption_settings(subtitles_path),
+    }
+
+
+def timeline_render_spec(timeline: Timeline, profile: Optional[RenderProfile] = None) -> Dict[str, Any]:
+    """Spec of a timeline render; paths in the timeline are replaced by content digests."""
+    scenes = [
+        {**scene.model_dump(exclude={"background"}), "background": file_digest(scene.background)}
+        for scene in timeline.scenes
+    ]
+    return {
+        "kind": "timeline",
+        "version": RENDER_SPEC_VERSION,
+        "audio": file_digest(timeline.audio_path),
+        "scenes": scenes,
+        "size": timeline.size,
+        "fps": timeline.fps,
+        "profile": profile.model_dump() if profile else None,
+    }
+
+
+class RenderIndex:
+    def lookup(self, spec_hash: str) -> Optional[str]:
+        """Path of the artifact rendered for `spec_hash`, if any."""
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def record(self, spec_hash: str, path: str, spec: Dict[str, Any]) -> None:
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+
+class LocalRenderIndex(RenderIndex):
+    def __init__(self, root: str = "storage/renders"):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, spec_hash: str) -> str:
+        return os.path.join(self.root, f"{spec_hash}.json")
+
+    def lookup(self, spec_hash: str) -> Optional[str]:
+        try:
+            with open(self._path(spec_hash), encoding="utf-8") as f:
+                return json.load(f).get("path")
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable render index entry {spec_hash}: {e}")
+            return None
+
+    def record(self, spec_hash: str, path: str, spec: Dict[str, Any]) -> None:
+        # Write to a temp file and rename so readers never see a partial entry
+        tmp_path = os.path.join(self.root, f".{spec_hash}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"path": path, "spec": spec, "saved_at": datetime.now(timezone.utc).isoformat()}, f, default=str)
+        os.replace(tmp_path, self._path(spec_hash))
+
+
+class MongoRenderIndex(RenderIndex):
+    """
+    Stores rendered videos as Asset documents in a pymongo collection (e.g. `db.assets`),
+    tagged with `kind: "render"`; `url` is the artifact path.
+    """
+
+    def __init__(self, collection: Any):
+        self.collection = collection
+
+    def lookup(self, spec_hash: str) -> Optional[str]:
+        doc = self.collection.find_one({"_id": f"render:{spec_hash}"}, {"url": 1})
+        return doc.get("url") if doc else None
+
+    def record(self, spec_hash: str, path: str, spec: Dict[str, Any]) -> None:
+        now = datetime.now(timezone.utc)
+        self.collection.update_one(
+            {"_id": f"render:{spec_hash}"},
+            {
+                "$set": {
+                    "kind": "render",
+                    "name": os.path.basename(path),
+                    "url": path,
+                    "metadata": {"spec_hash": spec_hash, "spec": spec},
+                    "updated_at": now,
+                },
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True,
+        )
+
+
+class RenderDeduplicator:
+    def __init__(self, index: RenderIndex):
+        self.index = index
+        self._inflight: Dict[str, threading.Lock] = {}
+        self._inflight_lock = threading.Lock()
+
+    def existing(self, spec_hash: str) -> Optional[str]:
+        """Artifact already rendered for `spec_hash` (only if its file still exists)."""
+        try:
+            path = self.index.lookup(spec_hash)
+        except Exception as e:
+            logger.warning(f"⚠️ Render index lookup failed, rendering: {e}")
+            return None
+        return path if path and os.path.exists(path) else None
+
+    def record(self, spec_hash: str, path: str, spec: Dict[str, Any]) -> None:
+        try:
+            self.index.record(spec_hash, path, spec)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to record render {spec_hash[:12]}: {e}")
+
+    def render(self, spec: Dict[str, Any], render: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Returns the artifact for `spec`: an existing one, the one a concurrent caller is
+        rendering, or the path returned by `render()` (recorded in the index on success).
+        """
+        spec_hash = render_spec_hash(spec)
+        path = self.existing(spec_hash)
+        if path:
+            logger.info(f"♻️ Reusing render {spec_hash[:12]}: {path}")
+            return path
+
+        # Concurrent requests for the same spec wait for one render
+        with self._inflight_lock:
+            lock = self._inflight.setdefault(spec_hash, threading.Lock())
+        with lock:
+            try:
+                path = self.existing(spec_hash)
+                if path:
+                    logger.info(f"♻️ Reusing render {spec_hash[:12]}: {path}")
+                    return path
+                path = render()
+                if path:
+                    self.record(spec_hash, path, spec)
+                return path
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(spec_hash, None)
+
+
+_deduplicator: Optional[RenderDeduplicator] = None
+_deduplicator_lock = threading.Lock()
+
+
+def get_render_deduplicator() -> Optional[RenderDeduplicator]:
+    """
+    Process-wide deduplicator over the `assets` collection of settings.db_url, or a local
+    index (settings.render_index_dir) when no database is configured.
+    None when settings.render_dedup_enabled is off.
+    """
+    global _deduplicator
+    if not settings.render_dedup_enabled:
+        return None
+    with _deduplicator_lock:
+        if _deduplicator is None:
+            if settings.db_url:
+                from app.db.connection import get_sync_database
+                _deduplicator = RenderDeduplicator(MongoRenderIndex(get_sync_database()["assets"]))
+            else:
+                _deduplicator = RenderDeduplicator(LocalRenderIndex(settings.render_index_dir))
+        return _deduplicator
+
+
+def set_render_deduplicator(deduplicator: Optional[RenderDeduplicator]) -> None:
+    global _deduplicator
+    with _deduplicator_lock:
+        _deduplicator = deduplicator
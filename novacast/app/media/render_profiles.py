@@ -0,0 +1,88 @@
+# app/media/render_profiles.py
+"""
+Render Profiles
+
+Named output formats for the video renderers: resolution, frame rate, quality (CRF +
+encoder preset), aspect ratio and audio bitrate. Profiles only use software encoders
+(libx264 + AAC), so a given profile renders identically on every host.
+
+Built-in profiles:
+- youtube: 1920x1080 @ 30 fps (16:9)
+- tiktok:  1080x1920 @ 30 fps (9:16, landscape content is letterboxed)
+- 1080p:   1920x1080 @ 30 fps
+- 720p:    1280x720 @ 24 fps (the previous hard-coded output)
+
+A timeline can be rendered into several profiles from ONE decode/composition pass, see
+app/media/timeline.py: build_multi_profile_command.
+
+Usage:
+    profile = get_profile("tiktok")
+    profile.size   # (1080, 1920)
+
+    cmd = build_multi_profile_command(
+        timeline, outputs=[(get_profile("youtube"), "out_16x9.mp4"), (profile, "out_9x16.mp4")],
+    )
+"""
+
+from typing import Dict, List, Literal, Tuple
+
+from pydantic import BaseModel, Field
+
+
+class RenderProfile(BaseModel):
+    name: str
+    width: int = Field(gt=0)
+    height: int = Field(gt=0)
+    fps: int = Field(default=30, gt=0)
+    crf: int = Field(default=23, ge=0, le=51)  # lower = better quality, bigger file
+    preset: str = "veryfast"
+    video_codec: str = "libx264"
+    audio_bitrate: str = "128k"
+    # How a frame with another aspect ratio is fitted: crop to fill, or pad (letterbox)
+    fit: Literal["crop", "pad"] = "crop"
+    pad_color: Tuple[int, int, int] = (0, 0, 0)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    @property
+    def aspect_ratio(self) -> str:
+        a, b = self.width, self.height
+        while b:
+            a, b = b, a % b
+        return f"{self.width // a}:{self.height // a}"
+
+    def encoder_args(self) -> List[str]:
+        # No -tune stillimage: timelines have crossfades and motion; single-still renders
+        # add it themselves (build_still_command)
+        args = ["-c:v", self.video_codec, "-preset", self.preset, "-crf", str(self.crf)]
+        return args + ["-c:a", "aac", "-b:a", self.audio_bitrate, "-movflags", "+faststart"]
+
+    def fit_filter(self) -> str:
+        """Filter chain mapping any frame onto this profile's size and frame rate."""
+        w, h = self.width, self.height
+        if self.fit == "pad":
+            color = "0x{:02x}{:02x}{:02x}".format(*self.pad_color)
+            scale = (
+                f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+                f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2:color={color}"
+            )
+        else:
+            scale = f"scale={w}:{h}:force_original_aspect_ratio=increase,crop={w}:{h}"
+        return f"{scale},setsar=1,fps={self.fps},format=yuv420p"
+
+
+PROFILES: Dict[str, RenderProfile] = {
+    "youtube": RenderProfile(name="youtube", width=1920, height=1080, fps=30, crf=20, audio_bitrate="192k"),
+    "tiktok": RenderProfile(name="tiktok", width=1080, height=1920, fps=30, crf=23, fit="pad"),
+    "1080p": RenderProfile(name="1080p", width=1920, height=1080, fps=30, crf=21),
+    "720p": RenderProfile(name="720p", width=1280, height=720, fps=24, crf=23),
+}
+
+
+def get_profile(name: str) -> RenderProfile:
+    try:
+        return PROFILES[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown render profile: {name} (available: {', '.join(PROFILES)})")
@@ -0,0 +1,245 @@
+# app/media/subtitles.py
+"""
+Subtitles / captions.
+
+Cues are timed from the per-sentence offsets that segmented TTS already reports
+(SegmentTiming), so no forced-alignment model is needed: every sentence is on screen while
+it is spoken. Sentences too long for one caption are split at word boundaries and their
+time is shared out in proportion to the characters in each part.
+
+- Cue: one caption (start, end, text; lines separated by "\\n")
+- build_cues: SegmentTiming list → cues (line wrapping, long-sentence splitting, minimum duration)
+- to_srt / to_vtt / write_subtitles: SubRip and WebVTT output
+- read_subtitles: parses SRT/WebVTT written by this module back into cues
+- sidecar_path / write_sidecar: the caption file stored next to the narration audio
+- retime_sidecar: copies captions to processed audio, shifted (e.g. after silence trimming)
+- burn_in_filter: ffmpeg `subtitles=` filter (captions drawn into the video)
+- build_mux_command: adds a soft subtitle track (mov_text) to an existing video without
+  re-encoding it
+
+Soft subtitles are a separate text track: nothing is rasterized per frame and players can
+toggle them. Burn-in draws them into the frames (settings.subtitles_mode = "burn").
+
+Usage:
+    synthesis = TTSEngine().synthesize_segmented("coqui", script)
+    srt_path = write_sidecar(synthesis.segments, synthesis.audio_path)
+"""
+
+import os
+import re
+from typing import List, Optional, Sequence
+
+from pydantic import BaseModel
+
+from app.config.settings import settings
+from app.media.artifacts import atomic_output
+from app.media.tts_segments import SegmentTiming
+
+SUBTITLE_FORMATS = ("srt", "vtt")
+
+_TIMING = re.compile(r"(\d+):(\d{2}):(\d{2})[,.](\d{3})\s*-->\s*(\d+):(\d{2}):(\d{2})[,.](\d{3})")
+
+
+class Cue(BaseModel):
+    start: float
+    end: float
+    text: str
+
+
+def _wrap(words: List[str], max_chars: int) -> List[str]:
+    lines: List[str] = []
+    line = ""
+    for word in words:
+        if line and len(line) + 1 + len(word) > max_chars:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _split_caption(text: str, max_chars: int, max_lines: int) -> List[str]:
+    """Splits text into captions of at most `max_lines` wrapped lines each."""
+    lines = _wrap(text.split(), max_chars)
+    return ["\n".join(lines[i:i + max_lines]) for i in range(0, len(lines), max_lines)]
+
+
+def build_cues(
+    segments: Sequence[SegmentTiming],
+    max_chars: Optional[int] = None,
+    max_lines: Optional[int] = None,
+    min_duration: Optional[float] = None,
+) -> List[Cue]:
+    """
+    One cue per sentence, or several when the sentence does not fit `max_lines` lines of
+    `max_chars` characters. Short cues are held for `min_duration` seconds when the gap to
+    the next cue allows it.
+    """
+    max_chars = max_chars or settings.subtitle_max_chars
+    max_lines = max_lines or settings.subtitle_max_lines
+    min_duration = settings.subtitle_min_duration if min_duration is None else min_duration
+
+    cues: List[Cue] = []
+    for segment in segments:
+        parts = _split_caption(segment.text, max_chars, max_lines)
+        if not parts:
+            continue
+        weights = [len(part) for part in parts]
+        total = float(sum(weights))
+        start = segment.start
+        for part, weight in zip(parts, weights):
+            end = start + (segment.end - segment.start) * weight / total
+            cues.append(Cue(start=start, end=end, text=part))
+            start = end
+        cues[-1].end = segment.end  # no rounding drift at sentence ends
+
+    for cue, following in zip(cues, cues[1:] + [None]):
+        if cue.end - cue.start < min_duration:
+            limit = following.start if following is not None else cue.start + min_duration
+            cue.end = max(cue.end, min(cue.start + min_duration, limit))
+    return cues
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    millis = int(round(max(seconds, 0.0) * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def to_srt(cues: Sequence[Cue]) -> str:
+    blocks = [
+        f"{n}\n{_timestamp(cue.start, ',')} --> {_timestamp(cue.end, ',')}\n{cue.text}\n"
+        for n, cue in enumerate(cues, start=1)
+    ]
+    return "\n".join(blocks)
+
+
+def to_vtt(cues: Sequence[Cue]) -> str:
+    blocks = [
+        f"{_timestamp(cue.start, '.')} --> {_timestamp(cue.end, '.')}\n{cue.text}\n"
+        for cue in cues
+    ]
+    return "WEBVTT\n\n" + "\n".join(blocks)
+
+
+def write_subtitles(cues: Sequence[Cue], path: str) -> str:
+    """Writes SRT or WebVTT, chosen by the file extension."""
+    fmt = os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in SUBTITLE_FORMATS:
+        raise ValueError(f"Unsupported subtitle format: {path} (use .srt or .vtt)")
+    content = to_srt(cues) if fmt == "srt" else to_vtt(cues)
+    with atomic_output(path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+    return path
+
+
+def _seconds(h: str, m: str, s: str, ms: str) -> float:
+    return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+
+
+def read_subtitles(path: str) -> List[Cue]:
+    with open(path, "r", encoding="utf-8") as f:
+        blocks = re.split(r"\n\s*\n", f.read().strip())
+    cues: List[Cue] = []
+    for block in blocks:
+        lines = block.splitlines()
+        for position, line in enumerate(lines):
+            match = _TIMING.search(line)
+            if match:
+                groups = match.groups()
+                cues.append(Cue(
+                    start=_seconds(*groups[:4]),
+                    end=_seconds(*groups[4:]),
+                    text="\n".join(lines[position + 1:]),
+                ))
+                break
+    return cues
+
+
+def shift_cues(cues: Sequence[Cue], shift: float, duration: Optional[float] = None) -> List[Cue]:
+    """Moves cues by `shift` seconds, dropping/clipping what falls outside [0, duration]."""
+    shifted: List[Cue] = []
+    for cue in cues:
+        start, end = max(cue.start + shift, 0.0), cue.end + shift
+        if duration is not None:
+            end = min(end, duration)
+        if end > start:
+            shifted.append(Cue(start=start, end=end, text=cue.text))
+    return shifted
+
+
+def sidecar_path(audio_path: str, fmt: Optional[str] = None) -> str:
+    """Captions for narration.wav live in narration.srt (or .vtt)."""
+    return f"{os.path.splitext(audio_path)[0]}.{fmt or settings.subtitle_format}"
+
+
+def write_sidecar(segments: Sequence[SegmentTiming], audio_path: str) -> Optional[str]:
+    """Writes the captions for `audio_path` next to it; None when subtitles are off."""
+    if settings.subtitles_mode == "off" or not segments:
+        return None
+    return write_subtitles(build_cues(segments), sidecar_path(audio_path))
+
+
+def retime_sidecar(
+    source_audio: str,
+    target_audio: str,
+    shift: float,
+    duration: Optional[float] = None,
+) -> Optional[str]:
+    """Writes the captions of `source_audio` for `target_audio`, moved by `shift` seconds."""
+    source = find_sidecar(source_audio)
+    if source is None:
+        return None
+    cues = shift_cues(read_subtitles(source), shift, duration)
+    return write_subtitles(cues, sidecar_path(target_audio, os.path.splitext(source)[1].lstrip(".")))
+
+
+def find_sidecar(audio_path: str) -> Optional[str]:
+    if settings.subtitles_mode == "off":
+        return None
+    for fmt in (settings.subtitle_format, *SUBTITLE_FORMATS):
+        path = sidecar_path(audio_path, fmt)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _escape_filter_value(value: str) -> str:
+    # Two levels: the option value inside the filter, then the filtergraph itself
+    for char in ("\\", "'", ":"):
+        value = value.replace(char, "\\" + char)
+    for char in ("\\", "'", "[", "]", ",", ";"):
+        value = value.replace(char, "\\" + char)
+    return value
+
+
+def burn_in_filter(subtitles_path: str, force_style: Optional[str] = None) -> str:
+    """`subtitles=` filter drawing the captions into the video (needs an ffmpeg with libass)."""
+    path = os.path.abspath(subtitles_path).replace(os.sep, "/")
+    expr = f"subtitles=filename={_escape_filter_value(path)}"
+    style = force_style if force_style is not None else settings.subtitle_style
+    if style:
+        expr += f":force_style={_escape_filter_value(style)}"
+    return expr
+
+
+def build_mux_command(
+    video_path: str,
+    subtitles_path: str,
+    output_path: str,
+    ffmpeg: str = "ffmpeg",
+    language: Optional[str] = None,
+) -> List[str]:
+    """Copies the audio/video streams and adds the captions as a mov_text subtitle track."""
+    language = language or settings.subtitle_language
+    cmd = [ffmpeg, "-y", "-hide_banner", "-loglevel", "error", "-i", video_path, "-i", subtitles_path]
+    cmd += ["-map", "0:v", "-map", "0:a?", "-map", "1:s", "-c", "copy", "-c:s", "mov_text"]
+    if language:
+        cmd += ["-metadata:s:s:0", f"language={language}"]
+    cmd += ["-movflags", "+faststart", output_path]
+    return cmd
@@ -0,0 +1,221 @@
+# app/media/timeline.py
+"""
+Declarative video timeline.
+
+A Timeline is an ordered list of Scenes covering the narration: each scene has a start/end
+(seconds), a background (image or solid color), optional overlay text and the transition
+used to enter it. The whole timeline compiles into ONE ffmpeg command / filtergraph, so a
+multi-scene short is encoded in a single pass instead of per scene + concat.
+
+Timelines are plain pydantic models: they serialize to JSON, and spec_hash() gives a
+stable identity for caching and diffing render specs.
+
+Compilation (per scene i):
+    looped still / color source (1 fps) → scale+crop → overlay text → fps → trim to length
+    scenes are joined with concat (cut) or xfade (fade, wipe, slide, ...), and the narration
+    is mapped as the audio track.
+    For several render profiles the composed stream is split once and each branch is fitted
+    and encoded separately (build_multi_profile_command), still from a single decode.
+
+Usage:
+    timeline = Timeline(audio_path="narration.wav", scenes=[
+        Scene(start=0, end=4, background="intro.jpg", overlay_text="Welcome!"),
+        Scene(start=4, end=9, overlay_text="Part one", transition=Transition(type="fade")),
+    ])
+    VideoBuilder().render_timeline(timeline)
+"""
+
+import hashlib
+import os
+from typing import Dict, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.media.ffmpeg_renderer import color_hex
+from app.media.render_profiles import RenderProfile
+
+# Scene boundaries closer than this are treated as touching
+_EPSILON = 1e-3
+
+TransitionType = Literal["cut", "fade", "dissolve", "wipeleft", "wiperight", "slideleft", "slideright"]
+
+
+class Transition(BaseModel):
+    type: TransitionType = "cut"
+    duration: float = Field(default=0.5, gt=0)
+
+
+class Scene(BaseModel):
+    start: float = Field(ge=0)
+    end: float
+    background: Optional[str] = None  # image path; None → background_color
+    background_color: Tuple[int, int, int] = (20, 30, 70)
+    overlay_text: Optional[str] = None
+    transition: Transition = Field(default_factory=Transition)  # how this scene is entered
+
+    @model_validator(mode="after")
+    def _check_bounds(self):
+        if self.end <= self.start:
+            raise ValueError(f"Scene end ({self.end}) must be after its start ({self.start})")
+        return self
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class Timeline(BaseModel):
+    scenes: List[Scene]
+    audio_path: Optional[str] = None
+    size: Tuple[int, int] = (1280, 720)
+    fps: int = 24
+
+    @model_validator(mode="after")
+    def _check_scenes(self):
+        if not self.scenes:
+            raise ValueError("Timeline needs at least one scene")
+        if abs(self.scenes[0].start) > _EPSILON:
+            raise ValueError("The first scene must start at 0")
+        for previous, scene in zip(self.scenes, self.scenes[1:]):
+            if abs(scene.start - previous.end) > _EPSILON:
+                raise ValueError(f"Scenes must be contiguous: {previous.end} → {scene.start}")
+            if scene.transition.type != "cut" and scene.transition.duration > previous.duration:
+                raise ValueError("A transition cannot be longer than the scene it leaves")
+        return self
+
+    @property
+    def duration(self) -> float:
+        return self.scenes[-1].end
+
+    def spec_hash(self) -> str:
+        """Stable hash of the render spec (same timeline → same hash)."""
+        return hashlib.sha256(self.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def _stream_length(timeline: Timeline, index: int) -> float:
+    # A scene's stream runs on under the next scene's fade-in so the transition has frames
+    # from both sides while every scene still starts exactly at its `start`
+    scene = timeline.scenes[index]
+    length = scene.duration
+    if index + 1 < len(timeline.scenes):
+        following = timeline.scenes[index + 1].transition
+        if following.type != "cut":
+            length += following.duration
+    return length
+
+
+def _compose(timeline: Timeline, overlay_paths: Dict[int, str]) -> Tuple[List[str], List[str], str, Optional[int]]:
+    """
+    Shared front half of the command: inputs + the filtergraph composing all scenes.
+    Returns (input args, filters, label of the composed video, audio input index or None).
+    """
+    width, height = timeline.size
+    inputs: List[str] = []
+    filters: List[str] = []
+    input_index = 0
+
+    for i, scene in enumerate(timeline.scenes):
+        length = _stream_length(timeline, i)
+
+        # Still inputs are read at 1 fps; frames are duplicated by fps= after compositing
+        if scene.background and os.path.exists(scene.background):
+            inputs += ["-loop", "1", "-framerate", "1", "-i", scene.background]
+            chain = (
+                f"[{input_index}:v]scale={width}:{height}:force_original_aspect_ratio=increase,"
+                f"crop={width}:{height},setsar=1"
+            )
+        else:
+            inputs += ["-f", "lavfi", "-i", f"color=c={color_hex(scene.background_color)}:s={width}x{height}:r=1"]
+            chain = f"[{input_index}:v]setsar=1"
+        input_index += 1
+
+        overlay = overlay_paths.get(i)
+        if overlay:
+            inputs += ["-loop", "1", "-framerate", "1", "-i", overlay]
+            filters.append(f"{chain}[bg{i}]")
+            filters.append(f"[{input_index}:v]scale={width}:{height}[ov{i}]")
+            chain = f"[bg{i}][ov{i}]overlay=0:0:format=auto"
+            input_index += 1
+
+        filters.append(
+            f"{chain},format=yuv420p,fps={timeline.fps},"
+            f"trim=duration={length:.3f}[s{i}]"
+        )
+
+    # Join scenes left to right
+    current = "s0"
+    for i, scene in enumerate(timeline.scenes[1:], start=1):
+        joined = f"j{i}"
+        if scene.transition.type == "cut":
+            filters.append(f"[{current}][s{i}]concat=n=2:v=1:a=0[{joined}]")
+        else:
+            filters.append(
+                f"[{current}][s{i}]xfade=transition={scene.transition.type}:"
+                f"duration={scene.transition.duration:.3f}:offset={scene.start:.3f}[{joined}]"
+            )
+        current = joined
+
+    audio_index = None
+    if timeline.audio_path:
+        inputs += ["-i", timeline.audio_path]
+        audio_index = input_index
+    return inputs, filters, current, audio_index
+
+
+def build_timeline_command(
+    timeline: Timeline,
+    output_path: str,
+    overlay_paths: Optional[Dict[int, str]] = None,
+    ffmpeg: str = "ffmpeg",
+    profile: Optional[RenderProfile] = None,
+) -> List[str]:
+    """
+    Compiles the timeline into a single ffmpeg argv.
+    `overlay_paths` maps scene index → transparent PNG with that scene's rendered text.
+    With a `profile` the composed video is fitted to its size/fps and encoded with its settings.
+    """
+    if profile is not None:
+        return build_multi_profile_command(timeline, [(profile, output_path)], overlay_paths, ffmpeg)
+
+    inputs, filters, video, audio_index = _compose(timeline, overlay_paths or {})
+    cmd = [ffmpeg, "-y", "-hide_banner", "-loglevel", "error", *inputs]
+    cmd += ["-filter_complex", ";".join(filters), "-map", f"[{video}]"]
+    if audio_index is not None:
+        cmd += ["-map", f"{audio_index}:a", "-c:a", "aac"]
+    # xfade negotiates yuv444p; players and platforms expect 4:2:0 H.264
+    cmd += ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-preset", "veryfast", "-movflags", "+faststart"]
+    cmd += ["-t", f"{timeline.duration:.3f}", output_path]
+    return cmd
+
+
+def build_multi_profile_command(
+    timeline: Timeline,
+    outputs: List[Tuple[RenderProfile, str]],
+    overlay_paths: Optional[Dict[int, str]] = None,
+    ffmpeg: str = "ffmpeg",
+) -> List[str]:
+    """
+    One ffmpeg command writing the timeline in several render profiles.
+    Scenes are decoded and composed once (at timeline.size), then the result is split and
+    each branch is scaled/cropped or padded to its profile and encoded to its own file.
+    """
+    if not outputs:
+        raise ValueError("At least one output is required")
+
+    inputs, filters, video, audio_index = _compose(timeline, overlay_paths or {})
+    branches = [f"m{n}" for n in range(len(outputs))]
+    if len(outputs) > 1:
+        filters.append(f"[{video}]split={len(outputs)}" + "".join(f"[{b}]" for b in branches))
+    else:
+        branches = [video]
+    for n, ((profile, _), branch) in enumerate(zip(outputs, branches)):
+        filters.append(f"[{branch}]{profile.fit_filter()}[out{n}]")
+
+    cmd = [ffmpeg, "-y", "-hide_banner", "-loglevel", "error", *inputs, "-filter_complex", ";".join(filters)]
+    for n, (profile, output_path) in enumerate(outputs):
+        cmd += ["-map", f"[out{n}]"]
+        if audio_index is not None:
+            cmd += ["-map", f"{audio_index}:a"]
+        cmd += profile.encoder_args()
+        cmd += ["-t", f"{timeline.duration:.3f}", output_path]
+    return cmd
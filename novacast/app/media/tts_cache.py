@@ -0,0 +1,145 @@
+# app/media/tts_cache.py
+"""
+Content-addressed on-disk cache for synthesized TTS segments.
+
+Scripts repeat a lot (intros, CTAs, recurring phrases), so every synthesized sentence is
+stored under a SHA-256 of (engine, model, voice, normalized text) and reused on the next run.
+
+- Atomic writes: segments are copied to a temp file and renamed into place, so concurrent
+  workers never read a half-written WAV
+- LRU: a hit refreshes the file's mtime; once the cache exceeds `max_bytes` the oldest
+  files are removed first
+
+Usage:
+    cache = get_audio_segment_cache()          # configured from settings.tts_cache_*
+    key = cache.key("coqui", "tts_models/en/ljspeech/tacotron2-DDC", None, "Hello world.")
+    path = cache.get(key) or cache.put(key, adapter.synthesize("Hello world.", tmp_path))
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import unicodedata
+from typing import Optional
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for keys: NFC, whitespace collapsed, trimmed."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+class AudioSegmentCache:
+    def __init__(self, root: str = "storage/cache/tts", max_bytes: int = 1024 ** 3):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None  # computed lazily, then tracked on put/evict
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def key(engine: str, model: Optional[str], voice: Optional[str], text: str) -> str:
+        payload = json.dumps(
+            {"engine": engine, "model": model or "", "voice": voice or "", "text": normalize_text(text)},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.wav")
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached file path (and marks it recently used), or None."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, source_path: str) -> str:
+        """Copies a synthesized file into the cache and returns the cached path."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp, open(source_path, "rb") as src:
+                shutil.copyfileobj(src, tmp)
+            existing = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += os.path.getsize(path) - existing
+            if self._size > self.max_bytes:
+                self._evict(keep=path)
+        return path
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".wav"):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue  # removed by another process
+                    yield stat.st_mtime, stat.st_size, path
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self, keep: str) -> None:
+        # Rescan: other processes may share the directory
+        entries = sorted(self._entries())
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+            logger.info(f"♻️ Evicted cached TTS segment {os.path.basename(path)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            os.makedirs(self.root, exist_ok=True)
+            self._size = 0
+
+    def size_bytes(self) -> int:
+        return self._scan_size()
+
+
+_cache_lock = threading.Lock()
+_cache_instance: Optional[AudioSegmentCache] = None
+_cache_configured = False
+
+
+def get_audio_segment_cache() -> Optional[AudioSegmentCache]:
+    """Process-wide cache built from settings.tts_cache_* (None when disabled)."""
+    global _cache_instance, _cache_configured
+    with _cache_lock:
+        if not _cache_configured:
+            if settings.tts_cache_enabled:
+                _cache_instance = AudioSegmentCache(settings.tts_cache_dir, settings.tts_cache_max_bytes)
+            _cache_configured = True
+        return _cache_instance
@@ -9,62 +9,354 @@ Core Components:
 - TTSAdapter: Abstract base class for all TTS providers
 - CoquiTTSAdapter / ElevenLabsTTSAdapter / PiperTTSAdapter: Concrete implementations
 - TTSEngine: High-level interface for selecting and using a specific TTS engine
+- SentenceStreamSynthesizer: early-start synthesis of streamed text, one sentence at a time
+- TTSEngine.synthesize_segmented: parallel per-sentence synthesis with ordered joining and timings
+- Coqui models are loaded once per process via app/media/tts_models.py
+- Synthesized sentences are cached on disk via app/media/tts_cache.py
 
 Usage:
     tts_engine = TTSEngine()
     audio_path = tts_engine.synthesize("coqui", "Hello world!")
     # → returns path to synthesized audio file
 
+    audio_path = tts_engine.synthesize_stream("coqui", llm.generate_stream(prompt))
+    # → sentences are synthesized while the LLM is still generating
+
 This layer enables easy integration of real-time or offline TTS generation,
 and supports seamless switching between engines for testing, fallback, or A/B experimentation.
 """
 
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import multiprocessing
 import os
-from TTS.api import TTS
+import shutil
+import threading
+
+from app.config.settings import settings
+from app.media.artifacts import atomic_output, get_artifact_allocator
+from app.media.tts_cache import AudioSegmentCache, get_audio_segment_cache
+from app.media.tts_models import get_tts_model_registry
+from app.media.tts_segments import (
+    SegmentTiming,
+    SegmentedSynthesis,
+    SentenceAccumulator,
+    concat_wav,
+    segment_text,
+)
+
+logger = logging.getLogger(__name__)
+
+
 class TTSAdapter:
+    # True for adapters that write real audio files (required for sentence-level modes)
+    writes_audio_files = False
+    # Part of the audio cache key: the same text with another model/voice sounds different
+    model_name: Optional[str] = None
+    voice: Optional[str] = None
+
     def __init__(self, engine: str):
         self.engine = engine
 
-    def synthesize(self, text: str) -> str:
+    def synthesize(self, text: str, output_path: Optional[str] = None) -> str:
         raise NotImplementedError("This method should be overridden by subclasses.")
 
 class CoquiTTSAdapter(TTSAdapter):
-    def synthesize(self, text: str) -> str:
-        output_path = "output/audio_coqui.wav"
-        os.makedirs("output", exist_ok=True)
+    writes_audio_files = True
 
-        # Load Coqui model (once per adapter)
-        tts = TTS(model_name="tts_models/en/ljspeech/tacotron2-DDC", progress_bar=False, gpu=False)
+    def __init__(
+        self,
+        engine: str,
+        model_name: Optional[str] = None,
+        device: Optional[str] = None,
+        voice: Optional[str] = None,
+    ):
+        super().__init__(engine)
+        self.model_name = model_name or settings.tts_model_name
+        self.device = device or settings.tts_device
+        self.voice = voice or settings.tts_voice or None
 
-        # Synthesize and save
-        tts.tts_to_file(text=text, file_path=output_path)
+    def synthesize(self, text: str, output_path: Optional[str] = None) -> str:
+        output_path = output_path or get_artifact_allocator().allocate(f"audio_{self.engine}", ".wav")
+
+        # Coqui model is loaded once per process and shared through the registry
+        registry = get_tts_model_registry()
+        tts = registry.get(self.model_name, self.device)
+
+        # Synthesize to a temp file, renamed into place once complete
+        with registry.model_lock(self.model_name, self.device), atomic_output(output_path) as tmp_path:
+            if self.voice:
+                tts.tts_to_file(text=text, file_path=tmp_path, speaker=self.voice)
+            else:
+                tts.tts_to_file(text=text, file_path=tmp_path)
 
         return output_path
 
 class ElevenLabsTTSAdapter(TTSAdapter):
-    def synthesize(self, text: str) -> str:
+    def synthesize(self, text: str, output_path: Optional[str] = None) -> str:
         # Implementation for ElevenLabs TTS
         return f"ElevenLabs TTS synthesized audio for: {text}"
 
 class PiperTTSAdapter(TTSAdapter):
-    def synthesize(self, text: str) -> str:
+    def synthesize(self, text: str, output_path: Optional[str] = None) -> str:
         # Implementation for Piper TTS
         return f"Piper TTS synthesized audio for: {text}"
 
+class SentenceStreamSynthesizer:
+    """
+    Early-start TTS for streamed text.
+
+    Feed LLM tokens with feed(); every completed sentence is queued for synthesis
+    immediately on a background worker, so audio is produced while the rest of the
+    script is still being generated. close() flushes the last sentence and returns a
+    Future that resolves to the stitched audio file. Sentences found in `cache` are
+    reused instead of synthesized. Once stitched, `segments` holds each sentence's timing.
+    """
+
+    def __init__(
+        self,
+        adapter: TTSAdapter,
+        output_path: Optional[str] = None,
+        cache: Optional[AudioSegmentCache] = None,
+    ):
+        if not adapter.writes_audio_files:
+            raise ValueError(f"TTS engine '{adapter.engine}' does not support sentence streaming")
+        self.adapter = adapter
+        self.output_path = output_path or get_artifact_allocator().allocate(f"audio_{adapter.engine}", ".wav")
+        self.segment_dir = _segment_dir(self.output_path)
+        self.sentences: List[str] = []
+        self.segments: List[SegmentTiming] = []
+        self.cache = cache
+        self._accumulator = SentenceAccumulator()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-stream")
+        self._segments: List[Future] = []
+        self._result: Optional[Future] = None
+
+    def feed(self, chunk: str) -> None:
+        for sentence in self._accumulator.feed(chunk):
+            self._submit(sentence)
+
+    def _submit(self, sentence: str) -> None:
+        os.makedirs(self.segment_dir, exist_ok=True)
+        path = os.path.join(self.segment_dir, f"segment_{len(self.sentences):04d}.wav")
+        self.sentences.append(sentence)
+        if self.cache is None:
+            self._segments.append(self._executor.submit(self.adapter.synthesize, sentence, path))
+            return
+
+        key = _segment_key(self.adapter, sentence)
+        if _checkout(self.cache, key, path):
+            done: Future = Future()
+            done.set_result(path)
+            self._segments.append(done)
+        else:
+            self._segments.append(self._executor.submit(self._synthesize_and_cache, key, sentence, path))
+
+    def _synthesize_and_cache(self, key: str, sentence: str, path: str) -> str:
+        path = self.adapter.synthesize(sentence, path)
+        self.cache.put(key, path)
+        return path
+
+    def close(self) -> Future:
+        if self._result is None:
+            rest = self._accumulator.flush()
+            if rest:
+                self._submit(rest)
+            self._result = self._executor.submit(self._stitch)
+            self._executor.shutdown(wait=False)
+        return self._result
+
+    def _stitch(self) -> str:
+        try:
+            paths = [segment.result() for segment in self._segments]
+            with atomic_output(self.output_path) as tmp_path:
+                offsets = concat_wav(paths, tmp_path)
+            self.segments = [
+                SegmentTiming(index=index, text=sentence, start=start, end=end)
+                for index, (sentence, (start, end)) in enumerate(zip(self.sentences, offsets))
+            ]
+            return self.output_path
+        finally:
+            shutil.rmtree(self.segment_dir, ignore_errors=True)
+
+    def result(self, timeout: Optional[float] = None) -> str:
+        return self.close().result(timeout)
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Long-lived pool shared by every segmented synthesis in this process, so each worker
+    loads its TTS model once (via the model registry) and keeps it across calls.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=settings.tts_segment_workers or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context(settings.tts_process_start_method),
+            )
+        return _process_pool
+
+
+def _segment_dir(output_path: str) -> str:
+    # Scratch space next to the (uniquely named) output, removed once the segments are joined
+    return f"{os.path.splitext(output_path)[0]}.segments"
+
+
+def _segment_key(adapter: TTSAdapter, text: str) -> str:
+    return AudioSegmentCache.key(adapter.engine, adapter.model_name, adapter.voice, text)
+
+
+def _checkout(cache: AudioSegmentCache, key: str, path: str) -> bool:
+    """
+    Hard-links (or copies) a cached segment to `path`; False on a miss. Joins only read
+    their own files: cache entries can be evicted at any time, by this process or another.
+    """
+    cached = cache.get(key)
+    if cached is None:
+        return False
+    try:
+        os.link(cached, path)
+    except FileNotFoundError:
+        return False  # evicted since get()
+    except OSError:
+        # e.g. the cache lives on another filesystem
+        try:
+            shutil.copyfile(cached, path)
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def _synthesize_segment(engine: str, text: str, output_path: str, voice: Optional[str] = None) -> str:
+    # Runs inside pool workers; must stay a picklable module-level function
+    adapter = TTSEngine()._adapter(engine)
+    if voice:
+        adapter.voice = voice
+    return adapter.synthesize(text, output_path)
+
+
 class TTSEngine:
-    def __init__(self):
+    def __init__(self, cache: Optional[AudioSegmentCache] = None):
+        # Audio cache for file-writing engines (settings.tts_cache_*, None when disabled)
+        self.cache = cache or get_audio_segment_cache()
         self.adapters: Dict[str, TTSAdapter] = {
             "coqui": CoquiTTSAdapter("coqui"),
             "elevenlabs": ElevenLabsTTSAdapter("elevenlabs"),
             "piper": PiperTTSAdapter("piper"),
         }
 
-    def synthesize(self, engine: str, text: str) -> str:
+    def _adapter(self, engine: str) -> TTSAdapter:
         if engine not in self.adapters:
             raise ValueError(f"Unsupported TTS engine: {engine}")
-        return self.adapters[engine].synthesize(text)
+        return self.adapters[engine]
+
+    def synthesize(self, engine: str, text: str, output_path: Optional[str] = None) -> str:
+        adapter = self._adapter(engine)
+        if self.cache is None or not adapter.writes_audio_files:
+            return adapter.synthesize(text, output_path)
+
+        key = _segment_key(adapter, text)
+        cached = self.cache.get(key)
+        if cached is None:
+            path = adapter.synthesize(text, output_path)
+            self.cache.put(key, path)
+            return path
+
+        # Hand out a copy: cached files may be evicted later
+        output_path = output_path or get_artifact_allocator().allocate(f"audio_{engine}", ".wav")
+        with atomic_output(output_path) as tmp_path:
+            shutil.copyfile(cached, tmp_path)
+        return output_path
+
+    def synthesize_segmented(
+        self,
+        engine: str,
+        text: str,
+        output_path: Optional[str] = None,
+        pause_ms: Optional[int] = None,
+        paragraph_pause_ms: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> SegmentedSynthesis:
+        """
+        Splits text at sentence/paragraph boundaries, synthesizes the segments in parallel
+        (default: a process pool sized to the available cores) and joins them in order,
+        with `pause_ms` between sentences and `paragraph_pause_ms` between paragraphs.
+        Returns the audio path plus per-segment timing offsets.
+        Segments already in the audio cache are reused; only new sentences are synthesized.
+        """
+        adapter = self._adapter(engine)
+        if not adapter.writes_audio_files:
+            raise ValueError(f"TTS engine '{engine}' does not support segmented synthesis")
+
+        segments = segment_text(text)
+        if not segments:
+            raise ValueError("Nothing to synthesize")
+
+        pause_ms = settings.tts_sentence_pause_ms if pause_ms is None else pause_ms
+        paragraph_pause_ms = settings.tts_paragraph_pause_ms if paragraph_pause_ms is None else paragraph_pause_ms
+
+        output_path = output_path or get_artifact_allocator().allocate(f"audio_{engine}", ".wav")
+        segment_dir = _segment_dir(output_path)
+        os.makedirs(segment_dir, exist_ok=True)
+
+        try:
+            paths: List[Optional[str]] = [None] * len(segments)
+            pending: Dict[int, Any] = {}
+            for index, (sentence, _) in enumerate(segments):
+                key = _segment_key(adapter, sentence) if self.cache is not None else None
+                path = os.path.join(segment_dir, f"segment_{index:04d}.wav")
+                if key and _checkout(self.cache, key, path):
+                    paths[index] = path
+                else:
+                    pending[index] = key
+
+            if pending:
+                # The pool is only started when something actually needs synthesizing
+                pool = executor or _get_process_pool()
+                futures = {
+                    index: pool.submit(
+                        _synthesize_segment, engine, segments[index][0],
+                        os.path.join(segment_dir, f"segment_{index:04d}.wav"), adapter.voice,
+                    )
+                    for index in pending
+                }
+                for index, future in futures.items():
+                    paths[index] = future.result()
+                    if pending[index]:
+                        self.cache.put(pending[index], paths[index])
+
+            if self.cache is not None:
+                logger.info(f"🔁 TTS cache: reused {len(segments) - len(pending)}/{len(segments)} segments")
+            pauses = [paragraph_pause_ms if new_paragraph else pause_ms for _, new_paragraph in segments]
+            with atomic_output(output_path) as tmp_path:
+                offsets = concat_wav(paths, tmp_path, pauses=pauses)
+        finally:
+            shutil.rmtree(segment_dir, ignore_errors=True)
+
+        return SegmentedSynthesis(
+            audio_path=output_path,
+            segments=[
+                SegmentTiming(index=index, text=sentence, start=start, end=end)
+                for index, ((sentence, _), (start, end)) in enumerate(zip(segments, offsets))
+            ],
+        )
+
+    def start_stream(self, engine: str, output_path: Optional[str] = None) -> SentenceStreamSynthesizer:
+        """Starts sentence-level synthesis for text that is still being generated."""
+        return SentenceStreamSynthesizer(self._adapter(engine), output_path=output_path, cache=self.cache)
+
+    def synthesize_stream(self, engine: str, chunks: Iterable[str], output_path: Optional[str] = None) -> str:
+        """Synthesizes streamed text (e.g. LLM tokens) sentence by sentence as it arrives."""
+        stream = self.start_stream(engine, output_path=output_path)
+        for chunk in chunks:
+            stream.feed(chunk)
+        return stream.result()
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+# app/media/tts_models.py
+"""
+TTS Model Registry
+
+Loading a Coqui model takes far longer than synthesizing a short sentence, so models are
+loaded once per (model_name, device) per process and reused by every adapter call.
+
+- Lazy: a model is loaded on first use (concurrent first calls wait for a single load)
+- Warm-up: warm_up() preloads the configured models, e.g. at worker start
+- LRU: at most `max_models` models are kept; the least recently used one is evicted
+- Metrics: load time histogram plus hit/miss counters (Prometheus), and stats()
+
+Each worker process holds its own registry; warm up before forking to share the loaded
+weights copy-on-write with the children.
+
+Usage:
+    tts = get_tts_model_registry().get("tts_models/en/ljspeech/tacotron2-DDC", "cpu")
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.config.settings import settings
+from app.services.telemetry.metrics import TTS_MODEL_CACHE, TTS_MODEL_LOAD_TIME
+
+logger = logging.getLogger(__name__)
+
+ModelKey = Tuple[str, str]
+
+
+def load_coqui_model(model_name: str, device: str) -> Any:
+    # Imported lazily: TTS pulls in torch and is only needed by processes that synthesize
+    from TTS.api import TTS
+    return TTS(model_name=model_name, progress_bar=False).to(device)
+
+
+class TTSModelRegistry:
+    def __init__(self, loader: Callable[[str, str], Any] = load_coqui_model, max_models: int = 2):
+        if max_models < 1:
+            raise ValueError("max_models must be >= 1")
+        self.loader = loader
+        self.max_models = max_models
+        self._models: "OrderedDict[ModelKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[ModelKey, threading.Lock] = {}
+        self._use_locks: Dict[ModelKey, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.load_seconds: Dict[ModelKey, float] = {}
+
+    def get(self, model_name: str, device: str = "cpu") -> Any:
+        key = (model_name, device)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                TTS_MODEL_CACHE.labels(result="hit").inc()
+                return model
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given model; the others wait and then reuse it
+        with load_lock:
+            with self._lock:
+                model = self._models.get(key)
+                if model is not None:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    TTS_MODEL_CACHE.labels(result="hit").inc()
+                    return model
+
+            started = time.perf_counter()
+            model = self.loader(model_name, device)
+            elapsed = time.perf_counter() - started
+            logger.info(f"🔊 Loaded TTS model {model_name} on {device} in {elapsed:.2f}s")
+            TTS_MODEL_LOAD_TIME.labels(model=model_name).observe(elapsed)
+            TTS_MODEL_CACHE.labels(result="miss").inc()
+
+            with self._lock:
+                self.misses += 1
+                self.load_seconds[key] = elapsed
+                self._models[key] = model
+                self._models.move_to_end(key)
+                while len(self._models) > self.max_models:
+                    evicted, _ = self._models.popitem(last=False)
+                    logger.info(f"♻️ Evicted TTS model {evicted[0]} ({evicted[1]})")
+                self._loading.pop(key, None)
+            return model
+
+    def model_lock(self, model_name: str, device: str = "cpu") -> threading.Lock:
+        """Lock serializing inference on one shared model instance (models are not thread-safe)."""
+        with self._lock:
+            return self._use_locks.setdefault((model_name, device), threading.Lock())
+
+    def warm_up(self, models: Iterable[str], device: str = "cpu") -> None:
+        for model_name in models:
+            self.get(model_name, device)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "loaded": [f"{name}@{device}" for name, device in self._models],
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "load_seconds": {f"{name}@{device}": s for (name, device), s in self.load_seconds.items()},
+            }
+
+
+_registry: Optional[TTSModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_tts_model_registry() -> TTSModelRegistry:
+    """Process-wide registry sized by settings.tts_model_cache_size."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = TTSModelRegistry(max_models=settings.tts_model_cache_size)
+        return _registry
+
+
+def warm_up_tts_models() -> None:
+    """Preloads settings.tts_warmup_models (comma separated); call at worker start."""
+    models = [m.strip() for m in settings.tts_warmup_models.split(",") if m.strip()]
+    if models:
+        get_tts_model_registry().warm_up(models, settings.tts_device)
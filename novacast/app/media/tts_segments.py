@@ -0,0 +1,136 @@
+# app/media/tts_segments.py
+"""
+Sentence-level helpers for TTS.
+
+- split_sentences: cut finished text into sentences (sentence and paragraph boundaries)
+- SentenceAccumulator / iter_sentences: cut a stream of LLM tokens into sentences as they arrive
+- segment_text: sentences tagged with whether they open a new paragraph
+- concat_wav: stitch per-sentence WAV files into one file, with optional pauses,
+  returning each segment's (start, end) offset in seconds
+- SegmentTiming / SegmentedSynthesis: per-segment offsets reusable by subtitles and scene cuts
+
+Usage:
+    for sentence in iter_sentences(llm.generate_stream(prompt)):
+        ...  # synthesize as soon as a sentence is complete
+"""
+
+import re
+import wave
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+# Whitespace after end-of-sentence punctuation (optionally closed by a quote/bracket), or a line break
+_BOUNDARY = re.compile(r"(?<=[.!?…])\s+|(?<=[.!?…][\"'”’)\]])\s+|\n+")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+
+
+class SegmentTiming(BaseModel):
+    index: int
+    text: str
+    start: float
+    end: float
+
+
+class SegmentedSynthesis(BaseModel):
+    audio_path: str
+    segments: List[SegmentTiming]
+
+    @property
+    def duration(self) -> float:
+        return self.segments[-1].end if self.segments else 0.0
+
+
+def split_sentences(text: str) -> List[str]:
+    """Splits text at sentence and paragraph boundaries, dropping empty pieces."""
+    return [s.strip() for s in _BOUNDARY.split(text or "") if s and s.strip()]
+
+
+def segment_text(text: str) -> List[Tuple[str, bool]]:
+    """Returns (sentence, starts_paragraph) pairs; the first sentence never starts a paragraph."""
+    segments: List[Tuple[str, bool]] = []
+    for paragraph in _PARAGRAPH.split(text or ""):
+        for position, sentence in enumerate(split_sentences(paragraph)):
+            segments.append((sentence, bool(segments) and position == 0))
+    return segments
+
+
+class SentenceAccumulator:
+    """
+    Buffers streamed text and releases complete sentences.
+    A sentence is only released once the whitespace after its final punctuation
+    has arrived, so "3." followed by "14" is never cut.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        self._buffer += chunk
+        last_end = None
+        for match in _BOUNDARY.finditer(self._buffer):
+            last_end = match.end()
+        if last_end is None:
+            return []
+        complete, self._buffer = self._buffer[:last_end], self._buffer[last_end:]
+        return split_sentences(complete)
+
+    def flush(self) -> Optional[str]:
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest or None
+
+
+def iter_sentences(chunks: Iterable[str]) -> Iterator[str]:
+    accumulator = SentenceAccumulator()
+    for chunk in chunks:
+        yield from accumulator.feed(chunk)
+    rest = accumulator.flush()
+    if rest:
+        yield rest
+
+
+def concat_wav(
+    segment_paths: List[str],
+    output_path: str,
+    pause_ms: int = 0,
+    pauses: Optional[Sequence[int]] = None,
+) -> List[Tuple[float, float]]:
+    """
+    Concatenates WAV files that share the same format (channels, sample width, rate).
+    `pause_ms` of silence is inserted between consecutive segments; `pauses` overrides it
+    per gap, where pauses[i] is the silence before segment i (pauses[0] is ignored).
+    Returns the (start, end) offset of each segment in the output, in seconds.
+    """
+    if not segment_paths:
+        raise ValueError("No audio segments to concatenate")
+    if pauses is not None and len(pauses) != len(segment_paths):
+        raise ValueError("pauses must have one entry per segment")
+
+    offsets: List[Tuple[float, float]] = []
+    params = None
+    position = 0  # in frames
+
+    with wave.open(output_path, "wb") as out:
+        for index, path in enumerate(segment_paths):
+            with wave.open(path, "rb") as segment:
+                seg_params = (segment.getnchannels(), segment.getsampwidth(), segment.getframerate())
+                if params is None:
+                    params = seg_params
+                    out.setnchannels(params[0])
+                    out.setsampwidth(params[1])
+                    out.setframerate(params[2])
+                elif seg_params != params:
+                    raise ValueError(f"Audio segment {path} has format {seg_params}, expected {params}")
+
+                gap_ms = pauses[index] if pauses is not None else pause_ms
+                if index and gap_ms:
+                    silence_frames = int(params[2] * gap_ms / 1000)
+                    out.writeframes(b"\x00" * silence_frames * params[0] * params[1])
+                    position += silence_frames
+
+                frames = segment.getnframes()
+                out.writeframes(segment.readframes(frames))
+                offsets.append((position / params[2], (position + frames) / params[2]))
+                position += frames
+
+    return offsets
@@ -1,117 +1,408 @@
 import os
-import uuid
-import requests
+import shutil
 import subprocess
-from typing import List
+from typing import Any, Callable, Dict, List, Optional
 from dotenv import load_dotenv
+from app.config.settings import settings
+from app.media.artifacts import atomic_output, commit, discard, get_artifact_allocator, new_job_id, partial_path
+from app.media.ffmpeg_renderer import RenderError, StillClip, render_still, require_ffmpeg, resolve_ffmpeg, run_ffmpeg
+from app.media.image_source import get_image_source
 from app.media.halp_video import (
     create_background_clip,
     create_text_overlay_clip,
     compose_video_with_audio,
+    render_text_overlay,
+    render_text_sprite,
 )
+from app.media.render_index import (
+    get_render_deduplicator,
+    render_spec_hash,
+    still_render_spec,
+    timeline_render_spec,
+)
+from app.media.render_profiles import RenderProfile, get_profile
+from app.media.subtitles import build_mux_command
+from app.media.timeline import Timeline, build_multi_profile_command, build_timeline_command
 from moviepy.editor import ImageClip, ColorClip, TextClip, AudioFileClip, CompositeVideoClip, VideoFileClip
 from moviepy.video.fx.resize import resize  
 
 load_dotenv()
-PEXELS_API_KEY = os.getenv("PEXELS_API_KEY")
-PEXELS_API_URL = "https://api.pexels.com/v1/search"
-HEADERS = {"Authorization": PEXELS_API_KEY}
 
 
 class VideoBuilder:
-    def __init__(self, template: str = None):
+    def __init__(self, template: str = None, job_id: str = None):
         self.template = template
-        os.makedirs("output", exist_ok=True)
-        self.video_index = self._get_latest_index()
-
-    def _get_latest_index(self) -> int:
-        existing = [f for f in os.listdir("output") if f.startswith("final_video_") and f.endswith(".mp4")]
-        indexes = [int(f.split("_")[-1].replace(".mp4", "")) for f in existing if f.split("_")[-1].replace(".mp4", "").isdigit()]
-        return max(indexes, default=0)
+        # Outputs go to the job's own directory (output/jobs/<job_id>/), see app/media/artifacts.py
+        self.job_id = job_id
+        self.artifacts = get_artifact_allocator()
 
     def _get_next_output_path(self) -> str:
-        self.video_index += 1
-        return f"output/final_video_{self.video_index}.mp4"
+        return self.artifacts.allocate("final_video", ".mp4", self.job_id)
 
     def build_video(self, audio_file: str) -> str:
         print("[🎬] Building video from template...")
         output_path = self._get_next_output_path()
-        command = [
-            'ffmpeg', '-i', audio_file, '-i', self.template,
-            '-c:v', 'copy', '-c:a', 'aac', '-strict', 'experimental',
-            output_path
-        ]
-        subprocess.run(command, check=True)
+        with atomic_output(output_path) as tmp_path:
+            command = [
+                'ffmpeg', '-i', audio_file, '-i', self.template,
+                '-c:v', 'copy', '-c:a', 'aac', '-strict', 'experimental',
+                tmp_path
+            ]
+            subprocess.run(command, check=True)
         print(f"[✅] Video created at: {output_path}")
         return output_path
 
     def add_audio_to_video(self, video_file: str, audio_file: str) -> str:
         print("[🎧] Adding audio to video...")
         output_path = self._get_next_output_path()
-        command = [
-            'ffmpeg', '-i', video_file, '-i', audio_file,
-            '-c:v', 'copy', '-c:a', 'aac', '-strict', 'experimental',
-            '-shortest', output_path
-        ]
-        subprocess.run(command, check=True)
+        with atomic_output(output_path) as tmp_path:
+            command = [
+                'ffmpeg', '-i', video_file, '-i', audio_file,
+                '-c:v', 'copy', '-c:a', 'aac', '-strict', 'experimental',
+                '-shortest', tmp_path
+            ]
+            subprocess.run(command, check=True)
+        return output_path
+
+    def render_timeline(self, timeline: Timeline, output_path: str = None, profile: str = None) -> str:
+        """
+        Renders a multi-scene timeline in a single encode (one ffmpeg command), optionally
+        fitted to a render profile (app/media/render_profiles.py).
+        Falls back to moviepy compositing when ffmpeg is unavailable or fails.
+        A timeline already rendered with the same inputs (app/media/render_index.py) returns
+        the existing video instead of being encoded again.
+        """
+        output_path = output_path or self._get_next_output_path()
+        if profile:
+            return self.render_timeline_profiles(timeline, [profile], {profile: output_path})[get_profile(profile).name]
+        return _deduplicated(lambda: timeline_render_spec(timeline), lambda: self._render_timeline(timeline, output_path))
+
+    def _render_timeline(self, timeline: Timeline, output_path: str) -> str:
+        print(f"[🎬] Rendering timeline with {len(timeline.scenes)} scenes...")
+        work_dir = f"{os.path.splitext(output_path)[0]}.overlays"
+        os.makedirs(work_dir, exist_ok=True)
+        try:
+            overlays = self._render_scene_overlays(timeline, work_dir)
+            with atomic_output(output_path) as tmp_path:
+                if _use_ffmpeg():
+                    try:
+                        cmd = build_timeline_command(timeline, tmp_path, overlays, ffmpeg=require_ffmpeg())
+                        run_ffmpeg(cmd, tmp_path)
+                    except RenderError as e:
+                        print(f"[⚠️] ffmpeg render failed, falling back to moviepy: {e}")
+                        self._render_timeline_moviepy(timeline, overlays, tmp_path)
+                else:
+                    self._render_timeline_moviepy(timeline, overlays, tmp_path)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        print(f"[✅] Video created at: {output_path}")
+        return output_path
+
+    def render_timeline_profiles(
+        self,
+        timeline: Timeline,
+        profiles: List[str],
+        output_paths: Dict[str, str] = None,
+    ) -> Dict[str, str]:
+        """
+        Renders one timeline into several render profiles (e.g. ["youtube", "tiktok"]) with
+        a single ffmpeg command: scenes are composed once and the result is split per profile.
+        Profiles already rendered for the same inputs reuse the existing video; only the
+        others are encoded.
+        Returns {profile name: video path}.
+        """
+        resolved = [get_profile(name) for name in profiles]
+        job_id = self.job_id or new_job_id()  # keep all versions of one video together
+        output_paths = {
+            p.name: (output_paths or {}).get(name) or self.artifacts.allocate(f"final_video_{p.name}", ".mp4", job_id)
+            for name, p in zip(profiles, resolved)
+        }
+
+        reused: Dict[str, str] = {}
+        specs: Dict[str, Dict[str, Any]] = {}
+        deduplicator = get_render_deduplicator()
+        if deduplicator is not None:
+            try:
+                specs = {p.name: timeline_render_spec(timeline, p) for p in resolved}
+            except OSError as e:
+                print(f"[⚠️] Cannot hash render inputs, rendering without deduplication: {e}")
+            for name, spec in specs.items():
+                existing = deduplicator.existing(render_spec_hash(spec))
+                if existing:
+                    print(f"[♻️] Reusing {name} render: {existing}")
+                    reused[name] = existing
+
+        missing = [p for p in resolved if p.name not in reused]
+        if missing:
+            rendered = self._render_profiles(timeline, missing, {p.name: output_paths[p.name] for p in missing})
+            for name, path in rendered.items():
+                if name in specs:
+                    deduplicator.record(render_spec_hash(specs[name]), path, specs[name])
+        return {name: reused.get(name) or output_paths[name] for name in output_paths}
+
+    def _render_profiles(
+        self, timeline: Timeline, resolved: List[RenderProfile], output_paths: Dict[str, str],
+    ) -> Dict[str, str]:
+        print(f"[🎬] Rendering timeline into profiles: {', '.join(output_paths)}")
+        first_output = next(iter(output_paths.values()))
+        work_dir = f"{os.path.splitext(first_output)[0]}.overlays"
+        os.makedirs(work_dir, exist_ok=True)
+        tmp_paths = {name: partial_path(path) for name, path in output_paths.items()}
+        try:
+            overlays = self._render_scene_overlays(timeline, work_dir)
+            rendered = False
+            if _use_ffmpeg():
+                try:
+                    outputs = [(p, tmp_paths[p.name]) for p in resolved]
+                    run_ffmpeg(build_multi_profile_command(timeline, outputs, overlays, ffmpeg=require_ffmpeg()), first_output)
+                    rendered = True
+                except RenderError as e:
+                    print(f"[⚠️] ffmpeg render failed, falling back to moviepy: {e}")
+            if not rendered:
+                for p in resolved:
+                    self._render_profile_moviepy(timeline, p, work_dir, tmp_paths[p.name])
+            for name, path in output_paths.items():
+                commit(tmp_paths[name], path)
+        finally:
+            for tmp_path in tmp_paths.values():
+                discard(tmp_path)
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return output_paths
+
+    def _render_profile_moviepy(self, timeline: Timeline, profile: RenderProfile, work_dir: str, output_path: str) -> str:
+        # moviepy has no split: compose again at the profile's size
+        sized = timeline.model_copy(update={"size": profile.size, "fps": profile.fps})
+        profile_dir = os.path.join(work_dir, profile.name)
+        os.makedirs(profile_dir, exist_ok=True)
+        overlays = self._render_scene_overlays(sized, profile_dir)
+        return self._render_timeline_moviepy(sized, overlays, output_path)
+
+    @staticmethod
+    def _render_scene_overlays(timeline: Timeline, work_dir: str) -> Dict[int, str]:
+        overlays = {}
+        for index, scene in enumerate(timeline.scenes):
+            if scene.overlay_text:
+                path = os.path.join(work_dir, f"scene_{index:03d}.png")
+                render_text_overlay(scene.overlay_text, size=timeline.size).save(path)
+                overlays[index] = path
+        return overlays
+
+    @staticmethod
+    def _render_timeline_moviepy(timeline: Timeline, overlays: Dict[int, str], output_path: str) -> str:
+        clips = []
+        for index, scene in enumerate(timeline.scenes):
+            # Keep each scene on screen under the next scene's cross-fade
+            following = timeline.scenes[index + 1].transition if index + 1 < len(timeline.scenes) else None
+            length = scene.duration + (following.duration if following and following.type != "cut" else 0)
+            layers = [create_background_clip(
+                image_path=scene.background, fallback_color=scene.background_color,
+                size=timeline.size, duration=length,
+            )]
+            if index in overlays:
+                layers.append(ImageClip(overlays[index]).set_duration(length))
+            clip = CompositeVideoClip(layers, size=timeline.size).set_start(scene.start).set_duration(length)
+            if scene.transition.type != "cut":
+                clip = clip.crossfadein(scene.transition.duration)
+            clips.append(clip)
+
+        final_clip = CompositeVideoClip(clips, size=timeline.size).set_duration(timeline.duration)
+        audio = AudioFileClip(timeline.audio_path) if timeline.audio_path else None
+        try:
+            if audio:
+                final_clip = final_clip.set_audio(audio)
+            final_clip.write_videofile(
+                output_path, fps=timeline.fps, codec="libx264", audio=audio is not None,
+                audio_codec="aac", threads=2, logger=None,
+            )
+        finally:
+            final_clip.close()
+            if audio:
+                audio.close()
         return output_path
 
     def create_video_from_images(self, image_files: List[str], fps: int = 30) -> str:
         print("[🖼️] Creating video from images...")
         output_path = self._get_next_output_path()
         images = '|'.join(image_files)
-        command = f'ffmpeg -r {fps} -i "concat:{images}" -c:v libx264 -vf "fps={fps},format=yuv420p" {output_path}'
-        subprocess.run(command, shell=True, check=True)
+        with atomic_output(output_path) as tmp_path:
+            command = f'ffmpeg -r {fps} -i "concat:{images}" -c:v libx264 -vf "fps={fps},format=yuv420p" {tmp_path}'
+            subprocess.run(command, shell=True, check=True)
         return output_path
 
 
-def search_pexels_image(query: str) -> bytes | None:
+def fetch_background_image(context_text: str) -> str | None:
+    """
+    Finds a background image matching the context through the image source
+    (app/media/image_source.py: Pexels or local provider + on-disk store).
+    Returns a path inside the shared image store, or None when nothing usable was found.
+    The file belongs to the store: callers must not delete it.
+    """
+    print("🖼️ Searching for background image...")
     try:
-        print(f"[🔍] Searching Pexels for: {query}")
-        params = {"query": query, "per_page": 1}
-        response = requests.get(PEXELS_API_URL, headers=HEADERS, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if data["photos"]:
-            url = data["photos"][0]["src"]["large"]
-            print(f"[📸] Found image: {url}")
-            return requests.get(url).content
+        image_path = get_image_source().get(context_text[:60])
     except Exception as e:
-        print(f"[❌] Pexels image search failed: {e}")
-    return None
+        print(f"[⚠️] Image search error: {e}")
+        return None
+    if image_path:
+        print(f"[📸] Using background image: {image_path}")
+    return image_path
 
 
-def build_media_clip_with_context(audio_path: str, context_text: str) -> str | None:
-    builder = VideoBuilder()
-    output_path = builder._get_next_output_path()
+def _deduplicated(spec: Callable[[], Dict[str, Any]], render: Callable[[], Optional[str]]) -> Optional[str]:
+    """Runs `render` through the render deduplicator (plain `render()` when it is disabled)."""
+    deduplicator = get_render_deduplicator()
+    if deduplicator is None:
+        return render()
+    try:
+        render_spec = spec()
+    except OSError as e:
+        print(f"[⚠️] Cannot hash render inputs, rendering without deduplication: {e}")
+        return render()
+    return deduplicator.render(render_spec, render)
+
+
+def _use_ffmpeg() -> bool:
+    renderer = (settings.video_renderer or "auto").lower()
+    if renderer == "moviepy":
+        return False
+    return renderer == "ffmpeg" or resolve_ffmpeg() is not None
+
+
+def _render_still_with_ffmpeg(
+    audio_path: str,
+    context_text: str,
+    image_path: str | None,
+    output_path: str,
+    profile: RenderProfile,
+    subtitles_path: str | None = None,
+) -> str:
+    overlay_path = f"{os.path.splitext(output_path)[0]}.overlay.png"
+    overlay_position = None
+    burn_captions = bool(subtitles_path) and settings.subtitles_mode == "burn"
+    try:
+        if burn_captions:
+            # Timed captions replace the static script overlay
+            overlay_path = None
+        else:
+            print("📝 Creating text overlay...")
+            try:
+                sprite = render_text_sprite(context_text, size=profile.size)
+                sprite.image.save(overlay_path)
+                overlay_position = sprite.position
+            except Exception as e:
+                print(f"[⚠️] Failed to create Pillow overlay: {e}")
+                overlay_path = None
+
+        print("[🎬] Rendering video with ffmpeg...")
+        clip = StillClip(
+            audio_path=audio_path,
+            background_path=image_path or None,
+            overlay_path=overlay_path,
+            overlay_position=overlay_position,
+            size=profile.size,
+            fps=profile.fps,
+            codec=profile.video_codec,
+            preset=profile.preset,
+            crf=profile.crf,
+            audio_bitrate=profile.audio_bitrate,
+            subtitles_path=subtitles_path,
+            subtitles_mode="burn" if burn_captions else "soft",
+        )
+        return render_still(clip, output_path)
+    finally:
+        if overlay_path and os.path.exists(overlay_path):
+            os.remove(overlay_path)
+
+
+def _mux_subtitles(video_path: str, subtitles_path: str) -> bool:
+    """Adds captions to a rendered video as a soft subtitle track (streams are copied)."""
+    ffmpeg = resolve_ffmpeg()
+    if ffmpeg is None:
+        print("[⚠️] ffmpeg not found, cannot add subtitles")
+        return False
+    muxed_path = partial_path(video_path)
+    try:
+        run_ffmpeg(build_mux_command(video_path, subtitles_path, muxed_path, ffmpeg=ffmpeg), muxed_path)
+    except RenderError as e:
+        discard(muxed_path)
+        print(f"[⚠️] Failed to add subtitles: {e}")
+        return False
+    commit(muxed_path, video_path)
+    return True
+
+
+def build_media_clip_with_context(
+    audio_path: str,
+    context_text: str,
+    image_path: str | None = None,
+    output_path: str | None = None,
+    profile: str | None = None,
+    subtitles_path: str | None = None,
+) -> str | None:
+    """
+    Builds a video from narration audio and the script text, in the given render
+    profile (default: settings.render_profile).
+    `subtitles_path` (SRT/VTT, see app/media/subtitles.py) adds timed captions: a soft
+    subtitle track, or drawn into the video instead of the script overlay when
+    settings.subtitles_mode is "burn".
+    When `image_path` is given (e.g. fetched concurrently by the orchestrator) it is used
+    as the background; otherwise one is looked up here via fetch_background_image.
+    The video is rendered to a temp file and renamed to `output_path` (default: a fresh
+    path in its own job directory) only when complete.
+
+    Rendering uses a single ffmpeg command (app/media/ffmpeg_renderer.py) when ffmpeg is
+    available and falls back to moviepy compositing otherwise (settings.video_renderer).
+
+    Renders are deduplicated by the hash of their inputs (app/media/render_index.py): when
+    the same audio, text, background, captions and profile were rendered before, the
+    existing video is returned instead of `output_path`, and concurrent identical calls
+    share one render.
+    """
+    render_profile = get_profile(profile or settings.render_profile)
+    if image_path is None:
+        image_path = fetch_background_image(context_text)
+    return _deduplicated(
+        lambda: still_render_spec(audio_path, context_text, image_path, render_profile, subtitles_path),
+        lambda: _build_media_clip(audio_path, context_text, image_path, output_path, render_profile, subtitles_path),
+    )
+
+
+def _build_media_clip(
+    audio_path: str,
+    context_text: str,
+    image_path: str | None,
+    output_path: str | None,
+    render_profile: RenderProfile,
+    subtitles_path: str | None,
+) -> str | None:
+    output_path = output_path or VideoBuilder()._get_next_output_path()
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = partial_path(output_path)
 
-    temp_image_path = None
     clips = []
+    audio = None
 
     try:
+        if not image_path:
+            print("🎨 Using solid background")
+
+        if _use_ffmpeg():
+            try:
+                _render_still_with_ffmpeg(
+                    audio_path, context_text, image_path, tmp_path, render_profile, subtitles_path,
+                )
+                return commit(tmp_path, output_path)
+            except RenderError as e:
+                print(f"[⚠️] ffmpeg render failed, falling back to moviepy: {e}")
+
         print("🎧 Loading audio...")
         audio = AudioFileClip(audio_path)
         duration = max(0.1, float(audio.duration or 0.1))
 
-        print("🖼️ Searching for Pexels image...")
-        img_data = None
-        try:
-            img_data = search_pexels_image(context_text[:60])
-        except Exception as e:
-            print(f"[⚠️] Pexels search error: {e}")
-
-        # 🔹 שמירת התמונה הזמנית (אם נמצאה)
-        if img_data:
-            temp_image_path = f"temp_img_{uuid.uuid4().hex}.jpg"
-            with open(temp_image_path, "wb") as f:
-                f.write(img_data)
-            print(f"[📸] Using Pexels image: {temp_image_path}")
-        else:
-            print("🎨 Using solid background")
-
         # 🔹 יצירת רקע
         background = create_background_clip(
-            image_path=temp_image_path,
+            image_path=image_path,
+            size=render_profile.size,
             duration=duration,
         )
         clips.append(background)
@@ -121,31 +412,38 @@ def build_media_clip_with_context(audio_path: str, context_text: str) -> str | N
         try:
             text_clip = create_text_overlay_clip(
                 text=context_text,
+                size=render_profile.size,
                 duration=duration,
-            ).set_position("center")
+            )
             clips.append(text_clip)
         except Exception as e:
             print(f"[⚠️] Failed to create Pillow overlay: {e}")
 
         # 🔹 קומפוזיציה + יצירה
-        return compose_video_with_audio(
+        if not compose_video_with_audio(
             visual_clips=clips,
             audio_path=audio_path,
-            output_path=output_path,
-        )
+            output_path=tmp_path,
+            fps=render_profile.fps,
+            codec=render_profile.video_codec,
+            preset=render_profile.preset,
+            crf=render_profile.crf,
+            audio_bitrate=render_profile.audio_bitrate,
+        ):
+            return None
+        # A caption-less video must not be returned (and recorded) for a captioned spec
+        if subtitles_path and not _mux_subtitles(tmp_path, subtitles_path):
+            return None
+        return commit(tmp_path, output_path)
 
     except Exception as e:
         print(f"[❌] Fatal error in build_media_clip_with_context: {e}")
         return None
 
     finally:
+        discard(tmp_path)  # no-op once committed
         try:
             if audio:
                 audio.close()
         except:
             pass
-        if temp_image_path and os.path.exists(temp_image_path):
-            try:
-                os.remove(temp_image_path)
-            except:
-                pass
\ No newline at end of file
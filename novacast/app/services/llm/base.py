@@ -1,7 +1,8 @@
 # app/services/llm/base.py
 from __future__ import annotations
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Iterable, List
+from typing import Any, AsyncIterator, Dict, Iterable, List
 
 
 __all__ = [
@@ -34,10 +35,20 @@ class BaseLLMService(ABC):
 
     Optional (raise NotImplementedError by default):
       - generate_stream(prompt, **kwargs) -> Iterable[str]
+      - chat_stream(messages, **kwargs) -> Iterable[str]
       - chat(messages, **kwargs) -> str
       - list_models() -> List[dict]
       - health() -> bool
       - format_chat(system, user) -> str
+
+    Async (default: run the sync method in a worker thread; override with a native client):
+      - agenerate_text(prompt, **kwargs) -> str
+      - achat(messages, **kwargs) -> str
+      - aclose() -> None
+
+    Async streaming (raise NotImplementedError by default):
+      - agenerate_stream(prompt, **kwargs) -> AsyncIterator[str]
+      - achat_stream(messages, **kwargs) -> AsyncIterator[str]
     """
 
     # -------- Required API --------
@@ -64,6 +75,13 @@ class BaseLLMService(ABC):
         """
         raise NotImplementedError("Streaming is not implemented for this provider.")
 
+    def chat_stream(self, messages: List[Dict[str, str]], **kwargs) -> Iterable[str]:
+        """
+        Streaming chat. Yield assistant text chunks as they arrive.
+        Default: not implemented.
+        """
+        raise NotImplementedError("Streaming chat is not implemented for this provider.")
+
     def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """
         Multi-turn chat API.
@@ -83,6 +101,27 @@ class BaseLLMService(ABC):
         """
         return True
 
+    # -------- Async API --------
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Async single-turn generation. Default: sync generate_text in a thread."""
+        return await asyncio.to_thread(self.generate_text, prompt, **kwargs)
+
+    async def achat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Async multi-turn chat. Default: sync chat in a thread."""
+        return await asyncio.to_thread(self.chat, messages, **kwargs)
+
+    def agenerate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Async streaming generation. Default: not implemented."""
+        raise NotImplementedError("Async streaming is not implemented for this provider.")
+
+    def achat_stream(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Async streaming chat. Default: not implemented."""
+        raise NotImplementedError("Async streaming chat is not implemented for this provider.")
+
+    async def aclose(self) -> None:
+        """Release async resources (connection pools). Default: nothing to close."""
+        return None
+
     # -------- Helpers --------
     def format_chat(self, system: str, user: str) -> str:
         """
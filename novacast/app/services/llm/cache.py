@@ -0,0 +1,259 @@
+# app/services/llm/cache.py
+"""
+Content-addressed LLM response cache.
+
+Responses are keyed on a SHA-256 of (model, system prompt, rendered prompt, generation params),
+so identical requests return the stored completion instead of calling the provider again.
+
+Backends:
+- MemoryResponseCache: in-process LRU
+- SQLiteResponseCache: on-disk, shared between runs/processes on one host
+- RedisResponseCache: shared between hosts
+
+All backends support a TTL; memory and SQLite also evict least-recently-used entries
+beyond `max_entries` (Redis relies on the server's maxmemory policy for size limits).
+
+Usage:
+    cache = get_response_cache()              # configured from settings.llm_cache_*
+    text = invoke_with_cache(chain, template, llm, variables, cache, system=system_prompt)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config.settings import settings
+
+__all__ = [
+    "ResponseCache",
+    "MemoryResponseCache",
+    "SQLiteResponseCache",
+    "RedisResponseCache",
+    "make_cache_key",
+    "get_response_cache",
+    "invoke_with_cache",
+]
+
+# Generation parameters that change the completion and therefore belong in the key
+_GENERATION_PARAMS = (
+    "temperature", "top_k", "top_p", "num_predict", "num_ctx",
+    "repeat_penalty", "seed", "stop", "format", "mirostat",
+)
+
+
+def make_cache_key(model: str, system: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+    payload = json.dumps(
+        {"model": model, "system": system or "", "prompt": prompt, "params": params or {}},
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Interface for response cache backends."""
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryResponseCache(ResponseCache):
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResponseCache(ResponseCache):
+    def __init__(self, path: str, max_entries: int = 10_000, ttl: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses(accessed_at)")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.ttl is not None:
+                self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class RedisResponseCache(ResponseCache):
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl: Optional[float] = None,
+                 prefix: str = "novacast:llm:", client: Any = None):
+        if client is None:
+            import redis  # optional dependency, only needed for this backend
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str) -> None:
+        self.client.set(self.prefix + key, value, ex=int(self.ttl) if self.ttl else None)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+_cache_lock = threading.Lock()
+_cache_instance: Optional[ResponseCache] = None
+_cache_configured = False
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache built from settings.llm_cache_backend ("none" disables caching)."""
+    global _cache_instance, _cache_configured
+    with _cache_lock:
+        if _cache_configured:
+            return _cache_instance
+
+        backend = (settings.llm_cache_backend or "none").lower()
+        ttl = settings.llm_cache_ttl_seconds or None
+        if backend == "none":
+            _cache_instance = None
+        elif backend == "memory":
+            _cache_instance = MemoryResponseCache(max_entries=settings.llm_cache_max_entries, ttl=ttl)
+        elif backend == "sqlite":
+            _cache_instance = SQLiteResponseCache(
+                settings.llm_cache_path, max_entries=settings.llm_cache_max_entries, ttl=ttl
+            )
+        elif backend == "redis":
+            _cache_instance = RedisResponseCache(settings.redis_url, ttl=ttl)
+        else:
+            raise ValueError(f"Unknown LLM cache backend: {backend}")
+
+        _cache_configured = True
+        return _cache_instance
+
+
+def _model_id(llm: Any) -> str:
+    return f"{type(llm).__name__}:{getattr(llm, 'model', '')}"
+
+
+def _generation_params(llm: Any) -> Dict[str, Any]:
+    params = {name: getattr(llm, name, None) for name in _GENERATION_PARAMS}
+    return {name: value for name, value in params.items() if value is not None}
+
+
+def invoke_with_cache(
+    chain: Any,
+    template: Any,
+    llm: Any,
+    variables: Dict[str, Any],
+    cache: Optional[ResponseCache],
+    system: str = "",
+    accept: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """
+    Runs `chain.invoke(variables)` unless an identical request is already cached.
+    The key uses the rendered template, so changes to the prompt file invalidate old entries.
+    `accept` can reject responses that should not be cached (e.g. unparseable JSON).
+    """
+    if cache is None:
+        return chain.invoke(variables)
+
+    key = make_cache_key(
+        model=_model_id(llm),
+        system=system,
+        prompt=template.format(**variables),
+        params=_generation_params(llm),
+    )
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    response = chain.invoke(variables)
+    if isinstance(response, str) and (accept is None or accept(response)):
+        cache.set(key, response)
+    return response
@@ -1,92 +1,203 @@
 # app/services/llm/ollama_adapter.py
 from __future__ import annotations
 import json
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 
-from app.services.llm.base import BaseLLMService, LLMConnectionError, LLMResponseError
+from app.services.llm.base import BaseLLMService, LLMError, LLMConnectionError, LLMResponseError
 from app.config.settings import settings
-from app.utils.retry import retry_on_exception as retry
+from app.utils.retry import async_retry_on_exception, retry_on_exception as retry
+
+
+# One keep-alive connection pool per (host, pool size), shared by every adapter in the process
+_sessions: Dict[Tuple[str, int], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_shared_session(host: str, pool_size: int) -> requests.Session:
+    """Returns the process-wide pooled session for an Ollama host."""
+    key = (host, pool_size)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+        return session
 
 
 class OllamaAdapter(BaseLLMService):
     """
     Adapter for local Ollama models via HTTP API (default: http://localhost:11434).
     Implements: generate_text(), chat(), list_models(), health()
+    Async: agenerate_text(), achat() over a pooled httpx.AsyncClient (call aclose() when done).
+    Streaming: generate_stream(), chat_stream(), agenerate_stream(), achat_stream() yield
+    text chunks as Ollama emits its NDJSON lines.
+
+    Sync calls share one keep-alive requests.Session per host, so repeated generations
+    reuse TCP connections instead of opening a new one per call.
     """
 
-    def __init__(self, model_name: Optional[str] = None):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        async_client: Optional[httpx.AsyncClient] = None,
+        pool_size: Optional[int] = None,
+    ):
         self.model_name = model_name or settings.ollama_model
         self.host = settings.ollama_host.rstrip("/")
         self.timeout = settings.ollama_timeout
+        self.pool_size = pool_size or settings.ollama_pool_size
+        self.session = session or get_shared_session(self.host, self.pool_size)
+        self._async_client = async_client
         self._params = {}
 
     def set_parameters(self, **kwargs):
         """Optional: set global generation parameters (e.g., temperature)."""
         self._params.update(kwargs)
 
-    @retry(tries=3, exceptions=(requests.Timeout, requests.ConnectionError))
-    def generate_text(self, prompt: str, **kwargs) -> str:
-        """Single prompt → response via /api/generate."""
-        url = f"{self.host}/api/generate"
-        payload: Dict[str, Any] = {
-            "model": self.model_name,
-            "prompt": prompt,
-            "stream": False,
-        }
-
+    # -------- Request helpers (shared by sync + async) --------
+    def _payload(self, base: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"model": self.model_name, **base}
         # Combine default params + kwargs
         payload.update({k: v for k, v in {**self._params, **kwargs}.items() if v is not None})
+        return payload
+
+    @staticmethod
+    def _parse_generate(data: Any) -> str:
+        if not isinstance(data, dict) or "response" not in data:
+            raise LLMResponseError("Invalid response format from Ollama")
+        return data["response"].strip()
+
+    @staticmethod
+    def _parse_chat(data: Any) -> str:
+        try:
+            return data["message"]["content"].strip()
+        except (KeyError, TypeError):
+            raise LLMResponseError("Invalid chat response format")
 
+    def _post(self, path: str, payload: Dict[str, Any]) -> Any:
         try:
-            resp = requests.post(url, json=payload, timeout=self.timeout)
+            resp = self.session.post(f"{self.host}{path}", json=payload, timeout=self.timeout)
             resp.raise_for_status()
-            data = resp.json()
+            return resp.json()
         except requests.Timeout as e:
             raise LLMConnectionError(f"Ollama timeout ({self.timeout}s)") from e
         except requests.ConnectionError as e:
             raise LLMConnectionError("Cannot reach Ollama server") from e
         except requests.HTTPError as e:
             raise LLMResponseError(f"Ollama HTTP error: {e.response.status_code}") from e
+        except json.JSONDecodeError as e:
+            raise LLMResponseError("Ollama returned invalid JSON") from e
 
-        if not isinstance(data, dict) or "response" not in data:
-            raise LLMResponseError("Invalid response format from Ollama")
-
-        return data["response"].strip()
-
-    @retry(tries=3, exceptions=(requests.Timeout, requests.ConnectionError))
-    def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
-        """Chat-style multi-turn interaction via /api/chat."""
-        url = f"{self.host}/api/chat"
-        payload: Dict[str, Any] = {
-            "model": self.model_name,
-            "messages": messages,
-            "stream": False,
-        }
-        payload.update({k: v for k, v in {**self._params, **kwargs}.items() if v is not None})
+    @staticmethod
+    def _stream_chunk(line: Any, extract: Callable[[Dict[str, Any]], str]) -> Tuple[str, bool]:
+        """Parses one NDJSON line → (text chunk, done flag)."""
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise LLMResponseError("Malformed streaming chunk from Ollama") from e
+        if not isinstance(data, dict):
+            raise LLMResponseError("Malformed streaming chunk from Ollama")
+        if "error" in data:
+            raise LLMResponseError(f"Ollama stream error: {data['error']}")
+        try:
+            return extract(data) or "", bool(data.get("done"))
+        except (KeyError, TypeError) as e:
+            raise LLMResponseError("Malformed streaming chunk from Ollama") from e
 
+    def _stream(self, path: str, payload: Dict[str, Any], extract: Callable[[Dict[str, Any]], str]) -> Iterator[str]:
         try:
-            resp = requests.post(url, json=payload, timeout=self.timeout)
-            resp.raise_for_status()
-            data = resp.json()
+            with self.session.post(f"{self.host}{path}", json=payload, stream=True, timeout=self.timeout) as resp:
+                resp.raise_for_status()
+                for line in resp.iter_lines():
+                    if not line:
+                        continue
+                    chunk, done = self._stream_chunk(line, extract)
+                    if chunk:
+                        yield chunk
+                    if done:
+                        return
         except requests.Timeout as e:
-            raise LLMConnectionError("Ollama chat timeout") from e
+            raise LLMConnectionError(f"Ollama timeout ({self.timeout}s)") from e
         except requests.ConnectionError as e:
             raise LLMConnectionError("Cannot reach Ollama server") from e
         except requests.HTTPError as e:
             raise LLMResponseError(f"Ollama HTTP error: {e.response.status_code}") from e
 
+    async def _astream(
+        self, path: str, payload: Dict[str, Any], extract: Callable[[Dict[str, Any]], str]
+    ) -> AsyncIterator[str]:
         try:
-            return data["message"]["content"].strip()
-        except (KeyError, TypeError):
-            raise LLMResponseError("Invalid chat response format")
+            async with self._get_async_client().stream("POST", path, json=payload) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk, done = self._stream_chunk(line, extract)
+                    if chunk:
+                        yield chunk
+                    if done:
+                        return
+        except httpx.TimeoutException as e:
+            raise LLMConnectionError(f"Ollama timeout ({self.timeout}s)") from e
+        except httpx.TransportError as e:
+            raise LLMConnectionError("Cannot reach Ollama server") from e
+        except httpx.HTTPStatusError as e:
+            raise LLMResponseError(f"Ollama HTTP error: {e.response.status_code}") from e
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.host,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                    keepalive_expiry=settings.ollama_keepalive_expiry,
+                ),
+            )
+        return self._async_client
+
+    async def _apost(self, path: str, payload: Dict[str, Any]) -> Any:
+        try:
+            resp = await self._get_async_client().post(path, json=payload)
+            resp.raise_for_status()
+            return resp.json()
+        except httpx.TimeoutException as e:
+            raise LLMConnectionError(f"Ollama timeout ({self.timeout}s)") from e
+        except httpx.TransportError as e:
+            raise LLMConnectionError("Cannot reach Ollama server") from e
+        except httpx.HTTPStatusError as e:
+            raise LLMResponseError(f"Ollama HTTP error: {e.response.status_code}") from e
+        except json.JSONDecodeError as e:
+            raise LLMResponseError("Ollama returned invalid JSON") from e
+
+    # -------- Sync API --------
+    @retry(tries=3, exceptions=(requests.Timeout, requests.ConnectionError))
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        """Single prompt → response via /api/generate."""
+        payload = self._payload({"prompt": prompt, "stream": False}, **kwargs)
+        return self._parse_generate(self._post("/api/generate", payload))
+
+    @retry(tries=3, exceptions=(requests.Timeout, requests.ConnectionError))
+    def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Chat-style multi-turn interaction via /api/chat."""
+        payload = self._payload({"messages": messages, "stream": False}, **kwargs)
+        return self._parse_chat(self._post("/api/chat", payload))
 
     @retry(tries=3, exceptions=(requests.Timeout, requests.ConnectionError))
     def list_models(self) -> List[Dict[str, Any]]:
         """Returns the available models from /api/tags."""
         url = f"{self.host}/api/tags"
         try:
-            resp = requests.get(url, timeout=self.timeout)
+            resp = self.session.get(url, timeout=self.timeout)
             resp.raise_for_status()
             data = resp.json()
         except requests.RequestException as e:
@@ -98,6 +209,44 @@ class OllamaAdapter(BaseLLMService):
 
         return models
 
+    def generate_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Streams /api/generate, yielding text chunks as they arrive."""
+        payload = self._payload({"prompt": prompt, "stream": True}, **kwargs)
+        return self._stream("/api/generate", payload, lambda data: data.get("response"))
+
+    def chat_stream(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """Streams /api/chat, yielding assistant text chunks as they arrive."""
+        payload = self._payload({"messages": messages, "stream": True}, **kwargs)
+        return self._stream("/api/chat", payload, lambda data: (data.get("message") or {}).get("content"))
+
+    # -------- Async API --------
+    @async_retry_on_exception(tries=3, exceptions=(LLMConnectionError,))
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Async single prompt → response via /api/generate."""
+        payload = self._payload({"prompt": prompt, "stream": False}, **kwargs)
+        return self._parse_generate(await self._apost("/api/generate", payload))
+
+    @async_retry_on_exception(tries=3, exceptions=(LLMConnectionError,))
+    async def achat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Async chat-style interaction via /api/chat."""
+        payload = self._payload({"messages": messages, "stream": False}, **kwargs)
+        return self._parse_chat(await self._apost("/api/chat", payload))
+
+    def agenerate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Async streaming of /api/generate."""
+        payload = self._payload({"prompt": prompt, "stream": True}, **kwargs)
+        return self._astream("/api/generate", payload, lambda data: data.get("response"))
+
+    def achat_stream(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Async streaming of /api/chat."""
+        payload = self._payload({"messages": messages, "stream": True}, **kwargs)
+        return self._astream("/api/chat", payload, lambda data: (data.get("message") or {}).get("content"))
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
     def health(self) -> bool:
         """Returns True if models list is reachable."""
         try:
@@ -112,5 +261,6 @@ class OllamaAdapter(BaseLLMService):
             "host": self.host,
             "model_name": self.model_name,
             "timeout": self.timeout,
+            "pool_size": self.pool_size,
             "params": self._params or {},
         }
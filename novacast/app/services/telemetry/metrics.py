@@ -4,6 +4,16 @@ from prometheus_client import Counter, Histogram
 REQUEST_COUNT = Counter('request_count', 'Total number of requests processed', ['method', 'endpoint'])
 RESPONSE_TIME = Histogram('response_time', 'Response time in seconds', ['endpoint'])
 
+# TTS model registry
+TTS_MODEL_LOAD_TIME = Histogram('tts_model_load_seconds', 'Time spent loading TTS models', ['model'])
+TTS_MODEL_CACHE = Counter('tts_model_cache_total', 'TTS model registry lookups', ['result'])
+
+# Video rendering
+VIDEO_RENDER_TIME = Histogram('video_render_seconds', 'Time spent rendering videos', ['backend'])
+
+# Audio mastering
+AUDIO_MASTERING_TIME = Histogram('audio_mastering_seconds', 'Time spent mastering narration audio', ['backend'])
+
 def track_request(method: str, endpoint: str):
     """Track the number of requests received."""
     REQUEST_COUNT.labels(method=method, endpoint=endpoint).inc()
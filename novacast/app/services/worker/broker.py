@@ -0,0 +1,83 @@
+# app/services/worker/broker.py
+"""
+Dramatiq broker setup.
+
+- Redis broker (settings.redis_url) with a Redis result backend, so actor return values
+  can be fetched by job id (app/services/worker/queue.py: get_job_result)
+- JobStateMiddleware records job status transitions in `job_logs`
+- WarmUpMiddleware preloads the configured TTS models when a worker process boots (not
+  when the actors module is imported, so the API can import actors to enqueue them)
+- Separate queues: TTS goes to TTS_QUEUE, video renders to RENDER_QUEUE (both CPU-heavy)
+  and light I/O jobs (uploads, notifications) to DEFAULT_QUEUE. Each is consumed by its own
+  worker pool (app/services/worker/profiles.py), so a backlog of renders never delays
+  light jobs.
+
+settings.worker_broker = "stub" uses dramatiq's in-memory StubBroker + StubBackend
+(tests, local development without Redis).
+
+Usage:
+    broker = get_broker()   # configured once per process, before actors are declared
+"""
+
+import threading
+from typing import Optional
+
+import dramatiq
+from dramatiq.middleware import CurrentMessage, Middleware
+from dramatiq.results import Results
+
+from app.config.settings import settings
+from app.services.worker.jobs import JobStateMiddleware
+
+TTS_QUEUE = "tts"
+RENDER_QUEUE = "render"
+DEFAULT_QUEUE = "default"
+
+
+class WarmUpMiddleware(Middleware):
+    """Loads settings.tts_warmup_models once per worker process, before it consumes messages."""
+
+    def before_worker_boot(self, broker, worker):
+        from app.media.tts_models import warm_up_tts_models
+        warm_up_tts_models()
+
+
+_broker: Optional[dramatiq.Broker] = None
+_broker_lock = threading.Lock()
+
+
+def create_broker(kind: Optional[str] = None) -> dramatiq.Broker:
+    kind = (kind or settings.worker_broker).lower()
+    if kind == "stub":
+        from dramatiq.brokers.stub import StubBroker
+        from dramatiq.results.backends import StubBackend
+        broker, backend = StubBroker(), StubBackend()
+    elif kind == "redis":
+        from dramatiq.brokers.redis import RedisBroker
+        from dramatiq.results.backends import RedisBackend
+        broker, backend = RedisBroker(url=settings.redis_url), RedisBackend(url=settings.redis_url)
+    else:
+        raise ValueError(f"Unknown worker broker: {kind} (use redis or stub)")
+
+    broker.add_middleware(Results(backend=backend, result_ttl=settings.worker_result_ttl_ms))
+    broker.add_middleware(CurrentMessage())
+    broker.add_middleware(JobStateMiddleware())
+    broker.add_middleware(WarmUpMiddleware())
+    return broker
+
+
+def get_broker() -> dramatiq.Broker:
+    """Process-wide broker, also installed as dramatiq's global broker."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = create_broker()
+            dramatiq.set_broker(_broker)
+        return _broker
+
+
+def result_backend(broker: Optional[dramatiq.Broker] = None):
+    for middleware in (broker or get_broker()).middleware:
+        if isinstance(middleware, Results):
+            return middleware.backend
+    raise RuntimeError("The broker has no result backend")
@@ -0,0 +1,284 @@
+# app/services/worker/jobs.py
+"""
+Worker job state.
+
+Every enqueued job gets a deterministic id: a hash of the actor name and its arguments
+(idempotency key). Enqueuing the same work twice returns the existing job instead of
+rendering it again, and the id doubles as the broker message id, so results can be
+looked up in the result backend by job id alone.
+
+Job state lives in a JobLog document per job (`job_logs` collection) and moves through
+    queued → running → succeeded
+                     ↘ retrying → running ...   ↘ failed (→ queued when re-enqueued)
+Transitions are recorded by JobStateMiddleware around every message the worker processes,
+so actors themselves don't deal with bookkeeping. Multi-stage actors additionally report
+the stage they are in (JobLog.progress, see report_progress) for progress streams.
+
+Stores:
+- MemoryJobStateStore: in-process (tests, single-process development)
+- MongoJobStateStore: documents in a (sync, pymongo) collection such as `job_logs`,
+  updated with conditional writes so concurrent workers can't apply a stale transition
+
+Usage:
+    job_id = job_id_for("render_tts", {"text": "Hello"})
+    store = get_job_state_store()
+    store.create(JobLog(job_id=job_id, job_name="render_tts", status="queued", ...))
+    store.transition(job_id, "running")
+"""
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from dramatiq.middleware import Middleware, SkipMessage
+
+from app.config.settings import settings
+from app.core.checkpoints import checkpoint_key
+from app.db.models.job_log import JobLog, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Allowed status changes: target status → statuses it can be reached from
+TRANSITIONS: Dict[str, tuple] = {
+    "queued": ("failed",),
+    "running": ("queued", "retrying"),
+    "retrying": ("running",),
+    "succeeded": ("running",),
+    "failed": ("queued", "running", "retrying"),
+}
+
+
+# Statuses after which a job's state no longer changes on its own
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+class InvalidTransition(ValueError):
+    """Raised when a job is moved to a status it cannot reach from its current one."""
+
+
+def job_id_for(actor_name: str, kwargs: Dict[str, Any]) -> str:
+    """Same actor + same arguments → same job id (content-addressed, like checkpoints)."""
+    return checkpoint_key(actor_name, kwargs)[:32]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _event(status: str, error: Optional[str] = None) -> Dict[str, Any]:
+    event = {"status": status, "at": _now()}
+    if error:
+        event["error"] = error
+    return event
+
+
+class JobStateStore:
+    def create(self, job: JobLog) -> Optional[JobLog]:
+        """Inserts the job unless its id exists; returns the existing job in that case."""
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def get(self, job_id: str) -> Optional[JobLog]:
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def transition(self, job_id: str, status: JobStatus, **fields: Any) -> JobLog:
+        """Moves the job to `status` (raises InvalidTransition) and sets `fields`."""
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def set_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        """Records the stage a running job is in (no status change)."""
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+
+def _apply(job: JobLog, status: str, fields: Dict[str, Any]) -> JobLog:
+    if job.status not in TRANSITIONS[status]:
+        raise InvalidTransition(f"Job {job.job_id}: {job.status} → {status} is not allowed")
+    now = _now()
+    update = {**fields, "status": status, "updated_at": now}
+    if status == "running":
+        update["attempts"] = job.attempts + 1
+    if status in ("succeeded", "failed"):
+        update["end_time"] = now
+    return job.model_copy(update={**update, "history": job.history + [_event(status, fields.get("error_message"))]})
+
+
+class MemoryJobStateStore(JobStateStore):
+    def __init__(self):
+        self._jobs: Dict[str, JobLog] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: JobLog) -> Optional[JobLog]:
+        with self._lock:
+            existing = self._jobs.get(job.job_id)
+            if existing is not None:
+                return existing
+            self._jobs[job.job_id] = job.model_copy(update={"history": [_event(job.status)]})
+            return None
+
+    def get(self, job_id: str) -> Optional[JobLog]:
+        return self._jobs.get(job_id)
+
+    def transition(self, job_id: str, status: JobStatus, **fields: Any) -> JobLog:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise KeyError(f"Unknown job: {job_id}")
+            self._jobs[job_id] = _apply(job, status, fields)
+            return self._jobs[job_id]
+
+    def set_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise KeyError(f"Unknown job: {job_id}")
+            self._jobs[job_id] = job.model_copy(update={"progress": progress, "updated_at": _now()})
+
+
+class MongoJobStateStore(JobStateStore):
+    """
+    Stores jobs as documents in a pymongo collection (e.g. `db.job_logs`), tagged with
+    `kind: "job"` so they can share the collection with checkpoints.
+    """
+
+    def __init__(self, collection: Any):
+        self.collection = collection
+
+    @staticmethod
+    def _doc_id(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    def create(self, job: JobLog) -> Optional[JobLog]:
+        from pymongo.errors import DuplicateKeyError
+
+        doc = job.model_copy(update={"history": [_event(job.status)]}).model_dump(exclude={"id"})
+        try:
+            self.collection.insert_one({"_id": self._doc_id(job.job_id), "kind": "job", **doc})
+            return None
+        except DuplicateKeyError:
+            return self.get(job.job_id)
+
+    def get(self, job_id: str) -> Optional[JobLog]:
+        doc = self.collection.find_one({"_id": self._doc_id(job_id)})
+        if doc is None:
+            return None
+        doc.pop("_id", None)
+        doc.pop("kind", None)
+        return JobLog(**doc)
+
+    def transition(self, job_id: str, status: JobStatus, **fields: Any) -> JobLog:
+        from pymongo import ReturnDocument
+
+        now = _now()
+        update: Dict[str, Any] = {
+            "$set": {**fields, "status": status, "updated_at": now},
+            "$push": {"history": _event(status, fields.get("error_message"))},
+        }
+        if status == "running":
+            update["$inc"] = {"attempts": 1}
+        if status in ("succeeded", "failed"):
+            update["$set"]["end_time"] = now
+
+        # Conditional on the current status: a concurrent worker can't apply a stale transition
+        doc = self.collection.find_one_and_update(
+            {"_id": self._doc_id(job_id), "status": {"$in": list(TRANSITIONS[status])}},
+            update,
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is None:
+            current = self.get(job_id)
+            if current is None:
+                raise KeyError(f"Unknown job: {job_id}")
+            raise InvalidTransition(f"Job {job_id}: {current.status} → {status} is not allowed")
+        doc.pop("_id", None)
+        doc.pop("kind", None)
+        return JobLog(**doc)
+
+    def set_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        result = self.collection.update_one(
+            {"_id": self._doc_id(job_id)}, {"$set": {"progress": progress, "updated_at": _now()}},
+        )
+        if result.matched_count == 0:
+            raise KeyError(f"Unknown job: {job_id}")
+
+
+class JobStateMiddleware(Middleware):
+    """
+    Records job status transitions around message processing. A raising actor leaves the
+    job "retrying"; once the Retries middleware gives up the message is rejected (nack)
+    and the job becomes "failed". Messages of jobs that already succeeded (e.g. redelivered
+    after a worker crash) are skipped.
+    """
+
+    def __init__(self, store: Optional[JobStateStore] = None):
+        self._store = store
+
+    @property
+    def store(self) -> JobStateStore:
+        return self._store or get_job_state_store()
+
+    def before_process_message(self, broker, message):
+        job = self.store.get(message.message_id)
+        if job is None:
+            return  # not enqueued through app.services.worker.queue
+        if job.status == "succeeded":
+            logger.info(f"⏭️ Job {message.message_id} already succeeded, skipping redelivery")
+            raise SkipMessage()
+        self._transition(message.message_id, "running")
+
+    def after_process_message(self, broker, message, *, result=None, exception=None):
+        if self.store.get(message.message_id) is None:
+            return
+        if exception is None:
+            self._transition(message.message_id, "succeeded", result=result, error_message=None)
+        else:
+            error = f"{exception.__class__.__name__}: {exception}"
+            self._transition(message.message_id, "retrying", error_message=error)
+
+    def after_nack(self, broker, message):
+        # Retries exhausted (or the message was rejected outright)
+        job = self.store.get(message.message_id)
+        if job is not None and job.status != "failed":
+            self._transition(message.message_id, "failed", error_message=job.error_message)
+
+    def _transition(self, job_id: str, status: JobStatus, **fields: Any) -> None:
+        try:
+            self.store.transition(job_id, status, **fields)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to record job {job_id} → {status}: {e}")
+
+
+def report_progress(job_id: str, stage: str, step: int, steps: int) -> None:
+    """Records that job `job_id` entered `stage` (step `step` of `steps`); never raises."""
+    try:
+        get_job_state_store().set_progress(job_id, {"stage": stage, "step": step, "steps": steps})
+    except KeyError:
+        pass  # not enqueued through app.services.worker.queue
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to record progress of job {job_id}: {e}")
+
+
+_store: Optional[JobStateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_job_state_store() -> JobStateStore:
+    """
+    Process-wide store: the `job_logs` collection of settings.db_url, or an in-memory
+    store (single process only) when no database is configured.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            if settings.db_url:
+                from app.db.connection import get_sync_database
+                _store = MongoJobStateStore(get_sync_database()["job_logs"])
+            else:
+                logger.warning("⚠️ DB_URL not set: job state is kept in memory (single process only)")
+                _store = MemoryJobStateStore()
+        return _store
+
+
+def set_job_state_store(store: Optional[JobStateStore]) -> None:
+    global _store
+    with _store_lock:
+        _store = store
@@ -0,0 +1,94 @@
+# app/services/worker/profiles.py
+"""
+Worker profiles: which queues a worker pool consumes and how it is sized.
+
+TTS and video renders are CPU-bound and hold the GIL, so they run in worker *processes*
+(one thread each) sized to the CPU cores; uploads and notifications mostly wait on the
+network, so one process with many threads serves them. Each profile consumes its own
+queues, so a slow render never sits in front of cheap I/O jobs.
+
+- tts:    render_tts      (TTS_QUEUE)    processes = cores, 1 thread
+- render: render_video, process_media (RENDER_QUEUE) processes = cores, 1 thread
+- io:     upload_content, send_notification (DEFAULT_QUEUE) 1 process, many threads
+
+CPU profiles prefetch a single message per process, so idle processes pick up the next
+render instead of it waiting behind a busy one. TTS processes split the sentence pool
+(settings.tts_segment_workers) between them to avoid oversubscribing the cores; render
+processes don't synthesize (process_media queues its narration as a render_tts job).
+
+All sizes come from settings.worker_* (0 = number of cores).
+
+Usage:
+    for profile in get_worker_profiles(["render", "io"]):
+        subprocess.Popen(profile.command(), env={**os.environ, **profile.env})
+    # or: python scripts/run_workers.py render io
+"""
+
+import os
+import sys
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.config.settings import settings
+from app.services.worker.broker import DEFAULT_QUEUE, RENDER_QUEUE, TTS_QUEUE
+
+ACTORS_MODULE = "app.services.worker.tasks"
+
+
+class WorkerProfile(BaseModel):
+    name: str
+    queues: List[str]
+    processes: int = Field(gt=0)
+    threads: int = Field(gt=0)
+    env: Dict[str, str] = Field(default_factory=dict)
+
+    def command(self, python: Optional[str] = None) -> List[str]:
+        """`dramatiq` CLI invocation for this pool."""
+        return [
+            python or sys.executable, "-m", "dramatiq", ACTORS_MODULE,
+            "--processes", str(self.processes),
+            "--threads", str(self.threads),
+            "--queues", *self.queues,
+        ]
+
+
+def _cores() -> int:
+    return os.cpu_count() or 1
+
+
+def get_worker_profiles(names: Optional[List[str]] = None) -> List[WorkerProfile]:
+    """Profiles from settings, in the order given (default: all)."""
+    cores = _cores()
+    tts_processes = settings.worker_tts_processes or cores
+    segment_workers = settings.tts_segment_workers or max(1, cores // tts_processes)
+    profiles = {
+        "tts": WorkerProfile(
+            name="tts",
+            queues=[TTS_QUEUE],
+            processes=tts_processes,
+            threads=1,
+            env={"dramatiq_queue_prefetch": "1", "TTS_SEGMENT_WORKERS": str(segment_workers)},
+        ),
+        "render": WorkerProfile(
+            name="render",
+            queues=[RENDER_QUEUE],
+            processes=settings.worker_render_processes or cores,
+            threads=1,
+            # Narration is queued on TTS_QUEUE; should a render process ever synthesize
+            # inline, it must not start a per-core sentence pool of its own
+            env={"dramatiq_queue_prefetch": "1", "TTS_SEGMENT_WORKERS": "1"},
+        ),
+        "io": WorkerProfile(
+            name="io",
+            queues=[DEFAULT_QUEUE],
+            processes=settings.worker_io_processes or 1,
+            threads=settings.worker_io_threads,
+        ),
+    }
+    if names is None:
+        return list(profiles.values())
+    unknown = [name for name in names if name not in profiles]
+    if unknown:
+        raise ValueError(f"Unknown worker profile(s): {', '.join(unknown)} (available: {', '.join(profiles)})")
+    return [profiles[name] for name in names]
@@ -1,17 +1,100 @@
-from dramatiq import actor
+# app/services/worker/queue.py
+"""
+Job submission and status.
+
+- enqueue: sends an actor message under a deterministic job id (idempotency key) and
+  records the job as queued in `job_logs`; re-submitting the same work returns the
+  existing job unless it failed, in which case it is queued again
+- get_job_status: the job's JobLog (status, attempts, history, result, error) or None
+- get_job_result: the actor's return value from the result backend, once the job finished
+
+Usage:
+    from app.services.worker.tasks import render_tts
+    job_id = enqueue(render_tts, text="Hello world")
+    get_job_status(job_id).status   # "queued" → "running" → "succeeded"
+"""
+
+import logging
 import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import dramatiq
+from dramatiq.results import ResultMissing
 
-@actor
-def process_job(job_id, data):
-    # Simulate job processing
-    time.sleep(2)  # Simulate a time-consuming task
-    return f"Job {job_id} processed with data: {data}"
+from app.config.settings import settings
+from app.db.models.job_log import JobLog
+from app.services.worker.broker import get_broker, result_backend
+from app.services.worker.jobs import TERMINAL_STATUSES, get_job_state_store, job_id_for
 
-def enqueue_job(data):
-    job_id = str(time.time())  # Simple job ID based on current time
-    process_job.send(job_id, data)
+logger = logging.getLogger(__name__)
+
+
+def enqueue(actor: dramatiq.Actor, **kwargs: Any) -> str:
+    """Submits `actor(**kwargs)` once; returns the job id."""
+    job_id = job_id_for(actor.actor_name, kwargs)
+    store = get_job_state_store()
+    existing = store.create(JobLog(
+        job_id=job_id,
+        job_name=actor.actor_name,
+        queue=actor.queue_name,
+        status="queued",
+        start_time=datetime.now(timezone.utc),
+    ))
+    if existing is not None:
+        if existing.status != "failed":
+            logger.info(f"🔁 Job {job_id} ({actor.actor_name}) already {existing.status}")
+            return job_id
+        store.transition(job_id, "queued", error_message=None)
+
+    message = dramatiq.Message(
+        queue_name=actor.queue_name,
+        actor_name=actor.actor_name,
+        args=(),
+        kwargs=kwargs,
+        options={},
+        message_id=job_id,
+    )
+    actor.broker.enqueue(message)
+    logger.info(f"📨 Enqueued {actor.actor_name} as job {job_id} on '{actor.queue_name}'")
     return job_id
 
-def get_job_status(job_id):
-    # Placeholder for job status retrieval logic
-    return "Job status is not implemented yet."
\ No newline at end of file
+
+def enqueue_job(actor_name: str, **kwargs: Any) -> str:
+    """enqueue() by actor name, e.g. enqueue_job("render_video", audio_file=...)."""
+    return enqueue(get_broker().get_actor(actor_name), **kwargs)
+
+
+def get_job_status(job_id: str) -> Optional[JobLog]:
+    return get_job_state_store().get(job_id)
+
+
+def get_job_result(job_id: str, block: bool = False, timeout: Optional[int] = None) -> Optional[Any]:
+    """
+    The actor's return value, or None while it is not available (`block` waits up to
+    `timeout` ms). Raises dramatiq's ResultFailure when the job failed.
+
+    The result backend keeps a failed run's exception under the job id after the job is
+    re-queued, so it is only read once the job store shows the job finished.
+    """
+    job = _wait_until_finished(job_id, timeout) if block else get_job_status(job_id)
+    if job is None or job.status not in TERMINAL_STATUSES:
+        return None
+    message = dramatiq.Message(
+        queue_name=job.queue, actor_name=job.job_name, args=(), kwargs={}, options={}, message_id=job_id,
+    )
+    try:
+        return result_backend().get_result(message)
+    except ResultMissing:
+        return None
+
+
+def _wait_until_finished(job_id: str, timeout: Optional[int]) -> Optional[JobLog]:
+    deadline = time.monotonic() + timeout / 1000 if timeout is not None else None
+    while True:
+        job = get_job_status(job_id)
+        if job is None or job.status in TERMINAL_STATUSES:
+            return job
+        if deadline is not None and time.monotonic() >= deadline:
+            return job
+        time.sleep(settings.worker_job_poll_interval)
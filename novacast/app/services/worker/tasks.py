@@ -1,21 +1,216 @@
+# app/services/worker/tasks.py
+"""
+Worker actors.
+
+CPU-heavy actors (render_tts, render_video, process_media) consume TTS_QUEUE /
+RENDER_QUEUE, light I/O actors DEFAULT_QUEUE, see app/services/worker/broker.py;
+app/services/worker/profiles.py sizes a worker pool per queue. process_media hands its
+narration to render_tts as a job of its own, so TTS only ever runs in the tts pool.
+Enqueue them through
+app/services/worker/queue.py: enqueue() gives every job a deterministic id, creates its
+job_logs entry and returns the existing job when the same work was already submitted.
+
+Actors return JSON-serializable results (stored in the result backend and on the job);
+outputs are written to the job's artifact directory (output/jobs/<job_id>/).
+
+Usage (worker):
+    python scripts/run_workers.py          # all profiles
+    dramatiq app.services.worker.tasks --queues render
+"""
+
+import logging
+import os
+import shutil
+from typing import Any, Dict, Optional
+
+import requests
 from dramatiq import actor
+from dramatiq.middleware import CurrentMessage
+
+from app.config.settings import settings
+from app.media.artifacts import atomic_output, get_artifact_allocator, new_job_id
+from app.services.worker.broker import DEFAULT_QUEUE, RENDER_QUEUE, TTS_QUEUE, get_broker
+from app.services.worker.jobs import report_progress
+from app.services.worker.queue import enqueue, get_job_result, get_job_status
+
+logger = logging.getLogger(__name__)
+
+# Actors bind to the global broker when they are declared, so configure it first.
+# TTS models are preloaded at worker boot (WarmUpMiddleware), not on import.
+broker = get_broker()
+
+
+def _current_job_id() -> str:
+    message = CurrentMessage.get_current_message()
+    return message.message_id if message is not None else new_job_id()
+
+
+@actor(
+    queue_name=TTS_QUEUE, store_results=True,
+    max_retries=settings.worker_max_retries, time_limit=settings.worker_render_time_limit_ms,
+)
+def render_tts(text: str, voice: Optional[str] = None, engine: str = "coqui") -> Dict[str, Any]:
+    """Synthesizes narration (with its caption sidecar) into the job's directory."""
+    from app.media.subtitles import write_sidecar
+    from app.media.tts_engine import TTSEngine
+
+    audio_path = get_artifact_allocator().allocate(f"audio_{engine}", ".wav", _current_job_id())
+    tts = TTSEngine()
+    if voice:
+        tts._adapter(engine).voice = voice
+    synthesis = tts.synthesize_segmented(engine, text, output_path=audio_path)
+    return {
+        "audio_path": synthesis.audio_path,
+        "subtitles_path": write_sidecar(synthesis.segments, synthesis.audio_path),
+        "duration": synthesis.duration,
+    }
+
+
+@actor(
+    queue_name=RENDER_QUEUE, store_results=True,
+    max_retries=settings.worker_max_retries, time_limit=settings.worker_render_time_limit_ms,
+)
+def render_video(
+    audio_file: str,
+    video_template: Optional[str] = None,
+    script: Optional[str] = None,
+    profile: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Renders the final video: over `video_template` when given, otherwise from the script
+    text (background search + overlay/captions) in the given render profile.
+    """
+    from app.media.subtitles import find_sidecar
+    from app.media.video_builder import VideoBuilder, build_media_clip_with_context
+
+    job_id = _current_job_id()
+    if video_template:
+        video_path = VideoBuilder(video_template, job_id).build_video(audio_file)
+    else:
+        video_path = build_media_clip_with_context(
+            audio_file,
+            script or "",
+            output_path=get_artifact_allocator().allocate("final_video", ".mp4", job_id),
+            profile=profile,
+            subtitles_path=find_sidecar(audio_file),
+        )
+    if not video_path:
+        raise RuntimeError("Video rendering failed")
+    return {"video_path": video_path}
+
+
+@actor(
+    queue_name=RENDER_QUEUE, store_results=True,
+    max_retries=settings.worker_max_retries, time_limit=settings.worker_render_time_limit_ms,
+)
+def process_media(
+    script: str,
+    voice: Optional[str] = None,
+    engine: str = "coqui",
+    profile: Optional[str] = None,
+    publish_target: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Script → narration → mastered audio → video (→ published to the configured
+    `publish_target`) as one job, the backend of POST /api/v1/media. Each stage is
+    reported as the job's progress; the narration is synthesized by a render_tts job on
+    TTS_QUEUE that this job waits for.
+    """
+    from app.media.audio_mastering import master_narration
+    from app.media.subtitles import find_sidecar
+    from app.media.video_builder import build_media_clip_with_context
+
+    destination = resolve_publish_target(publish_target) if publish_target else None
+    job_id = _current_job_id()
+    stages = ["tts", "mastering", "video"] + (["publish"] if destination else [])
+    artifacts = get_artifact_allocator()
+
+    # Narration is its own job on TTS_QUEUE: synthesis runs in the tts pool, sized for it,
+    # never in a render process, and identical narration is shared between media jobs
+    report_progress(job_id, "tts", 1, len(stages))
+    narration = _await_job(enqueue(render_tts, text=script, voice=voice, engine=engine))
+
+    report_progress(job_id, "mastering", 2, len(stages))
+    audio_path = master_narration(
+        narration["audio_path"], output_path=artifacts.allocate("audio_master", ".wav", job_id),
+    )
+
+    report_progress(job_id, "video", 3, len(stages))
+    video_path = build_media_clip_with_context(
+        audio_path,
+        script,
+        output_path=artifacts.allocate("final_video", ".mp4", job_id),
+        profile=profile,
+        subtitles_path=find_sidecar(audio_path),
+    )
+    if not video_path:
+        raise RuntimeError("Video rendering failed")
+
+    result = {"audio_path": audio_path, "video_path": video_path, "duration": narration["duration"]}
+    if destination:
+        report_progress(job_id, "publish", 4, len(stages))
+        result["published"] = upload_content(video_path, destination)
+    return result
+
+
+def _await_job(job_id: str) -> Dict[str, Any]:
+    """Result of a sub-job, waiting up to the render time limit; raises when it failed."""
+    result = get_job_result(job_id, block=True, timeout=settings.worker_render_time_limit_ms)
+    if result is None:
+        job = get_job_status(job_id)  # succeeded earlier, result expired from the backend
+        result = job.result if job is not None and job.status == "succeeded" else None
+    if result is None:
+        raise RuntimeError(f"Job {job_id} produced no result")
+    return result
+
+
+def publish_targets() -> Dict[str, str]:
+    """settings.publish_targets as {name: destination}."""
+    targets = {}
+    for entry in settings.publish_targets.split(","):
+        name, _, destination = entry.partition("=")
+        if name.strip() and destination.strip():
+            targets[name.strip()] = destination.strip()
+    return targets
+
+
+def resolve_publish_target(name: str) -> str:
+    """Destination of a configured publish target; requests never choose a path or URL."""
+    targets = publish_targets()
+    if name not in targets:
+        raise ValueError(f"Unknown publish target: {name}")
+    return targets[name]
+
+
+@actor(queue_name=DEFAULT_QUEUE, store_results=True, max_retries=settings.worker_max_retries)
+def upload_content(content: str, destination: str) -> Dict[str, Any]:
+    """
+    Publishes a file: HTTP(S) destinations receive a PUT of the file, anything else is
+    treated as a directory the file is copied into (atomically).
+    """
+    if destination.startswith(("http://", "https://")):
+        with open(content, "rb") as f:
+            response = requests.put(destination, data=f, timeout=settings.worker_http_timeout)
+        response.raise_for_status()
+        return {"url": destination, "status_code": response.status_code}
+
+    os.makedirs(destination, exist_ok=True)
+    target = os.path.join(destination, os.path.basename(content))
+    with atomic_output(target) as tmp_path:
+        shutil.copyfile(content, tmp_path)
+    return {"path": target}
+
 
-@actor
-def render_tts(task_id, text, voice):
-    # Logic to render text-to-speech
-    pass
-
-@actor
-def render_video(task_id, audio_file, video_template):
-    # Logic to render video from audio and template
-    pass
-
-@actor
-def upload_content(task_id, content, destination):
-    # Logic to upload content to a specified destination
-    pass
-
-@actor
-def send_notification(task_id, message, user_id):
-    # Logic to send a notification to a user
-    pass
\ No newline at end of file
+@actor(queue_name=DEFAULT_QUEUE, store_results=True, max_retries=settings.worker_max_retries)
+def send_notification(message: str, user_id: str) -> Dict[str, Any]:
+    """Posts the notification to settings.notification_webhook_url (logged only when unset)."""
+    if not settings.notification_webhook_url:
+        logger.info(f"🔔 Notification for {user_id}: {message}")
+        return {"delivered": False}
+    response = requests.post(
+        settings.notification_webhook_url,
+        json={"user_id": user_id, "message": message},
+        timeout=settings.worker_http_timeout,
+    )
+    response.raise_for_status()
+    return {"delivered": True}
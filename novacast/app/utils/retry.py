@@ -1,5 +1,7 @@
 # app/utils/retry.py
 from time import sleep
+import asyncio
+import functools
 import random
 
 def retry_with_exponential_backoff(func, max_retries=5, base_delay=1, max_delay=60):
@@ -36,3 +38,19 @@ def retry_on_exception(tries=3, exceptions=(Exception,), base_delay=1, max_delay
             )
         return wrapper
     return decorator
+
+def async_retry_on_exception(tries=3, exceptions=(Exception,), base_delay=1, max_delay=60):
+    """Async twin of retry_on_exception; only the given exception types are retried."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(tries):
+                try:
+                    return await func(*args, **kwargs)
+                except exceptions:
+                    if attempt >= tries - 1:
+                        raise
+                    delay = min(base_delay * (2 ** attempt) + random.uniform(0, 1), max_delay)
+                    await asyncio.sleep(delay)
+        return wrapper
+    return decorator
@@ -0,0 +1,67 @@
+# novacast/scripts/run_workers.py
+"""
+Starts one dramatiq worker pool per worker profile (app/services/worker/profiles.py):
+CPU-bound TTS/render pools as processes sized to the cores, the I/O pool as threads.
+
+    python scripts/run_workers.py                 # tts + render + io
+    python scripts/run_workers.py render io       # selected profiles
+    python scripts/run_workers.py --dry-run       # print the commands only
+
+Stops all pools when one exits or on Ctrl+C / SIGTERM.
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.worker.profiles import get_worker_profiles
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def run_workers(names=None, dry_run=False) -> int:
+    profiles = get_worker_profiles(names or None)
+    if dry_run:
+        for profile in profiles:
+            env = [f"{key}={value}" for key, value in profile.env.items()]
+            print(f"[{profile.name}]", " ".join(env + profile.command()))
+        return 0
+
+    pools = {}
+    for profile in profiles:
+        print(f"👷 Starting '{profile.name}' pool: {profile.processes} process(es) x {profile.threads} thread(s) "
+              f"on {', '.join(profile.queues)}")
+        pools[profile.name] = subprocess.Popen(
+            profile.command(), cwd=PROJECT_ROOT, env={**os.environ, **profile.env},
+        )
+
+    def stop(*_):
+        for process in pools.values():
+            if process.poll() is None:
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        while all(process.poll() is None for process in pools.values()):
+            time.sleep(1)
+        exited = [name for name, process in pools.items() if process.poll() is not None]
+        print(f"[⚠️] Worker pool(s) exited: {', '.join(exited)}; stopping the rest")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop()
+        for process in pools.values():
+            process.wait()
+    return max((process.returncode or 0) for process in pools.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run NovaCast worker pools")
+    parser.add_argument("profiles", nargs="*", help="tts, render, io (default: all)")
+    parser.add_argument("--dry-run", action="store_true", help="print the worker commands and exit")
+    args = parser.parse_args()
+    sys.exit(run_workers(args.profiles, args.dry_run))
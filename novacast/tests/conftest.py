@@ -0,0 +1,61 @@
+# tests/conftest.py
+
+import wave
+
+import dramatiq
+import pytest
+
+from app.media import render_index
+from app.services.worker import broker as worker_broker
+from app.services.worker import jobs, tasks
+from app.services.worker.jobs import MemoryJobStateStore
+
+
+@pytest.fixture(autouse=True)
+def isolated_render_index(tmp_path_factory, monkeypatch):
+    """Every test gets an empty render index, so renders are never reused across tests."""
+    index = render_index.LocalRenderIndex(str(tmp_path_factory.mktemp("renders")))
+    monkeypatch.setattr(render_index, "_deduplicator", render_index.RenderDeduplicator(index))
+    return index
+
+
+@pytest.fixture
+def write_silence():
+    """write_silence(path, seconds=0.5) writes a mono 16-bit silent WAV and returns its path."""
+    def write(path, seconds=0.5, rate=16000):
+        with wave.open(str(path), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(rate)
+            f.writeframes(b"\x00\x00" * int(rate * seconds))
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def stub_broker(monkeypatch):
+    """In-memory broker + result backend + job store, with the app's actors declared on it."""
+    broker = worker_broker.create_broker("stub")
+    monkeypatch.setattr(worker_broker, "_broker", broker)
+    monkeypatch.setattr(jobs, "_store", MemoryJobStateStore())
+    dramatiq.set_broker(broker)
+    for actor in (tasks.render_tts, tasks.render_video, tasks.process_media, tasks.upload_content, tasks.send_notification):
+        monkeypatch.setattr(actor, "broker", broker)
+        broker.declare_actor(actor)
+    yield broker
+    broker.close()
+
+
+@pytest.fixture
+def run_worker():
+    """run_worker(broker) processes every queued message (retries included), then stops."""
+    def run(broker):
+        worker = dramatiq.Worker(broker, worker_timeout=50)
+        worker.start()
+        try:
+            for queue in list(broker.queues):
+                broker.join(queue, fail_fast=False)
+            worker.join()
+        finally:
+            worker.stop()
+    return run
@@ -0,0 +1,86 @@
+# tests/core/test_checkpoints.py
+
+import sys
+import types
+
+import pytest
+from app.config.settings import settings
+from app.core import checkpoints
+from app.core.checkpoints import LocalCheckpointStore, checkpoint_key
+from app.core.orchestrator import Orchestrator
+import app.media.video_builder as video_builder
+
+
+def test_checkpoint_key_is_stable_and_input_sensitive():
+    assert checkpoint_key("stage", {"a": 1, "b": 2}) == checkpoint_key("stage", {"b": 2, "a": 1})
+    assert checkpoint_key("stage", {"a": 1}) != checkpoint_key("stage", {"a": 2})
+    assert checkpoint_key("stage", {"a": 1}) != checkpoint_key("other", {"a": 1})
+
+
+def test_local_store_round_trip(tmp_path):
+    store = LocalCheckpointStore(root=str(tmp_path))
+    assert store.load("missing") is None
+
+    store.save("k", {"name": "generate_idea", "output": "idea"})
+    assert store.load("k")["output"] == "idea"
+
+    store.delete("k")
+    assert store.load("k") is None
+
+
+def test_default_store_comes_from_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoints, "_store", None)
+    monkeypatch.setattr(settings, "db_url", None)
+    monkeypatch.setattr(settings, "pipeline_checkpoints_enabled", False)
+    assert Orchestrator().checkpoint_store is None
+
+    monkeypatch.setattr(settings, "pipeline_checkpoints_enabled", True)
+    monkeypatch.setattr(settings, "pipeline_checkpoint_dir", str(tmp_path))
+    store = Orchestrator().checkpoint_store
+    assert isinstance(store, LocalCheckpointStore) and store.root == str(tmp_path)
+
+
+def test_rerun_resumes_from_first_missing_stage(tmp_path, monkeypatch):
+    calls = {"idea": 0, "tts": 0, "video": 0}
+    audio_file = tmp_path / "audio.wav"
+    video_file = tmp_path / "video.mp4"
+
+    orchestrator = Orchestrator(checkpoint_store=LocalCheckpointStore(root=str(tmp_path / "ckpt")))
+
+    def fake_idea(user_input):
+        calls["idea"] += 1
+        return {"idea": "an idea"}
+
+    class FakeTTSEngine:
+        def synthesize_segmented(self, engine, text, output_path=None):
+            calls["tts"] += 1
+            audio_file.write_bytes(b"RIFF")
+            return types.SimpleNamespace(audio_path=str(audio_file), segments=[])
+
+    def fake_video(audio_path, script, image_path=None, output_path=None, subtitles_path=None):
+        calls["video"] += 1
+        if calls["video"] == 1:
+            raise RuntimeError("render failed")
+        video_file.write_bytes(b"mp4")
+        return str(video_file)
+
+    monkeypatch.setattr(orchestrator.ideation_agent, "run", fake_idea)
+    monkeypatch.setattr(
+        orchestrator.outline_agent, "run",
+        lambda data: orchestrator.outline_agent.basic_outline(topic=data.topic),
+    )
+    monkeypatch.setitem(sys.modules, "app.media.tts_engine", types.SimpleNamespace(TTSEngine=FakeTTSEngine))
+    monkeypatch.setattr(video_builder, "fetch_background_image", lambda text: None)
+    monkeypatch.setattr(video_builder, "build_media_clip_with_context", fake_video)
+
+    with pytest.raises(RuntimeError, match="render failed"):
+        orchestrator.run_pipeline({"topic": "checkpoints"})
+
+    orchestrator.clear_tasks()
+    result = orchestrator.run_pipeline({"topic": "checkpoints"})
+
+    assert result["video_path"] == str(video_file)
+    assert calls == {"idea": 1, "tts": 1, "video": 2}
+    resumed = {t["name"] for t in orchestrator.tasks if t.get("resumed")}
+    assert resumed == {"generate_idea", "generate_outline", "generate_script", "tts_synthesis", "audio_mastering"}
+    assert result["outline"][0].heading == "Introduction"
@@ -0,0 +1,79 @@
+# tests/core/test_orchestrator_batch.py
+
+import threading
+
+import pytest
+from app.agents.types import OutlineAgentResult, OutlineSection
+from app.core.orchestrator import Orchestrator
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    orchestrator = Orchestrator()
+
+    def fake_idea(user_input):
+        if user_input["topic"] == "broken":
+            raise RuntimeError("LLM unavailable")
+        return {"idea": f"idea about {user_input['topic']}"}
+
+    monkeypatch.setattr(orchestrator.ideation_agent, "run", fake_idea)
+    monkeypatch.setattr(
+        orchestrator.outline_agent, "run",
+        lambda data: orchestrator.outline_agent.basic_outline(topic=data.topic),
+    )
+    return orchestrator
+
+
+def test_run_batch_collects_results_and_failures(orchestrator, monkeypatch):
+    def fake_media(script):
+        if "oceans" in script:
+            raise RuntimeError("ffmpeg crashed")
+        return {"tts_synthesis": "audio.wav", "background_search": None, "video_generation": "video.mp4"}
+
+    monkeypatch.setattr(orchestrator, "_run_media_stages", fake_media)
+    monkeypatch.setattr(
+        orchestrator.outline_agent, "run",
+        lambda data: OutlineAgentResult(
+            title=data.topic, language="en", audience="general", platform="youtube_short",
+            sections=[OutlineSection(heading=data.idea, bullets=["point"])], cta="Subscribe",
+        ),
+    )
+
+    inputs = [{"topic": "space"}, {"topic": "broken"}, {"topic": "oceans"}]
+    outcomes = orchestrator.run_batch(inputs, max_llm_concurrency=2, max_render_workers=1)
+
+    assert [o["index"] for o in outcomes] == [0, 1, 2]
+    assert outcomes[0]["status"] == "completed"
+    assert outcomes[0]["result"]["idea"] == "idea about space"
+    assert outcomes[0]["result"]["video_path"] == "video.mp4"
+    assert outcomes[1] == {
+        "index": 1, "status": "failed", "stage": "content", "error": "RuntimeError: LLM unavailable",
+    }
+    assert outcomes[2]["status"] == "failed"
+    assert outcomes[2]["stage"] == "media"
+
+
+def test_run_batch_overlaps_llm_with_rendering(orchestrator, monkeypatch):
+    first_render_started = threading.Event()
+    second_script_done = threading.Event()
+
+    def fake_script(prompt):
+        if first_render_started.is_set():
+            second_script_done.set()
+        return prompt
+
+    def fake_media(script):
+        if not first_render_started.is_set():
+            first_render_started.set()
+            # Rendering of item 0 only finishes once item 1's LLM stages ran alongside it
+            assert second_script_done.wait(timeout=5)
+        return {"tts_synthesis": "a.wav", "background_search": None, "video_generation": "v.mp4"}
+
+    monkeypatch.setattr(orchestrator.script_agent, "generate_script", fake_script)
+    monkeypatch.setattr(orchestrator, "_run_media_stages", fake_media)
+
+    outcomes = orchestrator.run_batch(
+        [{"topic": "first"}, {"topic": "second"}], max_llm_concurrency=1, max_render_workers=1,
+    )
+
+    assert [o["status"] for o in outcomes] == ["completed", "completed"]
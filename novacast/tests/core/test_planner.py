@@ -0,0 +1,68 @@
+# tests/core/test_planner.py
+
+import threading
+import time
+
+import pytest
+from app.core.flow.planner import PlanStep, Planner
+
+
+def test_execute_plan_respects_dependencies():
+    order = []
+    a = PlanStep("a", lambda: order.append("a") or 1)
+    b = PlanStep("b", lambda: order.append("b") or a.result + 1, dependencies=[a])
+    c = PlanStep("c", lambda: order.append("c") or b.result * 10, dependencies=["b"])
+
+    results = Planner().execute_plan({"name": "chain", "steps": [c, b, a]})
+
+    assert order == ["a", "b", "c"]
+    assert results == {"a": 1, "b": 2, "c": 20}
+
+
+def test_independent_steps_run_concurrently():
+    barrier = threading.Barrier(2, timeout=2)
+
+    def wait_for_sibling():
+        # Both siblings must be running at the same time to pass the barrier
+        barrier.wait()
+        return threading.current_thread().name
+
+    root = PlanStep("root", lambda: "root")
+    left = PlanStep("left", wait_for_sibling, dependencies=[root])
+    right = PlanStep("right", wait_for_sibling, dependencies=[root])
+    join = PlanStep("join", lambda: (left.result, right.result), dependencies=[left, right])
+
+    results = Planner().execute_plan({"name": "diamond", "steps": [root, left, right, join]})
+
+    assert results["left"] != results["right"]
+    assert results["join"] == (results["left"], results["right"])
+
+
+def test_failure_stops_dependents_and_reraises():
+    ran = []
+
+    def boom():
+        time.sleep(0.05)
+        raise RuntimeError("stage failed")
+
+    a = PlanStep("a", boom)
+    b = PlanStep("b", lambda: ran.append("b"), dependencies=[a])
+    side = PlanStep("side", lambda: ran.append("side"))
+
+    with pytest.raises(RuntimeError, match="stage failed"):
+        Planner().execute_plan({"name": "failing", "steps": [a, b, side]})
+
+    assert "b" not in ran
+    assert "side" in ran
+
+
+def test_validate_plan_rejects_cycles_and_unknown_dependencies():
+    planner = Planner()
+    a = PlanStep("a", lambda: None, dependencies=["b"])
+    b = PlanStep("b", lambda: None, dependencies=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        planner.validate_plan({"name": "cycle", "steps": [a, b]})
+
+    orphan = PlanStep("orphan", lambda: None, dependencies=["missing"])
+    with pytest.raises(ValueError, match="unknown step"):
+        planner.validate_plan({"name": "orphan", "steps": [orphan]})
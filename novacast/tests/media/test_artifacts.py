@@ -0,0 +1,42 @@
+# tests/media/test_artifacts.py
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.media.artifacts import ArtifactAllocator, atomic_output
+
+
+def test_allocate_is_unique_and_job_scoped(tmp_path):
+    artifacts = ArtifactAllocator(root=str(tmp_path))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        paths = list(pool.map(lambda _: artifacts.allocate("audio", ".wav", "job1"), range(200)))
+
+    assert len(set(paths)) == 200
+    assert all(os.path.dirname(p) == str(tmp_path / "jobs" / "job1") for p in paths)
+    assert all(p.endswith(".wav") for p in paths)
+    # Without a job id every artifact gets its own directory
+    assert os.path.dirname(artifacts.allocate("audio", ".wav")) != os.path.dirname(
+        artifacts.allocate("audio", ".wav")
+    )
+
+
+def test_atomic_output_renames_on_success_only(tmp_path):
+    final = tmp_path / "jobs" / "j" / "video.mp4"
+
+    with pytest.raises(RuntimeError):
+        with atomic_output(str(final)) as tmp:
+            with open(tmp, "wb") as f:
+                f.write(b"half")
+            raise RuntimeError("render failed")
+    assert not final.exists()
+    assert os.listdir(final.parent) == []
+
+    with atomic_output(str(final)) as tmp:
+        assert tmp.endswith(".partial.mp4")
+        with open(tmp, "wb") as f:
+            f.write(b"done")
+    assert final.read_bytes() == b"done"
+    assert os.listdir(final.parent) == ["video.mp4"]
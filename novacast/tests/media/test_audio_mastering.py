@@ -0,0 +1,99 @@
+# tests/media/test_audio_mastering.py
+
+import numpy as np
+import pytest
+
+from app.media import audio_mastering
+from app.media.audio_mastering import (
+    MasteringOptions,
+    _integrated_loudness,
+    build_mastering_command,
+    master_audio,
+    read_wav,
+    silence_bounds,
+    write_wav,
+)
+from app.media.ffmpeg_renderer import resolve_ffmpeg
+from app.media.subtitles import Cue, read_subtitles, retime_sidecar, sidecar_path, write_subtitles
+
+RATE = 16000
+
+
+def narration(path, lead=0.5, tone=1.0, tail=0.7, amplitude=0.1, rate=RATE):
+    """Silence, a 220 Hz tone, silence."""
+    t = np.arange(int(tone * rate)) / rate
+    samples = np.concatenate([
+        np.zeros(int(lead * rate)),
+        amplitude * np.sin(2 * np.pi * 220 * t),
+        np.zeros(int(tail * rate)),
+    ])
+    write_wav(str(path), samples[:, None], rate)
+    return str(path)
+
+
+def test_silence_bounds_finds_audible_part(tmp_path):
+    samples, rate = read_wav(narration(tmp_path / "a.wav"))
+
+    start, end = silence_bounds(samples, rate, threshold_db=-50, padding_ms=100)
+
+    assert start == pytest.approx(0.4, abs=0.02)
+    assert end == pytest.approx(1.6, abs=0.02)
+    assert silence_bounds(np.zeros((RATE, 1)), RATE, -50) == (0.0, 1.0)
+
+
+def test_command_is_a_single_pass_with_ducking():
+    options = MasteringOptions(music_path="music.mp3", target_lufs=-14)
+
+    cmd = build_mastering_command("voice.wav", "out.wav", options, bounds=(0.4, 1.6), sample_rate=22050)
+
+    assert cmd.count("-filter_complex") == 1
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert graph.startswith("[0:a]atrim=start=0.400:end=1.600,asetpts=PTS-STARTPTS,asplit=2[voice][key]")
+    assert "[bed][key]sidechaincompress=" in graph
+    assert "amix=inputs=2:duration=first" in graph and "loudnorm=I=-14.0" in graph
+    assert cmd[cmd.index("music.mp3") - 3:cmd.index("music.mp3")] == ["-stream_loop", "-1", "-i"]
+    assert cmd[cmd.index("-ar") + 1] == "22050"
+
+
+def test_command_without_music_or_trim():
+    cmd = build_mastering_command("voice.wav", "out.wav", MasteringOptions(), sample_rate=16000)
+    graph = cmd[cmd.index("-filter_complex") + 1]
+
+    assert graph.startswith("[0:a]loudnorm=")
+    assert "-stream_loop" not in cmd
+
+
+def test_numpy_fallback_trims_and_normalizes(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_mastering, "resolve_ffmpeg", lambda: None)
+    music = narration(tmp_path / "music.wav", lead=0, tone=0.3, tail=0, amplitude=0.5, rate=8000)
+    options = MasteringOptions(target_lufs=-20, music_path=music)
+
+    mastered = master_audio(narration(tmp_path / "a.wav"), str(tmp_path / "out.wav"), options)
+
+    samples, rate = read_wav(mastered.audio_path)
+    assert mastered.backend == "numpy"
+    assert mastered.offset == pytest.approx(0.4, abs=0.02)
+    assert len(samples) / rate == pytest.approx(mastered.duration, abs=0.01)
+    assert _integrated_loudness(samples, rate) == pytest.approx(-20, abs=0.5)
+
+
+@pytest.mark.skipif(resolve_ffmpeg() is None, reason="ffmpeg not available")
+def test_ffmpeg_mastering_shortens_audio(tmp_path):
+    mastered = master_audio(narration(tmp_path / "a.wav"), str(tmp_path / "out.wav"), MasteringOptions())
+
+    samples, rate = read_wav(mastered.audio_path)
+    assert mastered.backend == "ffmpeg"
+    assert rate == RATE
+    assert len(samples) / rate == pytest.approx(1.2, abs=0.05)
+
+
+def test_retimed_captions_follow_trimmed_audio(tmp_path):
+    write_subtitles(
+        [Cue(start=0.2, end=0.5, text="lost"), Cue(start=0.5, end=1.5, text="kept"), Cue(start=1.5, end=2.0, text="cut")],
+        sidecar_path(str(tmp_path / "raw.wav"), "srt"),
+    )
+
+    path = retime_sidecar(str(tmp_path / "raw.wav"), str(tmp_path / "master.wav"), shift=-0.5, duration=1.2)
+
+    assert path == str(tmp_path / "master.srt")
+    assert [(c.start, c.end, c.text) for c in read_subtitles(path)] == [(0.0, 1.0, "kept"), (1.0, 1.2, "cut")]
@@ -0,0 +1,73 @@
+# tests/media/test_ffmpeg_renderer.py
+
+import pytest
+
+from app.media import video_builder
+from app.media.ffmpeg_renderer import RenderError, StillClip, build_still_command, render_still, resolve_ffmpeg
+from app.media.halp_video import render_text_overlay
+
+
+def test_command_uses_still_image_inputs_and_single_filtergraph(tmp_path, write_silence):
+    background = tmp_path / "bg.jpg"
+    background.write_bytes(b"jpg")
+    audio = write_silence(tmp_path / "a.wav", seconds=2)
+    clip = StillClip(audio_path=audio, background_path=str(background), overlay_path="text.png")
+
+    cmd = build_still_command(clip, "out.mp4")
+
+    assert cmd.count("-loop") == 2
+    assert cmd.count("-filter_complex") == 1
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert "crop=1280:720" in graph and "overlay=0:0" in graph
+    assert graph.endswith("format=yuv420p,fps=24[v]")
+    assert cmd[cmd.index("-tune") + 1] == "stillimage"
+    assert cmd[cmd.index("-map", cmd.index("-map") + 1) + 1] == "2:a"
+    assert cmd[cmd.index("-t") + 1] == "2.000"
+    assert cmd[-1] == "out.mp4"
+
+
+def test_missing_background_uses_color_source():
+    clip = StillClip(audio_path="a.mp3", background_path="missing.jpg", background_color=(255, 0, 16))
+    cmd = build_still_command(clip, "out.mp4")
+
+    assert "color=c=0xff0010:s=1280x720:r=1" in cmd
+    assert "-loop" not in cmd
+    assert cmd[cmd.index("-map", cmd.index("-map") + 1) + 1] == "1:a"
+    assert "-t" not in cmd  # unknown duration → -shortest
+
+
+@pytest.mark.skipif(resolve_ffmpeg() is None, reason="ffmpeg not available")
+def test_render_still_produces_video(tmp_path, write_silence):
+    overlay = tmp_path / "overlay.png"
+    render_text_overlay("Hello NovaCast", size=(320, 180), font_size=16).save(overlay)
+    clip = StillClip(audio_path=write_silence(tmp_path / "a.wav"), overlay_path=str(overlay), size=(320, 180))
+
+    output = render_still(clip, str(tmp_path / "out.mp4"))
+
+    assert (tmp_path / "out.mp4").stat().st_size > 0
+    assert output.endswith("out.mp4")
+
+
+def test_falls_back_to_moviepy_when_ffmpeg_fails(tmp_path, monkeypatch, write_silence):
+    rendered = []
+
+    def failing_render(clip, output_path):
+        raise RenderError("boom")
+
+    def fake_compose(visual_clips, audio_path, output_path, **encoding):
+        rendered.append(output_path)
+        with open(output_path, "wb") as f:
+            f.write(b"mp4")
+        return output_path
+
+    monkeypatch.setattr(video_builder, "_use_ffmpeg", lambda: True)
+    monkeypatch.setattr(video_builder, "render_still", failing_render)
+    monkeypatch.setattr(video_builder, "compose_video_with_audio", fake_compose)
+
+    output = video_builder.build_media_clip_with_context(
+        write_silence(tmp_path / "a.wav"), "Some text", image_path="", output_path=str(tmp_path / "v.mp4"),
+    )
+
+    assert output == str(tmp_path / "v.mp4")
+    assert rendered == [str(tmp_path / "v.partial.mp4")]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.wav", "v.mp4"]
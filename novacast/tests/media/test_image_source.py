@@ -0,0 +1,141 @@
+# tests/media/test_image_source.py
+
+import os
+import threading
+import time
+
+from app.media.image_source import (
+    ImageSource,
+    ImageStore,
+    LocalImageProvider,
+    PexelsImageProvider,
+    PhotoRef,
+)
+
+
+class CountingProvider(LocalImageProvider):
+    def __init__(self, photo_for=None, delay=0.0):
+        super().__init__(size=(64, 36))
+        self.photo_for = photo_for or {}
+        self.delay = delay
+        self.searches = []
+        self.downloads = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def search(self, query):
+        with self._lock:
+            self.searches.append(query)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if query in self.photo_for:
+            photo_id = self.photo_for[query]
+            return None if photo_id is None else PhotoRef(provider=self.name, photo_id=photo_id, url="color:#336699")
+        return super().search(query)
+
+    def download(self, photo):
+        with self._lock:
+            self.downloads.append(photo.photo_id)
+        return super().download(photo)
+
+
+def test_query_is_fetched_once_and_served_from_store(tmp_path):
+    provider = CountingProvider()
+    source = ImageSource(provider, ImageStore(str(tmp_path)))
+
+    first = source.get("Ocean  Sunset")
+    second = source.get("ocean sunset")
+
+    assert first == second and os.path.exists(first)
+    assert provider.searches == ["ocean sunset"]
+    assert len(provider.downloads) == 1
+
+
+def test_same_photo_for_different_queries_is_stored_once(tmp_path):
+    provider = CountingProvider(photo_for={"sea": "42", "ocean": "42", "desert": None})
+    source = ImageSource(provider, ImageStore(str(tmp_path)))
+
+    assert source.get("sea") == source.get("ocean")
+    assert provider.downloads == ["42"]
+    # "No result" is remembered too
+    assert source.get("desert") is None and source.get("desert") is None
+    assert provider.searches.count("desert") == 1
+
+
+def test_ttl_expiry_and_size_eviction(tmp_path):
+    provider = CountingProvider()
+    store = ImageStore(str(tmp_path), ttl=0.05)
+    source = ImageSource(provider, store)
+    source.get("forest")
+    time.sleep(0.1)
+    source.get("forest")
+    assert provider.searches == ["forest", "forest"]
+
+    one_image = store.size_bytes()
+    small = ImageStore(str(tmp_path / "small"), max_bytes=int(one_image * 2.5))
+    source = ImageSource(CountingProvider(), small)
+    paths = [source.get(q) for q in ["a", "b", "c", "d"]]
+
+    assert small.size_bytes() <= small.max_bytes
+    assert not os.path.exists(paths[0]) and os.path.exists(paths[-1])
+
+
+def test_misses_expire_sooner_and_unconfigured_provider_is_not_cached(tmp_path):
+    provider = CountingProvider(photo_for={"desert": None})
+    source = ImageSource(provider, ImageStore(str(tmp_path), ttl=3600, miss_ttl=0.05))
+    source.get("desert")
+    time.sleep(0.1)
+    source.get("desert")
+    assert provider.searches == ["desert", "desert"]
+
+    # A missing API key is a configuration problem, not "no image": it is not remembered
+    unconfigured = PexelsImageProvider()
+    unconfigured.api_key = None
+    store = ImageStore(str(tmp_path / "pexels"))
+    assert ImageSource(unconfigured, store).get("sea") is None
+    assert store.lookup("pexels", "sea") is None
+
+
+def test_prefetch_runs_in_parallel_with_single_flight(tmp_path):
+    provider = CountingProvider(delay=0.05)
+    source = ImageSource(provider, ImageStore(str(tmp_path)), prefetch_workers=4)
+
+    results = source.prefetch(["city", "sea", "city", "mountain", "sky", ""])
+
+    assert set(results) == {"city", "sea", "mountain", "sky"}
+    assert all(os.path.exists(p) for p in results.values())
+    assert sorted(provider.searches) == ["city", "mountain", "sea", "sky"]
+    # Searches overlap instead of running one after another
+    assert provider.max_in_flight > 1
+
+
+def test_pexels_provider_uses_session_and_timeout():
+    calls = []
+
+    class FakeResponse:
+        def __init__(self, payload=None, content=b""):
+            self.payload, self.content = payload, content
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self.payload
+
+    class FakeSession:
+        def get(self, url, timeout=None, **kwargs):
+            calls.append((url, timeout))
+            if "api.pexels.com" in url:
+                return FakeResponse({"photos": [{"id": 7, "src": {"large": "https://img/7.jpg"}}]})
+            return FakeResponse(content=b"jpeg")
+
+    provider = PexelsImageProvider(api_key="key", session=FakeSession(), timeout=3)
+    photo = provider.search("sea")
+
+    assert photo == PhotoRef(provider="pexels", photo_id="7", url="https://img/7.jpg")
+    assert provider.download(photo) == b"jpeg"
+    assert [timeout for _, timeout in calls] == [3, 3]
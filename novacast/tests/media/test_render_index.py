@@ -0,0 +1,146 @@
+# tests/media/test_render_index.py
+
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from app.config.settings import settings
+from app.media import video_builder
+from app.media.ffmpeg_renderer import resolve_ffmpeg
+from app.media.render_index import (
+    LocalRenderIndex,
+    RenderDeduplicator,
+    render_spec_hash,
+    still_render_spec,
+    timeline_render_spec,
+)
+from app.media.render_profiles import get_profile
+from app.media.timeline import Scene, Timeline
+from app.media.video_builder import VideoBuilder, build_media_clip_with_context
+
+
+def test_spec_hash_follows_file_content_not_path(tmp_path, write_silence):
+    audio = write_silence(tmp_path / "a.wav")
+    copy = str(tmp_path / "copy.wav")
+    shutil.copyfile(audio, copy)
+    other = write_silence(tmp_path / "b.wav", seconds=0.6)
+    profile = get_profile("720p")
+
+    spec = render_spec_hash(still_render_spec(audio, "Hello", None, profile))
+    assert render_spec_hash(still_render_spec(copy, "Hello", None, profile)) == spec
+    assert render_spec_hash(still_render_spec(other, "Hello", None, profile)) != spec
+    assert render_spec_hash(still_render_spec(audio, "Hello!", None, profile)) != spec
+    assert render_spec_hash(still_render_spec(audio, "Hello", None, get_profile("1080p"))) != spec
+
+
+def test_concurrent_identical_renders_share_one_render(tmp_path):
+    deduplicator = RenderDeduplicator(LocalRenderIndex(str(tmp_path / "index")))
+    calls = []
+
+    def render():
+        calls.append(1)
+        time.sleep(0.1)
+        path = tmp_path / f"out_{len(calls)}.mp4"
+        path.write_bytes(b"mp4")
+        return str(path)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(deduplicator.render({"text": "same"}, render)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [str(tmp_path / "out_1.mp4")] * 4
+
+
+def test_missing_artifact_is_rendered_again(tmp_path):
+    deduplicator = RenderDeduplicator(LocalRenderIndex(str(tmp_path / "index")))
+    output = tmp_path / "out.mp4"
+
+    def render():
+        output.write_bytes(b"mp4")
+        return str(output)
+
+    assert deduplicator.render({"text": "a"}, render) == str(output)
+    output.unlink()
+    assert deduplicator.render({"text": "a"}, render) == str(output)
+    assert output.exists()
+
+
+def test_failed_render_is_not_recorded(tmp_path):
+    deduplicator = RenderDeduplicator(LocalRenderIndex(str(tmp_path / "index")))
+
+    assert deduplicator.render({"text": "a"}, lambda: None) is None
+    assert deduplicator.existing(render_spec_hash({"text": "a"})) is None
+
+
+@pytest.mark.skipif(resolve_ffmpeg() is None, reason="moviepy needs an ffmpeg binary too")
+def test_moviepy_render_without_its_captions_is_not_recorded(tmp_path, monkeypatch, write_silence, isolated_render_index):
+    def fake_compose(visual_clips, audio_path, output_path, **kwargs):
+        with open(output_path, "wb") as f:
+            f.write(b"mp4")
+        return output_path
+
+    monkeypatch.setattr(video_builder, "_use_ffmpeg", lambda: False)
+    monkeypatch.setattr(video_builder, "compose_video_with_audio", fake_compose)
+    monkeypatch.setattr(video_builder, "_mux_subtitles", lambda video_path, subtitles_path: False)
+    subtitles = tmp_path / "a.srt"
+    subtitles.write_text("1\n00:00:00,000 --> 00:00:00,500\nHello\n")
+    audio = write_silence(tmp_path / "a.wav")
+
+    output = build_media_clip_with_context(
+        audio, "Text", image_path="", output_path=str(tmp_path / "v.mp4"), subtitles_path=str(subtitles),
+    )
+
+    assert output is None and not os.path.exists(tmp_path / "v.mp4")
+    spec = still_render_spec(audio, "Text", "", get_profile(settings.render_profile), str(subtitles))
+    assert isolated_render_index.lookup(render_spec_hash(spec)) is None
+
+
+@pytest.mark.skipif(resolve_ffmpeg() is None, reason="ffmpeg not available")
+def test_identical_still_render_returns_existing_video(tmp_path, write_silence):
+    first_audio = write_silence(tmp_path / "first.wav")
+    second_audio = str(tmp_path / "second.wav")
+    shutil.copyfile(first_audio, second_audio)
+
+    first = build_media_clip_with_context(
+        first_audio, "Same text", image_path="", output_path=str(tmp_path / "v1.mp4"), profile="720p",
+    )
+    second = build_media_clip_with_context(
+        second_audio, "Same text", image_path="", output_path=str(tmp_path / "v2.mp4"), profile="720p",
+    )
+
+    assert first == second == str(tmp_path / "v1.mp4")
+    assert not os.path.exists(tmp_path / "v2.mp4")
+
+
+def test_profiles_already_rendered_are_not_encoded_again(tmp_path, monkeypatch, write_silence):
+    timeline = Timeline(audio_path=write_silence(tmp_path / "a.wav"), scenes=[Scene(start=0, end=0.5)])
+    encoded = []
+
+    def fake_render_profiles(self, timeline, resolved, output_paths):
+        encoded.append([p.name for p in resolved])
+        for path in output_paths.values():
+            with open(path, "wb") as f:
+                f.write(b"mp4")
+        return output_paths
+
+    monkeypatch.setattr(VideoBuilder, "_render_profiles", fake_render_profiles)
+    builder = VideoBuilder(job_id="job")
+
+    first = builder.render_timeline_profiles(timeline, ["720p"], {"720p": str(tmp_path / "a_720p.mp4")})
+    both = builder.render_timeline_profiles(
+        timeline, ["720p", "1080p"], {"720p": str(tmp_path / "b_720p.mp4"), "1080p": str(tmp_path / "b_1080p.mp4")},
+    )
+
+    assert encoded == [["720p"], ["1080p"]]
+    assert both == {"720p": first["720p"], "1080p": str(tmp_path / "b_1080p.mp4")}
+    assert timeline_render_spec(timeline, get_profile("720p")) != timeline_render_spec(timeline, get_profile("1080p"))
@@ -0,0 +1,54 @@
+# tests/media/test_render_profiles.py
+
+import re
+import subprocess
+
+import pytest
+
+from app.media.ffmpeg_renderer import resolve_ffmpeg, run_ffmpeg
+from app.media.render_profiles import RenderProfile, get_profile
+from app.media.timeline import Scene, Timeline, build_multi_profile_command
+
+
+def test_builtin_profiles():
+    assert get_profile("TikTok").size == (1080, 1920)
+    assert get_profile("tiktok").aspect_ratio == "9:16"
+    assert get_profile("youtube").aspect_ratio == "16:9"
+    assert get_profile("720p").fps == 24
+    with pytest.raises(ValueError):
+        get_profile("imax")
+
+
+def test_multi_profile_command_decodes_once_and_splits():
+    timeline = Timeline(audio_path="a.wav", scenes=[Scene(start=0, end=2, overlay_text="Hi")])
+    outputs = [(get_profile("youtube"), "wide.mp4"), (get_profile("tiktok"), "tall.mp4")]
+
+    cmd = build_multi_profile_command(timeline, outputs, {0: "o.png"})
+
+    assert cmd.count("-filter_complex") == 1
+    assert cmd.count("-i") == 3  # background, overlay, audio — shared by both outputs
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert "split=2[m0][m1]" in graph
+    assert "[m0]scale=1920:1080:force_original_aspect_ratio=increase,crop=1920:1080" in graph
+    assert "[m1]scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920" in graph
+    assert cmd.count("-crf") == 2
+    # -tune stillimage is for single-still renders only (it handles crossfades badly)
+    assert "-tune" not in cmd
+    assert cmd.index("wide.mp4") < cmd.index("[out1]") < cmd.index("tall.mp4")
+
+
+@pytest.mark.skipif(resolve_ffmpeg() is None, reason="ffmpeg not available")
+def test_render_two_profiles_in_one_command(tmp_path, write_silence):
+    wide = RenderProfile(name="wide", width=320, height=180, fps=12)
+    tall = RenderProfile(name="tall", width=180, height=320, fps=12, fit="pad")
+    timeline = Timeline(
+        audio_path=write_silence(tmp_path / "a.wav", seconds=1), size=(320, 180), fps=12,
+        scenes=[Scene(start=0, end=1)],
+    )
+    outputs = [(wide, str(tmp_path / "wide.mp4")), (tall, str(tmp_path / "tall.mp4"))]
+
+    run_ffmpeg(build_multi_profile_command(timeline, outputs, ffmpeg=resolve_ffmpeg()), str(tmp_path))
+
+    for path, size in [("wide.mp4", "320x180"), ("tall.mp4", "180x320")]:
+        probe = subprocess.run([resolve_ffmpeg(), "-i", str(tmp_path / path)], capture_output=True, text=True)
+        assert re.search(rf"Video: h264.* {size}", probe.stderr)
@@ -0,0 +1,104 @@
+# tests/media/test_subtitles.py
+
+import subprocess
+
+import pytest
+
+from app.media.ffmpeg_renderer import StillClip, build_still_command, render_still, resolve_ffmpeg
+from app.media.subtitles import (
+    Cue,
+    build_cues,
+    burn_in_filter,
+    sidecar_path,
+    to_srt,
+    to_vtt,
+    write_subtitles,
+)
+from app.media.tts_segments import SegmentTiming
+
+
+def test_one_cue_per_sentence_at_its_tts_offsets():
+    segments = [
+        SegmentTiming(index=0, text="Hello world.", start=0.0, end=1.2),
+        SegmentTiming(index=1, text="How are you?", start=1.35, end=2.5),
+    ]
+
+    cues = build_cues(segments, min_duration=0)
+
+    assert [(c.start, c.end, c.text) for c in cues] == [(0.0, 1.2, "Hello world."), (1.35, 2.5, "How are you?")]
+
+
+def test_long_sentence_is_split_and_time_shared_by_length():
+    text = "one two three four five six seven eight nine ten eleven twelve"
+    cues = build_cues([SegmentTiming(index=0, text=text, start=2.0, end=8.0)], max_chars=14, max_lines=2, min_duration=0)
+
+    assert len(cues) > 1
+    assert all(len(line) <= 14 for cue in cues for line in cue.text.split("\n"))
+    assert all(len(cue.text.split("\n")) <= 2 for cue in cues)
+    assert " ".join(cue.text.replace("\n", " ") for cue in cues) == text
+    assert cues[0].start == 2.0 and cues[-1].end == 8.0
+    assert all(a.end == pytest.approx(b.start) for a, b in zip(cues, cues[1:]))
+
+
+def test_short_cues_are_held_without_overlapping_the_next():
+    segments = [
+        SegmentTiming(index=0, text="Hi.", start=0.0, end=0.3),
+        SegmentTiming(index=1, text="Yes.", start=0.5, end=0.7),
+    ]
+
+    cues = build_cues(segments, min_duration=0.8)
+
+    assert cues[0].end == 0.5
+    assert cues[1].end == pytest.approx(1.3)
+
+
+def test_srt_and_vtt_formats():
+    cues = [Cue(start=0, end=1.5, text="Hello"), Cue(start=3661.25, end=3662, text="line one\nline two")]
+
+    assert to_srt(cues) == (
+        "1\n00:00:00,000 --> 00:00:01,500\nHello\n\n"
+        "2\n01:01:01,250 --> 01:01:02,000\nline one\nline two\n"
+    )
+    assert to_vtt(cues).startswith("WEBVTT\n\n00:00:00.000 --> 00:00:01.500\nHello\n")
+
+
+def test_write_subtitles_by_extension(tmp_path):
+    cues = [Cue(start=0, end=1, text="Hello")]
+
+    assert write_subtitles(cues, str(tmp_path / "a.vtt")).endswith("a.vtt")
+    assert (tmp_path / "a.vtt").read_text().startswith("WEBVTT")
+    assert sidecar_path(str(tmp_path / "audio.wav"), "srt") == str(tmp_path / "audio.srt")
+    with pytest.raises(ValueError):
+        write_subtitles(cues, str(tmp_path / "a.txt"))
+
+
+def test_still_command_soft_and_burned_subtitles():
+    soft = build_still_command(StillClip(audio_path="a.mp3", subtitles_path="subs.srt"), "out.mp4")
+    assert soft[soft.index("subs.srt") - 1] == "-i"
+    assert "2:s" in soft and soft[soft.index("-c:s") + 1] == "mov_text"
+
+    burned = build_still_command(
+        StillClip(audio_path="a.mp3", subtitles_path="/tmp/my subs.srt", subtitles_mode="burn"), "out.mp4",
+    )
+    graph = burned[burned.index("-filter_complex") + 1]
+    assert graph.endswith(f"fps=24,{burn_in_filter('/tmp/my subs.srt')}[v]")
+    assert "-c:s" not in burned
+
+
+def test_burn_in_filter_escapes_path():
+    assert burn_in_filter("/tmp/a:b's.srt", force_style="") == "subtitles=filename=/tmp/a\\\\:b\\\\\\'s.srt"
+
+
+@pytest.mark.skipif(resolve_ffmpeg() is None, reason="ffmpeg not available")
+@pytest.mark.parametrize("mode", ["soft", "burn"])
+def test_render_with_subtitles(tmp_path, mode, write_silence):
+    # Characters that need filtergraph escaping in the burn-in path
+    subtitles = write_subtitles([Cue(start=0, end=0.5, text="Hello")], str(tmp_path / "it's [a],b:c.srt"))
+    clip = StillClip(
+        audio_path=write_silence(tmp_path / "a.wav"), size=(320, 180), subtitles_path=subtitles, subtitles_mode=mode,
+    )
+
+    output = render_still(clip, str(tmp_path / "out.mp4"))
+
+    probe = subprocess.run([resolve_ffmpeg(), "-hide_banner", "-i", output], capture_output=True, text=True)
+    assert ("Subtitle: mov_text" in probe.stderr) == (mode == "soft")
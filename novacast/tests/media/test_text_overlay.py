@@ -0,0 +1,80 @@
+# tests/media/test_text_overlay.py
+
+from app.media.ffmpeg_renderer import StillClip, build_still_command
+from app.media.halp_video import (
+    create_text_overlay_clip,
+    load_font,
+    render_text_overlay,
+    render_text_sprite,
+    wrap_text,
+)
+
+
+def reference_wrap(text, font, max_width):
+    # The previous implementation: re-measures the whole line after every word
+    lines, line = [], ""
+    for word in text.split():
+        test_line = f"{line} {word}".strip()
+        if font.getlength(test_line) < max_width:
+            line = test_line
+        else:
+            lines.append(line)
+            line = word
+    lines.append(line)
+    return lines
+
+
+def test_fonts_are_loaded_once():
+    assert load_font(None, 20) is load_font(None, 20)
+
+
+def test_wrap_matches_line_measurement():
+    font = load_font(None, 16)
+    text = "NovaCast turns a short script into narrated video with captions and background art " * 3
+
+    for width in (120, 300, 640):
+        assert wrap_text(text, font, width) == reference_wrap(text, font, width)
+
+
+def test_sprite_is_cropped_to_the_text_band_and_cached():
+    sprite = render_text_sprite("Hello NovaCast", size=(640, 360), font_size=16)
+
+    width, height = sprite.image.size
+    assert width == 640 and height < 360
+    x, y = sprite.position
+    assert x == 0 and y + height <= 360
+    assert render_text_sprite("Hello NovaCast", size=(640, 360), font_size=16) is sprite
+
+
+def test_long_texts_are_not_cached():
+    script = "A script overlay is unique to its video and drawn once per clip. " * 3
+
+    assert render_text_sprite(script, size=(640, 360), font_size=16) is not render_text_sprite(
+        script, size=(640, 360), font_size=16
+    )
+
+
+def test_full_frame_overlay_places_the_sprite():
+    sprite = render_text_sprite("Caption", size=(320, 180), font_size=16)
+    frame = render_text_overlay("Caption", size=(320, 180), font_size=16)
+
+    assert frame.size == (320, 180)
+    assert frame.getpixel((0, 0))[3] == 0
+    assert frame.getpixel((0, sprite.position[1]))[3] == 160
+
+
+def test_overlay_clip_is_positioned_sprite():
+    clip = create_text_overlay_clip("Caption", size=(320, 180), duration=1.0, font_size=16)
+    sprite = render_text_sprite("Caption", size=(320, 180), font_size=16)
+
+    assert tuple(clip.size) == sprite.image.size
+    assert clip.pos(0) == sprite.position
+
+
+def test_still_command_overlays_sprite_at_its_position():
+    clip = StillClip(audio_path="a.mp3", overlay_path="text.png", overlay_position=(0, 500))
+    cmd = build_still_command(clip, "out.mp4")
+    graph = cmd[cmd.index("-filter_complex") + 1]
+
+    assert "[bg][1:v]overlay=0:500" in graph
+    assert "[1:v]scale" not in graph
@@ -0,0 +1,82 @@
+# tests/media/test_timeline.py
+
+import os
+import subprocess
+
+import pytest
+from pydantic import ValidationError
+
+from app.media import video_builder
+from app.media.ffmpeg_renderer import resolve_ffmpeg
+from app.media.timeline import Scene, Timeline, Transition, build_timeline_command
+from app.media.video_builder import VideoBuilder
+
+
+def three_scenes(audio_path=None, size=(1280, 720)):
+    return Timeline(
+        audio_path=audio_path,
+        size=size,
+        scenes=[
+            Scene(start=0, end=1.5, overlay_text="Intro"),
+            Scene(start=1.5, end=3, background_color=(200, 0, 0), transition=Transition(type="fade", duration=0.5)),
+            Scene(start=3, end=4, overlay_text="Outro"),
+        ],
+    )
+
+
+def test_scenes_must_be_contiguous():
+    with pytest.raises(ValidationError):
+        Timeline(scenes=[Scene(start=0, end=2), Scene(start=2.5, end=3)])
+    with pytest.raises(ValidationError):
+        Timeline(scenes=[Scene(start=0, end=1), Scene(start=1, end=3, transition=Transition(type="fade", duration=2))])
+
+
+def test_spec_hash_is_stable_and_tracks_changes():
+    timeline = three_scenes()
+    same = Timeline.model_validate_json(timeline.model_dump_json())
+    assert same.spec_hash() == timeline.spec_hash()
+
+    changed = three_scenes()
+    changed.scenes[2].overlay_text = "Bye"
+    assert changed.spec_hash() != timeline.spec_hash()
+
+
+def test_timeline_compiles_to_one_filtergraph():
+    cmd = build_timeline_command(three_scenes("a.wav"), "out.mp4", {0: "o0.png", 2: "o2.png"})
+
+    assert cmd.count("-filter_complex") == 1
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    # Scene 0 runs on under scene 1's 0.5 s fade; the fade starts exactly at scene 1's start
+    assert "trim=duration=2.000[s0]" in graph
+    assert "trim=duration=1.500[s1]" in graph
+    assert "[s0][s1]xfade=transition=fade:duration=0.500:offset=1.500[j1]" in graph
+    assert "[j1][s2]concat=n=2:v=1:a=0[j2]" in graph
+    assert cmd[cmd.index("-map") + 1] == "[j2]"
+    assert cmd[cmd.index("-map", cmd.index("-map") + 1) + 1] == "5:a"
+    assert cmd[-3:] == ["-t", "4.000", "out.mp4"]
+    assert "-tune" not in cmd
+
+
+@pytest.mark.skipif(resolve_ffmpeg() is None, reason="ffmpeg not available")
+def test_render_timeline_single_pass(tmp_path, write_silence):
+    timeline = three_scenes(write_silence(tmp_path / "a.wav", seconds=4), size=(320, 180))
+    output = VideoBuilder().render_timeline(timeline, output_path=str(tmp_path / "out.mp4"))
+
+    assert output == str(tmp_path / "out.mp4")
+    assert os.path.getsize(output) > 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.wav", "out.mp4"]
+    # The fade (xfade) must not leave the output in a 4:4:4 format players can't decode
+    probe = subprocess.run([resolve_ffmpeg(), "-hide_banner", "-i", output], capture_output=True, text=True)
+    assert "yuv420p" in probe.stderr and "yuv444p" not in probe.stderr
+
+
+@pytest.mark.skipif(resolve_ffmpeg() is None, reason="moviepy needs an ffmpeg binary too")
+def test_render_timeline_moviepy_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_builder, "_use_ffmpeg", lambda: False)
+    timeline = Timeline(size=(160, 90), fps=8, scenes=[
+        Scene(start=0, end=0.5, overlay_text="A"),
+        Scene(start=0.5, end=1, transition=Transition(type="fade", duration=0.25)),
+    ])
+
+    output = VideoBuilder().render_timeline(timeline, output_path=str(tmp_path / "out.mp4"))
+    assert os.path.getsize(output) > 0
@@ -0,0 +1,82 @@
+# tests/media/test_tts_cache.py
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.media.tts_cache import AudioSegmentCache, normalize_text
+from app.media.tts_engine import TTSEngine
+from app.media.tts_models import TTSModelRegistry
+import app.media.tts_engine as tts_engine
+from tests.media.test_tts_models import FakeModel
+
+
+def test_key_normalizes_text_and_separates_voices():
+    key = AudioSegmentCache.key
+    assert normalize_text("  Hello \n world. ") == "Hello world."
+    assert key("coqui", "m", None, "Hello  world.") == key("coqui", "m", "", " Hello world.")
+    assert key("coqui", "m", "p225", "Hello world.") != key("coqui", "m", "p226", "Hello world.")
+    assert key("coqui", "m", None, "Hello world.") != key("piper", "m", None, "Hello world.")
+
+
+def test_put_get_and_lru_eviction(tmp_path):
+    cache = AudioSegmentCache(root=str(tmp_path / "cache"), max_bytes=250)
+    source = tmp_path / "seg.wav"
+    source.write_bytes(b"x" * 100)
+
+    # Explicit mtimes: the LRU order must not depend on the filesystem's mtime resolution
+    past = time.time() - 100
+    first = cache.put("aa" * 32, str(source))
+    os.utime(first, (past, past))
+    second = cache.put("bb" * 32, str(source))
+    os.utime(second, (past + 10, past + 10))
+    assert cache.get("aa" * 32) == first        # refreshes "aa", so "bb" is now oldest
+    cache.put("cc" * 32, str(source))
+
+    assert cache.get("bb" * 32) is None
+    assert cache.get("aa" * 32) is not None and cache.get("cc" * 32) is not None
+    assert cache.size_bytes() == 200
+
+
+def test_segmented_synthesis_only_synthesizes_new_sentences(tmp_path, monkeypatch):
+    synthesized = []
+
+    class RecordingModel(FakeModel):
+        def tts_to_file(self, text, file_path):
+            synthesized.append(text)
+            super().tts_to_file(text, file_path)
+
+    registry = TTSModelRegistry(loader=lambda name, device: RecordingModel(name))
+    monkeypatch.setattr(tts_engine, "get_tts_model_registry", lambda: registry)
+    monkeypatch.chdir(tmp_path)
+    engine = TTSEngine(cache=AudioSegmentCache(root=str(tmp_path / "cache")))
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = engine.synthesize_segmented("coqui", "Welcome back. Today: caching.", executor=pool)
+        second = engine.synthesize_segmented("coqui", "Welcome back. Today: queues.", executor=pool)
+
+    assert synthesized == ["Welcome back.", "Today: caching.", "Today: queues."]
+    assert first.segments[0].end == second.segments[0].end
+    assert os.path.exists(second.audio_path)
+
+
+def test_cache_smaller_than_the_text_never_loses_picked_segments(tmp_path, monkeypatch):
+    registry = TTSModelRegistry(loader=lambda name, device: FakeModel(name))
+    monkeypatch.setattr(tts_engine, "get_tts_model_registry", lambda: registry)
+    monkeypatch.chdir(tmp_path)
+    # Every put evicts all other entries
+    cache = AudioSegmentCache(root=str(tmp_path / "cache"), max_bytes=1)
+    engine = TTSEngine(cache=cache)
+    text = "One sentence. Another sentence. A third sentence."
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = engine.synthesize_segmented("coqui", text, executor=pool)
+        second = engine.synthesize_segmented("coqui", text, executor=pool)  # a hit and two misses
+
+    assert len(first.segments) == len(second.segments) == 3
+    assert first.segments[-1].end == second.segments[-1].end
+
+    stream = engine.start_stream("coqui", output_path=str(tmp_path / "stream.wav"))
+    stream.feed(text)
+    assert os.path.exists(stream.result(timeout=10))
+    assert len(stream.segments) == 3
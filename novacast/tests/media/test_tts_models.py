@@ -0,0 +1,120 @@
+# tests/media/test_tts_models.py
+
+import threading
+import time
+import wave
+
+from app.media.tts_engine import CoquiTTSAdapter, TTSEngine
+from app.media.tts_models import TTSModelRegistry
+import app.media.tts_engine as tts_engine
+
+
+class FakeModel:
+    def __init__(self, name):
+        self.name = name
+
+    def tts_to_file(self, text, file_path):
+        with wave.open(file_path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(8000)
+            f.writeframes(b"\x00\x00" * 80 * len(text))
+
+
+def counting_loader(calls, delay=0.0):
+    def load(model_name, device):
+        calls.append((model_name, device))
+        time.sleep(delay)
+        return FakeModel(model_name)
+    return load
+
+
+def test_model_loaded_once_and_reused():
+    calls = []
+    registry = TTSModelRegistry(loader=counting_loader(calls))
+
+    first = registry.get("voice-a", "cpu")
+    second = registry.get("voice-a", "cpu")
+
+    assert first is second
+    assert calls == [("voice-a", "cpu")]
+    stats = registry.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert "voice-a@cpu" in stats["load_seconds"]
+
+
+def test_concurrent_first_use_loads_once():
+    calls = []
+    registry = TTSModelRegistry(loader=counting_loader(calls, delay=0.05))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("voice-a"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(model is results[0] for model in results)
+
+
+def test_lru_eviction_and_warm_up():
+    calls = []
+    registry = TTSModelRegistry(loader=counting_loader(calls), max_models=2)
+    registry.warm_up(["a", "b"])
+    registry.get("a")          # "b" is now least recently used
+    registry.get("c")          # evicts "b"
+    registry.get("b")          # reloaded
+
+    assert [name for name, _ in calls] == ["a", "b", "c", "b"]
+    assert registry.stats()["loaded"] == ["c@cpu", "b@cpu"]
+
+
+def test_coqui_adapter_uses_registry(tmp_path, monkeypatch):
+    calls = []
+    registry = TTSModelRegistry(loader=counting_loader(calls))
+    monkeypatch.setattr(tts_engine, "get_tts_model_registry", lambda: registry)
+
+    adapter = CoquiTTSAdapter("coqui", model_name="voice-a")
+    adapter.synthesize("One.", str(tmp_path / "1.wav"))
+    adapter.synthesize("Two.", str(tmp_path / "2.wav"))
+
+    assert calls == [("voice-a", "cpu")]
+
+
+def test_sentence_stream_synthesizes_each_sentence(tmp_path, monkeypatch):
+    registry = TTSModelRegistry(loader=counting_loader([]))
+    monkeypatch.setattr(tts_engine, "get_tts_model_registry", lambda: registry)
+    monkeypatch.chdir(tmp_path)
+
+    engine = TTSEngine()
+    stream = engine.start_stream("coqui", output_path=str(tmp_path / "out.wav"))
+    for chunk in ["Hello ", "world. How", " are you?"]:
+        stream.feed(chunk)
+
+    assert stream.result(timeout=5) == str(tmp_path / "out.wav")
+    assert stream.sentences == ["Hello world.", "How are you?"]
+    assert [s.text for s in stream.segments] == stream.sentences
+    assert stream.segments[0].end <= stream.segments[1].start
+
+
+def test_segmented_synthesis_keeps_order_and_timings(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    registry = TTSModelRegistry(loader=counting_loader([]))
+    monkeypatch.setattr(tts_engine, "get_tts_model_registry", lambda: registry)
+    monkeypatch.chdir(tmp_path)
+
+    text = "One. Three!\n\nFive five."
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        result = TTSEngine().synthesize_segmented(
+            "coqui", text, output_path=str(tmp_path / "out.wav"),
+            pause_ms=100, paragraph_pause_ms=500, executor=pool,
+        )
+
+    # FakeModel writes 80 frames (10 ms at 8 kHz) per character
+    assert [s.text for s in result.segments] == ["One.", "Three!", "Five five."]
+    assert [(s.start, s.end) for s in result.segments] == [(0.0, 0.04), (0.14, 0.2), (0.7, 0.8)]
+    assert result.duration == 0.8
+    assert not (tmp_path / "out.segments").exists()
+    assert not (tmp_path / "out.partial.wav").exists()
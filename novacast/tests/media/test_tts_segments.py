@@ -0,0 +1,75 @@
+# tests/media/test_tts_segments.py
+
+import wave
+
+import pytest
+from app.media.tts_segments import SentenceAccumulator, concat_wav, iter_sentences, segment_text, split_sentences
+
+
+def write_tone(path, frames, rate=8000, value=b"\x10\x00"):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(value * frames)
+    return str(path)
+
+
+def test_split_sentences_handles_punctuation_quotes_and_paragraphs():
+    text = 'Welcome to NovaCast! Pi is 3.14 today. He said "go." Then\n\nA new paragraph'
+    assert split_sentences(text) == [
+        "Welcome to NovaCast!",
+        "Pi is 3.14 today.",
+        'He said "go."',
+        "Then",
+        "A new paragraph",
+    ]
+
+
+def test_accumulator_waits_for_whitespace_after_punctuation():
+    accumulator = SentenceAccumulator()
+    assert accumulator.feed("Pi is 3") == []
+    assert accumulator.feed(".") == []
+    assert accumulator.feed("14. Next") == ["Pi is 3.14."]
+    assert accumulator.feed(" one? Last") == ["Next one?"]
+    assert accumulator.flush() == "Last"
+
+
+def test_iter_sentences_over_token_stream():
+    tokens = ["Hel", "lo world. ", "How", " are you?", " Fine"]
+    assert list(iter_sentences(tokens)) == ["Hello world.", "How are you?", "Fine"]
+
+
+def test_concat_wav_offsets_include_pauses(tmp_path):
+    first = write_tone(tmp_path / "a.wav", 8000)
+    second = write_tone(tmp_path / "b.wav", 4000)
+    output = tmp_path / "out.wav"
+
+    offsets = concat_wav([first, second], str(output), pause_ms=250)
+
+    assert offsets == [(0.0, 1.0), (1.25, 1.75)]
+    with wave.open(str(output), "rb") as f:
+        assert f.getnframes() == 8000 + 2000 + 4000
+
+
+def test_concat_wav_rejects_mismatched_formats(tmp_path):
+    first = write_tone(tmp_path / "a.wav", 100, rate=8000)
+    second = write_tone(tmp_path / "b.wav", 100, rate=16000)
+    with pytest.raises(ValueError):
+        concat_wav([first, second], str(tmp_path / "out.wav"))
+
+
+def test_segment_text_marks_paragraph_starts():
+    text = "First. Second!\n\nThird one.\nFourth?"
+    assert segment_text(text) == [
+        ("First.", False),
+        ("Second!", False),
+        ("Third one.", True),
+        ("Fourth?", False),
+    ]
+
+
+def test_concat_wav_per_gap_pauses(tmp_path):
+    paths = [write_tone(tmp_path / f"{i}.wav", 8000) for i in range(3)]
+    offsets = concat_wav(paths, str(tmp_path / "out.wav"), pauses=[999, 100, 500])
+    assert offsets == [(0.0, 1.0), (1.1, 2.1), (2.6, 3.6)]
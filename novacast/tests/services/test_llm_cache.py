@@ -0,0 +1,89 @@
+# tests/services/test_llm_cache.py
+
+import pytest
+from langchain_core.prompts import PromptTemplate
+from app.services.llm.cache import (
+    MemoryResponseCache,
+    SQLiteResponseCache,
+    invoke_with_cache,
+    make_cache_key,
+)
+
+
+class CountingChain:
+    def __init__(self, response="cached answer"):
+        self.response = response
+        self.calls = 0
+
+    def invoke(self, variables):
+        self.calls += 1
+        return self.response
+
+
+class FakeLLM:
+    model = "llama3.2:latest"
+    temperature = 0.2
+
+
+def test_cache_key_covers_model_system_prompt_and_params():
+    base = make_cache_key("m", "sys", "prompt", {"temperature": 0.2})
+    assert base == make_cache_key("m", "sys", "prompt", {"temperature": 0.2})
+    assert base != make_cache_key("other", "sys", "prompt", {"temperature": 0.2})
+    assert base != make_cache_key("m", "other", "prompt", {"temperature": 0.2})
+    assert base != make_cache_key("m", "sys", "other", {"temperature": 0.2})
+    assert base != make_cache_key("m", "sys", "prompt", {"temperature": 0.9})
+
+
+def test_memory_cache_lru_and_ttl(monkeypatch):
+    cache = MemoryResponseCache(max_entries=2, ttl=10)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"      # "a" becomes most recently used
+    cache.set("c", "3")               # evicts "b"
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+
+    import app.services.llm.cache as cache_module
+    now = cache_module.time.time()
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + 60)
+    assert cache.get("a") is None
+
+
+@pytest.mark.parametrize("max_entries", [2])
+def test_sqlite_cache_persists_and_evicts(tmp_path, max_entries):
+    path = str(tmp_path / "llm.sqlite3")
+    cache = SQLiteResponseCache(path, max_entries=max_entries)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.set("c", "3")
+    cache.close()
+
+    reopened = SQLiteResponseCache(path, max_entries=max_entries)
+    assert reopened.get("a") is None
+    assert reopened.get("b") == "2"
+    assert reopened.get("c") == "3"
+
+
+def test_invoke_with_cache_skips_chain_on_hit():
+    template = PromptTemplate(input_variables=["topic"], template="Idea about {topic}")
+    chain = CountingChain()
+    cache = MemoryResponseCache()
+
+    first = invoke_with_cache(chain, template, FakeLLM(), {"topic": "space"}, cache)
+    second = invoke_with_cache(chain, template, FakeLLM(), {"topic": "space"}, cache)
+    invoke_with_cache(chain, template, FakeLLM(), {"topic": "oceans"}, cache)
+
+    assert first == second == "cached answer"
+    assert chain.calls == 2
+
+
+def test_invoke_with_cache_does_not_store_rejected_responses():
+    template = PromptTemplate(input_variables=["topic"], template="{topic}")
+    chain = CountingChain(response="not json")
+    cache = MemoryResponseCache()
+
+    for _ in range(2):
+        invoke_with_cache(chain, template, FakeLLM(), {"topic": "x"}, cache, accept=lambda raw: False)
+
+    assert chain.calls == 2
+    assert len(cache) == 0
@@ -0,0 +1,159 @@
+# tests/services/test_ollama_adapter.py
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from app.services.llm.base import LLMResponseError
+from app.services.llm.ollama_adapter import OllamaAdapter, get_shared_session
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class RecordingSession:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = []
+
+    def post(self, url, json=None, timeout=None):
+        self.calls.append((url, json))
+        return FakeResponse(self.payload)
+
+
+def test_adapters_share_one_pooled_session():
+    first = OllamaAdapter(model_name="a")
+    second = OllamaAdapter(model_name="b")
+    assert first.session is second.session
+    assert first.session is get_shared_session(first.host, first.pool_size)
+
+    adapter = first.session.get_adapter(first.host)
+    assert adapter._pool_maxsize == first.pool_size
+
+
+def test_generate_text_uses_session():
+    session = RecordingSession({"response": "  hello  "})
+    adapter = OllamaAdapter(model_name="m", session=session)
+    adapter.set_parameters(temperature=0.1)
+
+    assert adapter.generate_text("hi") == "hello"
+    url, payload = session.calls[0]
+    assert url.endswith("/api/generate")
+    assert payload == {"model": "m", "prompt": "hi", "stream": False, "temperature": 0.1}
+
+
+def test_async_chat_and_generate():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        seen.append((request.url.path, body))
+        if request.url.path == "/api/chat":
+            return httpx.Response(200, json={"message": {"role": "assistant", "content": " hi there "}})
+        return httpx.Response(200, json={"response": "done"})
+
+    async def run():
+        client = httpx.AsyncClient(base_url="http://ollama", transport=httpx.MockTransport(handler))
+        adapter = OllamaAdapter(model_name="m", async_client=client)
+        try:
+            results = await asyncio.gather(
+                adapter.achat([{"role": "user", "content": "hello"}]),
+                adapter.agenerate_text("prompt"),
+            )
+        finally:
+            await adapter.aclose()
+        return results
+
+    assert asyncio.run(run()) == ["hi there", "done"]
+    assert {path for path, _ in seen} == {"/api/chat", "/api/generate"}
+    assert all(body["stream"] is False for _, body in seen)
+
+
+def test_async_malformed_response_raises():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"unexpected": True}))
+
+    async def run():
+        adapter = OllamaAdapter(async_client=httpx.AsyncClient(base_url="http://ollama", transport=transport))
+        try:
+            await adapter.agenerate_text("prompt")
+        finally:
+            await adapter.aclose()
+
+    with pytest.raises(LLMResponseError):
+        asyncio.run(run())
+
+
+NDJSON_CHAT = b"\n".join([
+    b'{"message": {"role": "assistant", "content": "Hel"}, "done": false}',
+    b'{"message": {"role": "assistant", "content": "lo "}, "done": false}',
+    b'{"message": {"role": "assistant", "content": "world"}, "done": false}',
+    b'{"message": {"role": "assistant", "content": ""}, "done": true}',
+])
+
+
+class StreamingResponse(FakeResponse):
+    def __init__(self, body):
+        super().__init__(None)
+        self.body = body
+
+    def iter_lines(self):
+        return iter(self.body.split(b"\n"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class StreamingSession:
+    def __init__(self, body):
+        self.body = body
+        self.kwargs = None
+
+    def post(self, url, **kwargs):
+        self.kwargs = kwargs
+        return StreamingResponse(self.body)
+
+
+def test_chat_stream_yields_chunks():
+    session = StreamingSession(NDJSON_CHAT)
+    adapter = OllamaAdapter(model_name="m", session=session)
+
+    assert list(adapter.chat_stream([{"role": "user", "content": "hi"}])) == ["Hel", "lo ", "world"]
+    assert session.kwargs["stream"] is True
+    assert session.kwargs["json"]["stream"] is True
+
+
+def test_generate_stream_surfaces_provider_errors():
+    session = StreamingSession(b'{"response": "partial", "done": false}\n{"error": "model not found"}')
+    adapter = OllamaAdapter(model_name="m", session=session)
+
+    stream = adapter.generate_stream("prompt")
+    assert next(stream) == "partial"
+    with pytest.raises(LLMResponseError, match="model not found"):
+        next(stream)
+
+
+def test_async_generate_stream():
+    body = b'{"response": "a", "done": false}\n{"response": "b", "done": false}\n{"response": "", "done": true}\n'
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+
+    async def run():
+        adapter = OllamaAdapter(async_client=httpx.AsyncClient(base_url="http://ollama", transport=transport))
+        try:
+            return [chunk async for chunk in adapter.agenerate_stream("prompt")]
+        finally:
+            await adapter.aclose()
+
+    assert asyncio.run(run()) == ["a", "b"]
@@ -0,0 +1,137 @@
+# tests/services/test_worker_jobs.py
+
+import dramatiq
+import pytest
+from dramatiq.results import ResultFailure
+
+from app.services.worker import broker as worker_broker
+from app.services.worker import tasks
+from app.services.worker.jobs import InvalidTransition, MemoryJobStateStore, job_id_for
+from app.services.worker.queue import enqueue, get_job_result, get_job_status
+
+
+def test_job_ids_are_deterministic():
+    assert job_id_for("render_tts", {"text": "a", "voice": None}) == job_id_for("render_tts", {"voice": None, "text": "a"})
+    assert job_id_for("render_tts", {"text": "a"}) != job_id_for("render_tts", {"text": "b"})
+    assert job_id_for("render_tts", {"text": "a"}) != job_id_for("render_video", {"text": "a"})
+
+
+def test_render_and_light_actors_use_separate_queues():
+    assert tasks.render_tts.queue_name == worker_broker.TTS_QUEUE
+    assert tasks.render_video.queue_name == worker_broker.RENDER_QUEUE
+    assert tasks.upload_content.queue_name == tasks.send_notification.queue_name == worker_broker.DEFAULT_QUEUE
+
+
+def test_tts_models_are_warmed_up_at_worker_boot_not_on_import(stub_broker, run_worker, monkeypatch):
+    from app.media import tts_models
+
+    warmed = []
+    monkeypatch.setattr(tts_models, "warm_up_tts_models", lambda: warmed.append(True))
+
+    assert not hasattr(tasks, "warm_up_tts_models")
+    run_worker(stub_broker)
+    assert warmed == [True]
+
+
+def test_job_runs_once_and_records_transitions(stub_broker, tmp_path, run_worker):
+    source = tmp_path / "video.mp4"
+    source.write_bytes(b"mp4")
+    destination = str(tmp_path / "published")
+
+    job_id = enqueue(tasks.upload_content, content=str(source), destination=destination)
+    assert enqueue(tasks.upload_content, content=str(source), destination=destination) == job_id
+    assert get_job_status(job_id).status == "queued"
+    assert stub_broker.queues[worker_broker.DEFAULT_QUEUE].qsize() == 1
+
+    run_worker(stub_broker)
+
+    job = get_job_status(job_id)
+    assert job.status == "succeeded" and job.attempts == 1
+    assert [event["status"] for event in job.history] == ["queued", "running", "succeeded"]
+    assert job.result == {"path": str(tmp_path / "published" / "video.mp4")}
+    assert get_job_result(job_id) == job.result
+    assert (tmp_path / "published" / "video.mp4").read_bytes() == b"mp4"
+
+    # Succeeded jobs are not enqueued again
+    enqueue(tasks.upload_content, content=str(source), destination=destination)
+    assert stub_broker.queues[worker_broker.DEFAULT_QUEUE].qsize() == 0
+
+
+def test_failed_job_is_recorded_and_can_be_resubmitted(stub_broker, run_worker):
+    @dramatiq.actor(broker=stub_broker, max_retries=0, store_results=True)
+    def flaky(value):
+        raise RuntimeError(f"bad {value}")
+
+    job_id = enqueue(flaky, value=1)
+    run_worker(stub_broker)
+
+    job = get_job_status(job_id)
+    assert job.status == "failed"
+    assert job.error_message == "RuntimeError: bad 1"
+    with pytest.raises(ResultFailure):
+        get_job_result(job_id)
+
+    assert enqueue(flaky, value=1) == job_id
+    assert get_job_status(job_id).status == "queued"
+
+
+def test_requeued_failed_job_does_not_report_the_stale_failure(stub_broker, run_worker):
+    runs = []
+
+    @dramatiq.actor(broker=stub_broker, max_retries=0, store_results=True)
+    def flaky_once(value):
+        runs.append(value)
+        if len(runs) == 1:
+            raise RuntimeError("first run fails")
+        return value * 2
+
+    job_id = enqueue(flaky_once, value=21)
+    run_worker(stub_broker)
+    with pytest.raises(ResultFailure):
+        get_job_result(job_id)
+
+    # Queued again: the backend still holds the first run's exception under this id
+    assert enqueue(flaky_once, value=21) == job_id
+    assert get_job_result(job_id) is None
+    run_worker(stub_broker)
+    assert get_job_result(job_id, block=True, timeout=1000) == 42
+
+
+def test_render_tts_writes_into_the_job_directory(stub_broker, monkeypatch, tmp_path, run_worker):
+    from types import SimpleNamespace
+
+    from app.media import tts_engine
+    from app.media.artifacts import ArtifactAllocator
+
+    class FakeTTSEngine:
+        def _adapter(self, engine):
+            return SimpleNamespace(voice=None)
+
+        def synthesize_segmented(self, engine, text, output_path=None):
+            return SimpleNamespace(audio_path=output_path, segments=[], duration=1.5)
+
+    monkeypatch.setattr(tts_engine, "TTSEngine", FakeTTSEngine)
+    monkeypatch.setattr(tasks, "get_artifact_allocator", lambda: ArtifactAllocator(str(tmp_path)))
+
+    job_id = enqueue(tasks.render_tts, text="Hello world.")
+    run_worker(stub_broker)
+
+    result = get_job_status(job_id).result
+    assert result["audio_path"].startswith(str(tmp_path / "jobs" / job_id))
+    assert result["duration"] == 1.5
+
+
+def test_invalid_transitions_are_rejected():
+    from datetime import datetime, timezone
+
+    from app.db.models.job_log import JobLog
+
+    store = MemoryJobStateStore()
+    store.create(JobLog(job_id="j1", job_name="a", status="queued", start_time=datetime.now(timezone.utc)))
+
+    with pytest.raises(InvalidTransition):
+        store.transition("j1", "succeeded")
+    store.transition("j1", "running")
+    store.transition("j1", "succeeded", result=1)
+    with pytest.raises(InvalidTransition):
+        store.transition("j1", "running")
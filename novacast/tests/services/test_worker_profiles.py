@@ -0,0 +1,55 @@
+# tests/services/test_worker_profiles.py
+
+import pytest
+
+from app.config.settings import settings
+from app.services.worker import profiles
+from app.services.worker.broker import DEFAULT_QUEUE, RENDER_QUEUE, TTS_QUEUE
+from app.services.worker.profiles import get_worker_profiles
+
+
+@pytest.fixture
+def eight_cores(monkeypatch):
+    monkeypatch.setattr(profiles, "_cores", lambda: 8)
+    monkeypatch.setattr(settings, "worker_tts_processes", 0)
+    monkeypatch.setattr(settings, "worker_render_processes", 0)
+    monkeypatch.setattr(settings, "worker_io_processes", 1)
+    monkeypatch.setattr(settings, "worker_io_threads", 64)
+    monkeypatch.setattr(settings, "tts_segment_workers", 0)
+
+
+def test_cpu_pools_are_processes_sized_to_cores(eight_cores):
+    tts, render, io = get_worker_profiles()
+
+    assert (tts.queues, tts.processes, tts.threads) == ([TTS_QUEUE], 8, 1)
+    assert (render.queues, render.processes, render.threads) == ([RENDER_QUEUE], 8, 1)
+    assert render.env["dramatiq_queue_prefetch"] == "1"
+    # Render processes never start a per-core TTS sentence pool of their own
+    assert render.env["TTS_SEGMENT_WORKERS"] == "1"
+    # Every TTS process gets its share of the cores for sentence synthesis
+    assert tts.env["TTS_SEGMENT_WORKERS"] == "1"
+
+
+def test_io_pool_uses_threads(eight_cores):
+    (io,) = get_worker_profiles(["io"])
+
+    assert (io.queues, io.processes, io.threads) == ([DEFAULT_QUEUE], 1, 64)
+    command = io.command(python="python")
+    assert command[:4] == ["python", "-m", "dramatiq", "app.services.worker.tasks"]
+    assert command[command.index("--threads") + 1] == "64"
+    assert command[command.index("--queues") + 1:] == [DEFAULT_QUEUE]
+
+
+def test_sizes_come_from_settings(eight_cores, monkeypatch):
+    monkeypatch.setattr(settings, "worker_tts_processes", 2)
+    monkeypatch.setattr(settings, "worker_render_processes", 3)
+
+    tts, render = get_worker_profiles(["tts", "render"])
+
+    assert tts.processes == 2 and tts.env["TTS_SEGMENT_WORKERS"] == "4"
+    assert render.processes == 3
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError, match="gpu"):
+        get_worker_profiles(["gpu"])
@@ -0,0 +1,18 @@
+# tests/test_api_routes.py
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize("resource", ["assets", "schedules"])
+def test_asset_and_schedule_routes_are_mounted_behind_authentication(resource):
+    assert client.get(f"/api/v1/{resource}/", params={"limit": 10}).status_code == 401
+    assert client.get(f"/api/v1/{resource}/some-id").status_code == 401
+    assert client.delete(f"/api/v1/{resource}/some-id").status_code == 401
+
+    listing = client.get("/openapi.json").json()["paths"][f"/api/v1/{resource}/"]["get"]
+    assert {"limit", "cursor", "fields"} <= {param["name"] for param in listing["parameters"]}
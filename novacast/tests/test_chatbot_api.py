@@ -0,0 +1,40 @@
+# tests/test_chatbot_api.py
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps.auth import User, get_current_user
+from app.api.v1 import chatbot
+from app.services.llm.base import BaseLLMService
+
+app = FastAPI()
+app.include_router(chatbot.router, prefix="/api/v1/chatbot")
+app.dependency_overrides[get_current_user] = lambda: User(username="tester")
+
+
+class NonStreamingLLM(BaseLLMService):
+    def generate_text(self, prompt, **kwargs):
+        return "reply"
+
+    def get_model_info(self):
+        return {"provider": "test"}
+
+
+def test_provider_without_streaming_gets_an_error_frame(monkeypatch):
+    monkeypatch.setattr(chatbot, "get_llm", NonStreamingLLM)
+
+    with TestClient(app).websocket_connect("/api/v1/chatbot/ws/chat") as websocket:
+        websocket.send_text("Hello")
+        frame = websocket.receive_json()
+
+    assert frame["type"] == "error" and "not implemented" in frame["detail"]
+
+
+def test_unavailable_provider_gets_an_error_frame(monkeypatch):
+    def unavailable():
+        raise NotImplementedError("OpenAIAdapter not implemented yet")
+
+    monkeypatch.setattr(chatbot, "get_llm", unavailable)
+
+    with TestClient(app).websocket_connect("/api/v1/chatbot/ws/chat") as websocket:
+        assert websocket.receive_json() == {"type": "error", "detail": "OpenAIAdapter not implemented yet"}
@@ -0,0 +1,70 @@
+# tests/test_db_connection.py
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+from app.db import connection
+
+
+@pytest.fixture
+def unreachable_db(monkeypatch):
+    """A DB_URL nothing listens on, with a short server selection timeout."""
+    monkeypatch.setattr(settings, "db_url", "mongodb://127.0.0.1:1")
+    monkeypatch.setattr(settings, "db_server_selection_timeout_ms", 100)
+    monkeypatch.setattr(connection, "_connection", None)
+    monkeypatch.setattr(connection, "_sync_client", None)
+    yield
+    asyncio.run(connection.close_db())
+
+
+def test_one_shared_client_per_process(unreachable_db):
+    first = connection.get_connection()
+    assert connection.get_connection() is first
+    assert connection.get_sync_database() is not None
+    assert connection.get_sync_database().client is connection.get_sync_database().client
+    assert first.client.options.pool_options.max_pool_size == settings.db_max_pool_size
+    assert first.client.options.pool_options.min_pool_size == settings.db_min_pool_size
+
+    asyncio.run(connection.close_db())
+    assert connection._connection is None and connection._sync_client is None
+
+
+def test_without_db_url_nothing_connects(monkeypatch):
+    monkeypatch.setattr(settings, "db_url", None)
+    monkeypatch.setattr(connection, "_connection", None)
+
+    assert asyncio.run(connection.init_db()) is None
+    assert asyncio.run(connection.ping_db()) is None
+    with pytest.raises(RuntimeError):
+        asyncio.run(connection.get_database())
+
+
+def test_readiness_reports_an_unreachable_database(unreachable_db):
+    from app.main import app
+
+    with TestClient(app) as client:  # runs the lifespan: init_db() must not fail startup
+        response = client.get("/api/v1/health/readiness")
+        assert response.status_code == 503
+        assert response.json()["database"] == "unreachable"
+        assert client.get("/api/v1/health/liveness").status_code == 200
+    assert connection._connection is None  # closed at shutdown
+
+
+def test_worker_stores_rebind_after_close(unreachable_db, monkeypatch):
+    from app.media import render_index
+    from app.services.worker import jobs
+
+    monkeypatch.setattr(jobs, "_store", None)
+    monkeypatch.setattr(render_index, "_deduplicator", None)
+    store, deduplicator = jobs.get_job_state_store(), render_index.get_render_deduplicator()
+    assert isinstance(deduplicator.index, render_index.MongoRenderIndex)
+
+    asyncio.run(connection.close_db())
+
+    # A new startup gets stores on the new client instead of ones bound to the closed client
+    assert jobs.get_job_state_store() is not store
+    assert render_index.get_render_deduplicator() is not deduplicator
+    assert jobs.get_job_state_store().collection.database.client is connection.get_sync_database().client
@@ -0,0 +1,144 @@
+# tests/test_db_indexes.py
+
+import asyncio
+import os
+import uuid
+
+import pytest
+from pymongo import MongoClient, errors
+
+from app.db.crud import assets, chat_sessions, job_logs, prompts, schedules
+from app.db.indexes import INDEXES, IndexSpec, collection_scans, ensure_indexes
+from app.db.pagination import keyset_filter
+
+# List queries of app/db/crud/*: (collection, filter, sort); each must be served by an index.
+# Built from the CRUD modules' own filters and sorts, so the check follows them.
+LIST_QUERIES = [
+    ("chat_sessions", {"user_id": "u1"}, chat_sessions.SESSION_SORT),
+    ("job_logs", job_logs.job_log_query("failed"), job_logs.JOB_LOG_SORT),
+    ("job_logs", job_logs.job_log_query(), job_logs.JOB_LOG_SORT),
+    ("schedules", {}, schedules.SCHEDULE_SORT),
+    ("prompts", prompts.prompt_query(), prompts.PROMPT_SORT),
+    ("prompts", prompts.prompt_query("intro"), prompts.PROMPT_SORT),
+    ("assets", assets.USER_ASSETS, assets.ASSET_SORT),
+]
+
+
+def test_collection_scans_are_found_anywhere_in_the_plan():
+    collscan = {"queryPlanner": {"namespace": "db.assets", "winningPlan": {
+        "stage": "SORT", "inputStage": {"stage": "COLLSCAN"},
+    }}}
+    ixscan = {"queryPlanner": {"namespace": "db.assets", "winningPlan": {
+        "stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}},
+    }}}
+    sbe_collscan = {"queryPlanner": {"namespace": "db.jobs", "winningPlan": {
+        "queryPlan": {"stage": "OR", "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}]},
+    }}}
+
+    assert collection_scans(collscan) == ["db.assets"]
+    assert collection_scans(ixscan) == []
+    assert collection_scans(sbe_collscan) == ["db.jobs"]
+
+
+class FakeCollection:
+    def __init__(self, created, fail=False, existing=None):
+        self.created = created
+        self.fail = fail
+        self.existing = existing or {}  # name -> keys already on the server
+        self.dropped = []
+
+    async def create_index(self, keys, **options):
+        if self.fail:
+            raise errors.ServerSelectionTimeoutError("no server")
+        if self.existing.get(options["name"], keys) != keys:
+            raise errors.OperationFailure("Index already exists with a different key spec", code=86)
+        if options["name"] == "broken":
+            raise errors.OperationFailure("bad index", code=67)
+        self.existing[options["name"]] = keys
+        self.created.append((keys, options["name"]))
+
+    async def drop_index(self, name):
+        self.dropped.append(name)
+        del self.existing[name]
+
+
+def test_ensure_indexes_creates_every_declared_index():
+    created = []
+
+    class FakeDatabase:
+        def __getitem__(self, name):
+            return FakeCollection(created)
+
+    ensured = asyncio.run(ensure_indexes(FakeDatabase()))
+    assert len(ensured) == len(INDEXES) == len(created)
+    assert "chat_sessions.user_id_created_at" in ensured
+    assert ([("user_id", 1), ("created_at", -1), ("_id", -1)], "user_id_created_at") in created
+
+
+def test_changed_declarations_are_rebuilt_and_failures_do_not_stop_the_rest():
+    created = []
+    # An index built before `_id` was appended to its keys
+    assets = FakeCollection(created, existing={"created_at": [("created_at", -1)]})
+    specs = [
+        IndexSpec(collection="jobs", name="broken", keys=[("x", 1)]),
+        IndexSpec(collection="assets", name="created_at", keys=[("created_at", -1), ("_id", -1)]),
+    ]
+
+    class FakeDatabase:
+        def __getitem__(self, name):
+            return assets if name == "assets" else FakeCollection(created)
+
+    assert asyncio.run(ensure_indexes(FakeDatabase(), specs)) == ["assets.created_at"]
+    assert assets.dropped == ["created_at"]
+    assert assets.existing["created_at"] == [("created_at", -1), ("_id", -1)]
+
+
+def test_unreachable_server_does_not_raise():
+    class FakeDatabase:
+        def __getitem__(self, name):
+            return FakeCollection([], fail=True)
+
+    assert asyncio.run(ensure_indexes(FakeDatabase())) == []
+
+
+@pytest.fixture
+def mongo_url():
+    """MONGODB_TEST_URL (default: local server); skipped when no server is available."""
+    url = os.getenv("MONGODB_TEST_URL", "mongodb://localhost:27017")
+    client = MongoClient(url, serverSelectionTimeoutMS=300)
+    try:
+        client.admin.command("ping")
+    except errors.PyMongoError:
+        pytest.skip(f"MongoDB not available at {url}")
+    finally:
+        client.close()
+    return url
+
+
+def test_list_queries_use_indexes(mongo_url):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    name = f"novacast_test_{uuid.uuid4().hex[:8]}"
+
+    async def ensure():
+        client = AsyncIOMotorClient(mongo_url)
+        try:
+            return await ensure_indexes(client[name])
+        finally:
+            client.close()
+
+    client = MongoClient(mongo_url)
+    try:
+        assert len(asyncio.run(ensure())) == len(INDEXES)
+        db = client[name]
+        for collection, query, sort in LIST_QUERIES:
+            db[collection].insert_one({"seed": True})  # explain needs an existing collection
+            # First page, and a following page continued from a keyset cursor
+            seed = db[collection].find_one({"seed": True})
+            following = {"$and": [query, keyset_filter(sort, [seed.get(key) for key, _ in sort])]}
+            for page_query in (query, following):
+                explain = db[collection].find(page_query).sort(sort).limit(10).explain()
+                assert not collection_scans(explain), f"{collection}.find({page_query}).sort({sort}) scans the collection"
+    finally:
+        client.drop_database(name)
+        client.close()
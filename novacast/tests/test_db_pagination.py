@@ -0,0 +1,172 @@
+# tests/test_db_pagination.py
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_filter, paginate
+
+
+def _matches(doc, query):
+    """The subset of MongoDB query semantics keyset pagination uses."""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(_matches(doc, clause) for clause in condition):
+                return False
+        elif key == "$and":
+            if not all(_matches(doc, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = doc.get(key)
+            for op, operand in condition.items():
+                if op == "$ne" and value == operand:
+                    return False
+                # Range operators never match null / missing values (type bracketing)
+                if op == "$gt" and (value is None or not value > operand):
+                    return False
+                if op == "$lt" and (value is None or not value < operand):
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+        elif doc.get(key) != condition:
+            return False
+    return True
+
+
+def _sort_key(doc, sort):
+    # Nulls sort before every value
+    return tuple(
+        (doc.get(key) is not None, doc.get(key)) if direction == 1 else _Desc((doc.get(key) is not None, doc.get(key)))
+        for key, direction in sort
+    )
+
+
+class _Desc:
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return self.value > other.value
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, sort):
+        self.docs = sorted(self.docs, key=lambda doc: _sort_key(doc, sort))
+        return self
+
+    def limit(self, limit):
+        self.docs = self.docs[:limit]
+        return self
+
+    async def to_list(self, length=None):
+        return [dict(doc) for doc in self.docs[:length]]
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        docs = [doc for doc in self.docs if _matches(doc, query)]
+        if projection:
+            docs = [{key: value for key, value in doc.items() if key in projection or key == "_id"} for doc in docs]
+        return FakeCursor(docs)
+
+
+def _all_pages(collection, query, sort, limit, fields=None):
+    pages, cursor = [], None
+    while True:
+        docs, cursor = asyncio.run(paginate(collection, query, sort, limit, cursor, fields))
+        pages.append(docs)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trips_datetimes():
+    values = [datetime(2024, 5, 1, 12, 30, 15, 123000), "a1"]
+    token = encode_cursor(values)
+    assert "=" not in token and "{" not in token
+    assert decode_cursor(token, [("created_at", -1), ("_id", -1)]) == values
+
+
+@pytest.mark.parametrize("token", ["not-a-cursor!", encode_cursor(["only one value"])])
+def test_foreign_cursors_are_rejected(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, [("created_at", -1), ("_id", -1)])
+
+
+def test_pages_cover_every_document_once_with_ties_and_nulls():
+    start = datetime(2024, 1, 1)
+    docs = [
+        {"_id": f"a{i:02d}", "created_at": start + timedelta(minutes=i // 3), "name": f"n{i}"}
+        for i in range(20)
+    ] + [{"_id": "z1", "created_at": None, "name": "no date"}, {"_id": "z2", "name": "missing date"}]
+    collection = FakeCollection(docs)
+    sort = [("created_at", -1), ("_id", -1)]
+
+    pages = _all_pages(collection, {}, sort, limit=4)
+
+    listed = [doc["_id"] for page in pages for doc in page]
+    expected = [doc["_id"] for doc in FakeCursor(list(docs)).sort(sort).docs]
+    assert listed == expected and len(listed) == len(set(listed)) == 22
+    assert [len(page) for page in pages] == [4, 4, 4, 4, 4, 2]
+
+
+def test_ascending_pages_start_after_nulls_and_keep_the_query():
+    docs = [{"_id": f"s{i}", "next_run": i if i % 4 else None, "user_id": "u1" if i % 2 else "u2"} for i in range(12)]
+    collection = FakeCollection(docs)
+
+    pages = _all_pages(collection, {"user_id": "u1"}, [("next_run", 1), ("_id", 1)], limit=2)
+
+    listed = [doc["_id"] for page in pages for doc in page]
+    assert listed == ["s1", "s3", "s5", "s7", "s9", "s11"]
+    assert all(query == {"user_id": "u1"} or "$and" in query for query in collection.queries)
+
+
+def test_projection_keeps_the_sort_keys():
+    docs = [{"_id": f"a{i}", "created_at": i, "name": f"n{i}", "metadata": {"big": "x" * 100}} for i in range(5)]
+
+    pages = _all_pages(FakeCollection(docs), {}, [("created_at", -1), ("_id", -1)], limit=2, fields=["name"])
+
+    assert pages[0] == [{"_id": "a4", "created_at": 4, "name": "n4"}, {"_id": "a3", "created_at": 3, "name": "n3"}]
+    assert sum(len(page) for page in pages) == 5
+
+
+def test_last_page_has_no_cursor_and_sort_needs_id():
+    collection = FakeCollection([{"_id": "a", "created_at": 1}])
+    assert asyncio.run(paginate(collection, {}, [("created_at", -1), ("_id", -1)], limit=1)) == (
+        [{"_id": "a", "created_at": 1}], None,
+    )
+    with pytest.raises(ValueError):
+        asyncio.run(paginate(collection, {}, [("created_at", -1)]))
+    assert keyset_filter([("_id", -1)], ["a"]) == {"$or": [{"_id": {"$lt": "a"}}]}
+
+
+def test_asset_listing_hides_render_index_entries(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.db.crud import assets
+
+    start = datetime(2024, 1, 1)
+    collection = FakeCollection([
+        {"_id": "a1", "name": "logo", "url": "https://cdn/logo.png", "created_at": start, "updated_at": start},
+        {"_id": "render:abc", "kind": "render", "name": "final.mp4", "url": "/srv/output/final.mp4",
+         "created_at": start + timedelta(minutes=1), "updated_at": start},
+    ])
+
+    async def get_database():
+        return SimpleNamespace(assets=collection)
+
+    monkeypatch.setattr(assets, "get_database", get_database)
+    page = asyncio.run(assets.get_assets())
+
+    assert [asset.id for asset in page.items] == ["a1"]
@@ -0,0 +1,141 @@
+# tests/test_media_api.py
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps.auth import User, get_current_user
+from app.api.v1 import media
+from app.config.settings import settings
+from app.media import tts_engine, video_builder
+from app.media.artifacts import ArtifactAllocator
+from app.services.worker import broker as worker_broker
+from app.services.worker import tasks
+from app.services.worker.jobs import job_id_for
+from app.services.worker.queue import enqueue, get_job_status
+
+app = FastAPI()
+app.include_router(media.router, prefix="/api/v1/media")
+
+
+@pytest.fixture
+def client(stub_broker):
+    app.dependency_overrides[get_current_user] = lambda: User(username="tester")
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def fake_renders(monkeypatch, tmp_path):
+    class FakeTTSEngine:
+        def _adapter(self, engine):
+            return SimpleNamespace(voice=None)
+
+        def synthesize_segmented(self, engine, text, output_path=None):
+            with open(output_path, "wb") as f:
+                f.write(b"wav")
+            return SimpleNamespace(audio_path=output_path, segments=[], duration=2.0)
+
+    def fake_video(audio_path, context_text, output_path=None, **kwargs):
+        with open(output_path, "wb") as f:
+            f.write(b"mp4")
+        return output_path
+
+    monkeypatch.setattr(tts_engine, "TTSEngine", FakeTTSEngine)
+    monkeypatch.setattr(video_builder, "build_media_clip_with_context", fake_video)
+    monkeypatch.setattr(settings, "audio_mastering_enabled", False)
+    monkeypatch.setattr(tasks, "get_artifact_allocator", lambda: ArtifactAllocator(str(tmp_path)))
+
+
+def test_process_media_queues_a_job_and_returns_202(client, stub_broker):
+    response = client.post("/api/v1/media", json={"script": "Sample script"})
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "queued"
+    assert body["status_url"].endswith(f"/api/v1/media/jobs/{body['task_id']}")
+    assert stub_broker.queues[worker_broker.RENDER_QUEUE].qsize() == 1
+
+    # The same request is the same job
+    again = client.post("/api/v1/media/process_media/", json={"script": "Sample script"})
+    assert again.status_code == 202 and again.json()["task_id"] == body["task_id"]
+    assert stub_broker.queues[worker_broker.RENDER_QUEUE].qsize() == 1
+
+
+def test_job_status_and_events_follow_the_worker(client, stub_broker, run_worker, fake_renders, tmp_path):
+    task_id = client.post("/api/v1/media", json={"script": "Hello world."}).json()["task_id"]
+    run_worker(stub_broker)
+
+    job = client.get(f"/api/v1/media/jobs/{task_id}").json()
+    assert job["status"] == "succeeded"
+    assert job["progress"] == {"stage": "video", "step": 3, "steps": 3}
+    assert job["result"]["video_path"].startswith(str(tmp_path / "jobs" / task_id))
+
+    # Narration ran as its own job in the tts pool, not inline in the render process
+    narration = get_job_status(job_id_for("render_tts", {"text": "Hello world.", "voice": None, "engine": "coqui"}))
+    assert narration.queue == worker_broker.TTS_QUEUE and narration.status == "succeeded"
+    assert job["result"]["audio_path"] == narration.result["audio_path"]
+
+    with client.stream("GET", f"/api/v1/media/jobs/{task_id}/events") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [block for block in response.read().decode().split("\n\n") if block]
+    assert len(events) == 1
+    name, data = events[0].split("\n")
+    assert name == "event: succeeded"
+    assert json.loads(data[len("data: "):])["result"] == job["result"]
+
+
+def test_process_media_requires_authentication(stub_broker):
+    response = TestClient(app).post("/api/v1/media", json={"script": "Sample script"})
+
+    assert response.status_code == 401
+    assert stub_broker.queues[worker_broker.RENDER_QUEUE].qsize() == 0
+
+
+def test_media_job_waits_for_a_requeued_narration(client, stub_broker, run_worker, fake_renders, monkeypatch):
+    # A previous narration job for the same script failed; its exception is still stored
+    monkeypatch.setitem(tasks.render_tts.options, "max_retries", 0)
+    monkeypatch.setattr(settings, "worker_job_poll_interval", 0.01)
+    with monkeypatch.context() as broken:
+        broken.setattr(tts_engine.TTSEngine, "synthesize_segmented", lambda *args, **kwargs: 1 / 0)
+        enqueue(tasks.render_tts, text="Hello again.", voice=None, engine="coqui")
+        run_worker(stub_broker)
+
+    task_id = client.post("/api/v1/media", json={"script": "Hello again."}).json()["task_id"]
+    run_worker(stub_broker)
+
+    job = client.get(f"/api/v1/media/jobs/{task_id}").json()
+    assert job["status"] == "succeeded" and job["attempts"] == 1
+
+
+def test_job_status_requires_authentication(client, stub_broker):
+    task_id = client.post("/api/v1/media", json={"script": "Sample script"}).json()["task_id"]
+    app.dependency_overrides.clear()
+
+    assert client.get(f"/api/v1/media/jobs/{task_id}").status_code == 401
+    assert client.get(f"/api/v1/media/jobs/{task_id}/events").status_code == 401
+
+
+def test_publish_targets_come_from_settings_only(client, stub_broker, run_worker, fake_renders, monkeypatch, tmp_path):
+    archive = tmp_path / "archive"
+    monkeypatch.setattr(settings, "publish_targets", f"archive={archive}")
+
+    # Clients pick a configured target by name; paths and URLs are not accepted
+    for target in ("/etc", "http://169.254.169.254/latest"):
+        assert client.post("/api/v1/media", json={"script": "Hi.", "publish_target": target}).status_code == 422
+    ignored = client.post("/api/v1/media", json={"script": "Hi.", "destination": "/etc"}).json()["task_id"]
+    task_id = client.post("/api/v1/media", json={"script": "Hi.", "publish_target": "archive"}).json()["task_id"]
+    run_worker(stub_broker)
+
+    assert "published" not in client.get(f"/api/v1/media/jobs/{ignored}").json()["result"]
+    job = client.get(f"/api/v1/media/jobs/{task_id}").json()
+    assert job["status"] == "succeeded"
+    assert job["result"]["published"]["path"].startswith(str(archive))
+
+
+def test_unknown_job_is_404(client):
+    assert client.get("/api/v1/media/jobs/nope").status_code == 404
+    assert client.get("/api/v1/media/jobs/nope/events").status_code == 404
@@ -0,0 +1,17 @@
+# tests/test_prompts_api.py
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import prompts
+
+app = FastAPI()
+app.include_router(prompts.router, prefix="/api/v1/prompts")
+
+
+def test_prompt_writes_require_authentication():
+    client = TestClient(app)
+
+    assert client.post("/api/v1/prompts/", json={"content": "Hello"}).status_code == 401
+    assert client.put("/api/v1/prompts/p1", json={"content": "Hello"}).status_code == 401
+    assert client.delete("/api/v1/prompts/p1").status_code == 401